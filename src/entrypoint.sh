@@ -3,5 +3,8 @@
 echo "Running migrations..."
 python nfa/manage.py migrate
 
+echo "Generating OpenAPI schema..."
+python nfa/manage.py generate_openapi_schema
+
 echo "Starting server..."
 python nfa/manage.py runserver 0.0.0.0:8080
\ No newline at end of file
@@ -1,3 +1,42 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from nfa.routers import STICKY_COOKIE
+
+User = get_user_model()
+
+PASSWORD = 'Correct-horse-42'
+
+
+@override_settings(DATABASE_REPLICAS=('replica_1',))
+class PrimaryStickinessTests(APITestCase):
+    def register(self, email):
+        return self.client.post(reverse('register'), {
+            'email': email, 'password': PASSWORD, 'password2': PASSWORD, 'first_name': 'Test', 'last_name': 'User',
+        })
+
+    def test_successful_writes_pin_the_client_to_the_primary(self):
+        response = self.register('new@example.com')
+        self.assertEqual(response.status_code, 201)
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_STICKY_SECONDS)
+        self.assertTrue(cookie['httponly'])
+
+    def test_failed_writes_do_not(self):
+        User.objects.create_user(email='known@example.com', password=PASSWORD)
+        response = self.client.post(reverse('login'), {'email': 'known@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_login_pins_the_client(self):
+        User.objects.create_user(email='known@example.com', password=PASSWORD)
+        response = self.client.post(reverse('login'), {'email': 'known@example.com', 'password': PASSWORD})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=())
+    def test_no_cookie_without_replicas(self):
+        self.assertNotIn(STICKY_COOKIE, self.register('new@example.com').cookies)
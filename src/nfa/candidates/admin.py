@@ -1,14 +1,34 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, reverse
+from django.core.paginator import Paginator
 from django.shortcuts import render
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
 from django.utils.html import format_html
 
 from unfold.admin import ModelAdmin
 from .models import (Candidate, JobPost, TestSchedule, 
-                     ContactRequest, Document, Advertisement,
+                     ContactRequest, ArchivedContactRequest, ArchivedCycle, Document, Advertisement, Blob,
                      Profile, Education, WorkHistory, JobListing,
                      JobQuestion, JobApplication, ApplicationDocument, ApplicationAnswer)
 from .views import upload_schedule
+from .confirmation import confirm_applications
+
+SUBMITTED_FORMS_PER_PAGE = 50
+
+class UploadPreviewMixin:
+    download_kind = None
+
+    def get_queryset(self, request):
+        previews = Blob.objects.filter(name=OuterRef('file')).values('preview_name')[:1]
+        return super().get_queryset(request).annotate(preview_name=Subquery(previews))
+
+    def preview(self, obj):
+        if not getattr(obj, 'preview_name', None):
+            return "-"
+        url = reverse('download-file', args=[self.download_kind, obj.pk])
+        return format_html("<a href='{}' target='_blank'><img src='{}?variant=preview' style='max-height:64px'></a>", url, url)
+    preview.short_description = "Preview"
 
 class TestScheduleInline(admin.TabularInline):
     model = TestSchedule
@@ -30,7 +50,7 @@ class WorkHistoryAdmin(ModelAdmin):
 
 @admin.register(JobListing)
 class JobListing(ModelAdmin):
-    list_display = [field.name for field in JobListing._meta.get_fields() if not field.many_to_many and not field.one_to_many]
+    list_display = [field.name for field in JobListing._meta.get_fields() if field.concrete and not field.many_to_many]
 
 @admin.register(JobQuestion)
 class JobQuestion(ModelAdmin):
@@ -38,11 +58,19 @@ class JobQuestion(ModelAdmin):
 
 @admin.register(JobApplication)
 class JobApplication(ModelAdmin):
-    list_display = [field.name for field in JobApplication._meta.get_fields() if not field.many_to_many and not field.one_to_many]
+    list_display = [field.name for field in JobApplication._meta.get_fields() if field.concrete and not field.many_to_many]
+    search_fields = ('reference_number',)
+    actions = ['confirm_selected']
+
+    @admin.action(description="Confirm selected applications")
+    def confirm_selected(self, request, queryset):
+        confirmed = confirm_applications(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{len(confirmed)} application(s) confirmed.")
 
 @admin.register(ApplicationDocument)
-class ApplicationDocument(ModelAdmin):
-    list_display = [field.name for field in ApplicationDocument._meta.get_fields() if not field.many_to_many and not field.one_to_many]
+class ApplicationDocument(UploadPreviewMixin, ModelAdmin):
+    list_display = [field.name for field in ApplicationDocument._meta.get_fields() if not field.many_to_many and not field.one_to_many] + ['preview']
+    download_kind = 'application-documents'
 
 @admin.register(ApplicationAnswer)
 class ApplicationAnswer(ModelAdmin):
@@ -77,7 +105,32 @@ class CandidateAdmin(ModelAdmin):
 
     def submitted_forms(self, request):
         context = dict(self.admin_site.each_context(request))
-        context['forms'] = ContactRequest.objects.all().order_by('-submitted_at')
+        forms = ContactRequest.objects.select_related('assigned_to').defer('description').order_by('-submitted_at')
+        service = request.GET.get('service', '')
+        form_status = request.GET.get('status', '')
+        assignee = request.GET.get('assignee', '')
+        if service:
+            forms = forms.filter(service=service)
+        if form_status:
+            forms = forms.filter(status=form_status)
+        if assignee == 'me':
+            forms = forms.filter(assigned_to=request.user)
+        elif assignee == 'unassigned':
+            forms = forms.filter(assigned_to__isnull=True)
+
+        page = Paginator(forms, SUBMITTED_FORMS_PER_PAGE).get_page(request.GET.get('page'))
+        query = request.GET.copy()
+        query.pop('page', None)
+        context.update({
+            'forms': page,
+            'page_obj': page,
+            'query_string': query.urlencode(),
+            'service': service,
+            'status': form_status,
+            'assignee': assignee,
+            'service_choices': ContactRequest.SERVICE_CHOICES,
+            'status_choices': ContactRequest.STATUS_CHOICES,
+        })
         return render(request, 'admin/candidates/submitted_forms.html', context)
 
 @admin.register(JobPost)
@@ -91,21 +144,81 @@ class TestScheduleAdmin(ModelAdmin):
     search_fields = ('candidate__name', 'candidate__cnic', 'job_post__title')
 
 @admin.register(ContactRequest)
-class ContactRequestAdmin(ModelAdmin):
-    list_display = ('name', 'email', 'phone', 'service', 'preferred_contact', 'submitted_at', 'file_link')
-    list_filter = ('service', 'preferred_contact', 'submitted_at')
+class ContactRequestAdmin(UploadPreviewMixin, ModelAdmin):
+    list_display = ('name', 'email', 'phone', 'service', 'preferred_contact', 'status', 'assigned_to', 'submitted_at', 'preview', 'file_link')
+    download_kind = 'contact-requests'
+    list_filter = ('status', 'service', 'preferred_contact', 'submitted_at')
+    list_select_related = ('assigned_to',)
     search_fields = ('name', 'email', 'phone')
     ordering = ('-submitted_at',)
+    show_full_result_count = False
+    actions = ['assign_to_me', 'mark_in_progress', 'mark_resolved', 'mark_closed']
+
+    def _set_status(self, request, queryset, new_status):
+        updated = queryset.exclude(status=new_status).update(status=new_status, status_changed_at=timezone.now())
+        self.message_user(request, f"{updated} request(s) marked {new_status.replace('_', ' ')}.")
+
+    @admin.action(description="Assign selected requests to me")
+    def assign_to_me(self, request, queryset):
+        updated = queryset.update(assigned_to=request.user)
+        queryset.filter(status='new').update(status='in_progress', status_changed_at=timezone.now())
+        self.message_user(request, f"{updated} request(s) assigned to you.")
+
+    @admin.action(description="Mark selected requests in progress")
+    def mark_in_progress(self, request, queryset):
+        self._set_status(request, queryset, 'in_progress')
+
+    @admin.action(description="Mark selected requests resolved")
+    def mark_resolved(self, request, queryset):
+        self._set_status(request, queryset, 'resolved')
+
+    @admin.action(description="Mark selected requests closed")
+    def mark_closed(self, request, queryset):
+        self._set_status(request, queryset, 'closed')
+
+    def save_model(self, request, obj, form, change):
+        if change and 'status' in form.changed_data:
+            obj.status_changed_at = timezone.now()
+        super().save_model(request, obj, form, change)
 
     def file_link(self, obj):
         if obj.file:
-            return format_html("<a href='{}' download>Download</a>", obj.file.url)
+            url = reverse('download-file', args=['contact-requests', obj.pk])
+            return format_html("<a href='{}?download=1'>Download</a>", url)
         return "-"
     file_link.short_description = "File"
 
+@admin.register(ArchivedCycle)
+class ArchivedCycleAdmin(ModelAdmin):
+    list_display = ('kind', 'cycle', 'rows', 'file', 'archived_at')
+    list_filter = ('kind', 'cycle')
+    ordering = ('-archived_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedContactRequest)
+class ArchivedContactRequestAdmin(ModelAdmin):
+    list_display = ('original_id', 'name', 'email', 'service', 'status', 'submitted_at', 'archived_at')
+    list_filter = ('service', 'status')
+    search_fields = ('name', 'email', 'phone')
+    ordering = ('-submitted_at',)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(Document)
-class DocumentAdmin(ModelAdmin):
-    list_display = ('name', 'purpose', 'uploaded_at', 'download_link')
+class DocumentAdmin(UploadPreviewMixin, ModelAdmin):
+    list_display = ('name', 'purpose', 'uploaded_at', 'preview', 'download_link')
+    download_kind = 'documents'
     search_fields = ('name', 'purpose')
     ordering = ('-uploaded_at',)
 
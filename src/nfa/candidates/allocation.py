@@ -0,0 +1,241 @@
+import csv
+import datetime
+from collections import defaultdict, namedtuple
+from itertools import islice
+
+import openpyxl
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Length
+
+from .importing import SCHEDULE_COLUMNS, schedule_row_digest
+from .models import Candidate, JobPost, MeritListEntry, TestSchedule
+
+DEFAULT_SESSIONS = [
+    ('Morning', '08:30 AM', '09:00 AM - 10:30 AM'),
+    ('Evening', '01:30 PM', '02:00 PM - 03:30 PM'),
+]
+DEFAULT_PAPER = 'Paper 1'
+ROLL_DIGITS = 6
+BATCH_SIZE = 5000
+
+Venue = namedtuple('Venue', 'name city capacity')
+Session = namedtuple('Session', 'name reporting_time conduct_time')
+Applicant = namedtuple('Applicant', 'cnic name postal_address mobile_no father_name', defaults=('',))
+Assignment = namedtuple('Assignment', 'roll_no applicant slot candidate_id')
+
+
+class Slot:
+    __slots__ = ('index', 'test_date', 'session', 'venue', 'remaining')
+
+    def __init__(self, index, test_date, session, venue):
+        self.index = index
+        self.test_date = test_date
+        self.session = session
+        self.venue = venue
+        self.remaining = venue.capacity
+
+
+def read_venues(fileobj):
+    venues = []
+    for line, row in enumerate(csv.DictReader(fileobj), start=2):
+        try:
+            name, city, capacity = row['venue'].strip(), (row.get('city') or '').strip(), int(row['capacity'])
+        except (KeyError, AttributeError, TypeError, ValueError):
+            raise ValueError(f"Line {line}: expected venue, city and an integer capacity.")
+        if not name or capacity <= 0:
+            raise ValueError(f"Line {line}: venue name is required and capacity must be positive.")
+        venues.append(Venue(name, city, capacity))
+    if not venues:
+        raise ValueError("No venues given.")
+    return venues
+
+
+def test_dates(start, days, skip_weekends=False):
+    dates = []
+    day = start
+    while len(dates) < days:
+        if not (skip_weekends and day.weekday() >= 5):
+            dates.append(day)
+        day += datetime.timedelta(days=1)
+    return dates
+
+
+def build_slots(venues, sessions, dates):
+    slots = []
+    for test_date in dates:
+        for session in sessions:
+            for venue in venues:
+                slots.append(Slot(len(slots), test_date, session, venue))
+    return slots
+
+
+def _take(slots, cursor):
+    while cursor[0] < len(slots) and not slots[cursor[0]].remaining:
+        cursor[0] += 1
+    if cursor[0] == len(slots):
+        return None
+    slot = slots[cursor[0]]
+    slot.remaining -= 1
+    return slot
+
+
+def plan_schedule(applicants, slots):
+    capacity = sum(slot.remaining for slot in slots)
+    if capacity < len(applicants):
+        raise ValueError(f"{len(applicants)} applicants but only {capacity} seats across {len(slots)} slots.")
+
+    by_city = defaultdict(list)
+    for slot in slots:
+        if slot.venue.city:
+            by_city[slot.venue.city.lower()].append(slot)
+    cursors = {city: [0] for city in by_city}
+
+    plan = [None] * len(applicants)
+    overflow = []
+    for i, applicant in enumerate(applicants):
+        address = (applicant.postal_address or '').lower()
+        city = next((city for city in by_city if city in address), None)
+        slot = _take(by_city[city], cursors[city]) if city else None
+        if slot is None:
+            overflow.append(i)
+        else:
+            plan[i] = slot
+
+    cursor = [0]
+    for i in overflow:
+        plan[i] = _take(slots, cursor)
+    return plan
+
+
+def shortlisted_applicants(job_post):
+    scheduled = set(TestSchedule.objects.filter(job_post=job_post).values_list('candidate__cnic', flat=True))
+    rows = (MeritListEntry.objects.filter(job_listing__job_post=job_post, shortlisted=True)
+            .exclude(application__applicant__user__cnic__isnull=True)
+            .order_by('job_listing_id', 'rank')
+            .values_list('application__applicant__user__cnic', 'application__applicant__user__first_name',
+                         'application__applicant__user__last_name', 'application__applicant__user__email',
+                         'application__applicant__postal_address', 'application__applicant__phone_number'))
+    applicants = []
+    for cnic, first_name, last_name, email, postal_address, phone_number in rows.iterator(chunk_size=BATCH_SIZE):
+        if cnic in scheduled:
+            continue
+        scheduled.add(cnic)
+        name = f"{first_name} {last_name}".strip() or email or cnic
+        applicants.append(Applicant(cnic, name[:100], postal_address, (phone_number or '')[:15]))
+    return applicants
+
+
+def default_roll_prefix(job_post):
+    return f"{job_post.pk:03d}"
+
+
+def next_roll_number(prefix):
+    last = (Candidate.objects.alias(roll_length=Length('roll_no'))
+            .filter(roll_no__startswith=prefix, roll_length=len(prefix) + ROLL_DIGITS,
+                    roll_no__regex=rf'[0-9]{{{ROLL_DIGITS}}}$')
+            .aggregate(last=Max('roll_no'))['last'])
+    return int(last[len(prefix):]) + 1 if last else 1
+
+
+def existing_candidates(cnics):
+    found = {}
+    cnics = list(cnics)
+    for start in range(0, len(cnics), BATCH_SIZE):
+        chunk = (Candidate.objects.filter(cnic__in=cnics[start:start + BATCH_SIZE])
+                 .values_list('cnic', 'pk', 'roll_no', 'name', 'father_name'))
+        found.update((cnic, values) for cnic, *values in chunk)
+    return found
+
+
+def assign_roll_numbers(applicants, plan, prefix):
+    if len(prefix) + ROLL_DIGITS > Candidate._meta.get_field('roll_no').max_length:
+        raise ValueError(f"Roll number prefix {prefix!r} is too long.")
+    existing = existing_candidates(applicant.cnic for applicant in applicants)
+    number = next_roll_number(prefix)
+    assignments = []
+    for i in sorted(range(len(applicants)), key=lambda i: plan[i].index):
+        applicant = applicants[i]
+        if applicant.cnic in existing:
+            candidate_id, roll_no, name, father_name = existing[applicant.cnic]
+            applicant = applicant._replace(name=name, father_name=father_name)
+        else:
+            candidate_id, roll_no = None, f"{prefix}{number:0{ROLL_DIGITS}d}"
+            number += 1
+        assignments.append(Assignment(roll_no, applicant, plan[i], candidate_id))
+    return assignments
+
+
+def _chunks(items, size=BATCH_SIZE):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def save_assignments(job_post, assignments, paper=DEFAULT_PAPER):
+    candidate_ids = {}
+    new = [assignment for assignment in assignments if assignment.candidate_id is None]
+    for chunk in _chunks(new):
+        created = Candidate.objects.bulk_create([
+            Candidate(roll_no=assignment.roll_no, name=assignment.applicant.name,
+                      father_name=assignment.applicant.father_name,
+                      cnic=assignment.applicant.cnic, postal_address=assignment.applicant.postal_address or '',
+                      mobile_no=assignment.applicant.mobile_no)
+            for assignment in chunk
+        ])
+        candidate_ids.update((candidate.roll_no, candidate.pk) for candidate in created)
+
+    for chunk in _chunks(assignments):
+        TestSchedule.objects.bulk_create([
+            TestSchedule(
+                candidate_id=assignment.candidate_id or candidate_ids[assignment.roll_no],
+                job_post=job_post, paper=paper, test_date=assignment.slot.test_date,
+                session=assignment.slot.session.name, reporting_time=assignment.slot.session.reporting_time,
+                conduct_time=assignment.slot.session.conduct_time, venue=assignment.slot.venue.name,
+                row_hash=schedule_row_digest(plan_row(assignment, job_post, paper)),
+            )
+            for assignment in chunk
+        ])
+    return len(new)
+
+
+def plan_row(assignment, job_post, paper=DEFAULT_PAPER):
+    slot, applicant = assignment.slot, assignment.applicant
+    return (assignment.roll_no, applicant.name, applicant.father_name, applicant.cnic, job_post.title,
+            applicant.postal_address or '', applicant.mobile_no, paper, slot.test_date,
+            slot.session.name, slot.session.reporting_time, slot.session.conduct_time, slot.venue.name)
+
+
+def allocate(job_post, venues, sessions, dates, paper=DEFAULT_PAPER, roll_prefix=None, dry_run=False):
+    prefix = roll_prefix or default_roll_prefix(job_post)
+    with transaction.atomic():
+        JobPost.objects.select_for_update().filter(pk=job_post.pk).first()
+        applicants = shortlisted_applicants(job_post)
+        plan = plan_schedule(applicants, build_slots(venues, sessions, dates))
+        assignments = assign_roll_numbers(applicants, plan, prefix)
+        if not dry_run:
+            save_assignments(job_post, assignments, paper)
+    return assignments
+
+
+def write_plan(assignments, job_post, fileobj, paper=DEFAULT_PAPER):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Schedule')
+    ws.append(SCHEDULE_COLUMNS)
+    for serial, assignment in enumerate(assignments, start=1):
+        row = list(plan_row(assignment, job_post, paper))
+        row[8] = row[8].strftime('%d %b %Y')
+        ws.append([serial] + row)
+
+    summary = wb.create_sheet('Slots')
+    summary.append(['Test Date', 'Session', 'Venue', 'City', 'Capacity', 'Allocated'])
+    allocated = defaultdict(int)
+    slots = {}
+    for assignment in assignments:
+        allocated[assignment.slot.index] += 1
+        slots[assignment.slot.index] = assignment.slot
+    for index in sorted(slots):
+        slot = slots[index]
+        summary.append([slot.test_date.strftime('%d %b %Y'), slot.session.name, slot.venue.name, slot.venue.city,
+                        slot.venue.capacity, allocated[index]])
+    wb.save(fileobj)
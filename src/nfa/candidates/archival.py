@@ -0,0 +1,65 @@
+import logging
+import os
+
+from django.db import transaction
+
+from .models import ContactRequest, ArchivedContactRequest
+from .storage import archive_storage
+
+logger = logging.getLogger(__name__)
+
+CONTACT_REQUEST_FIELDS = ('name', 'email', 'phone', 'service', 'description', 'preferred_contact',
+                          'submitted_at', 'status', 'assigned_to_id')
+CLOSED_STATUSES = ('resolved', 'closed')
+
+
+def archived_file_name(contact_request):
+    base = os.path.basename(contact_request.file.name)
+    return f"contact-requests/{contact_request.submitted_at:%Y/%m}/{contact_request.pk}-{base}"
+
+
+def _copy_file(contact_request, storage):
+    try:
+        with contact_request.file.open('rb') as source:
+            return storage.save(archived_file_name(contact_request), source)
+    except FileNotFoundError:
+        logger.warning("Contact request %s references missing file %s", contact_request.pk, contact_request.file.name)
+        return ''
+
+
+def archivable_contact_requests(cutoff, statuses=CLOSED_STATUSES):
+    return ContactRequest.objects.filter(submitted_at__lt=cutoff, status__in=statuses or CLOSED_STATUSES)
+
+
+def archive_contact_requests(cutoff, statuses=CLOSED_STATUSES, batch_size=500, storage=None, log=None):
+    storage = storage or archive_storage()
+    queryset = archivable_contact_requests(cutoff, statuses).order_by('pk')
+
+    archived = files = 0
+    while True:
+        copied = []
+        with transaction.atomic():
+            batch = list(queryset.select_for_update(skip_locked=True)[:batch_size])
+            if not batch:
+                break
+            try:
+                rows = []
+                for contact_request in batch:
+                    name = _copy_file(contact_request, storage) if contact_request.file else ''
+                    if name:
+                        copied.append(name)
+                    rows.append(ArchivedContactRequest(
+                        original_id=contact_request.pk, file=name,
+                        **{field: getattr(contact_request, field) for field in CONTACT_REQUEST_FIELDS},
+                    ))
+                ArchivedContactRequest.objects.bulk_create(rows, batch_size=batch_size)
+                ContactRequest.objects.filter(pk__in=[row.original_id for row in rows]).delete()
+            except Exception:
+                for name in copied:
+                    storage.delete(name)
+                raise
+        archived += len(batch)
+        files += len(copied)
+        if log:
+            log(archived, files)
+    return archived, files
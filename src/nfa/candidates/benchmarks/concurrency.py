@@ -0,0 +1,101 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from candidates.models import JobApplication, JobListingStats
+from candidates.stats import record_application
+from .runner import BenchmarkContext, percentile
+
+
+def in_process_poster(ctx, path):
+    token = f"Bearer {RefreshToken.for_user(ctx.user).access_token}"
+    local = threading.local()
+
+    def post():
+        if not hasattr(local, 'client'):
+            local.client = ctx.api_client()
+            local.client.credentials(HTTP_AUTHORIZATION=token)
+        return local.client.post(path).status_code
+    return post
+
+
+def live_poster(ctx, path, base_url):
+    token = f"Bearer {RefreshToken.for_user(ctx.user).access_token}"
+    url = base_url.rstrip('/') + path
+
+    def post():
+        request = urllib.request.Request(url, data=b'', method='POST', headers={'Authorization': token})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+    return post
+
+
+def hammer(post, threads):
+    barrier = threading.Barrier(threads)
+
+    def worker(_):
+        barrier.wait()
+        started = time.perf_counter()
+        try:
+            return post(), time.perf_counter() - started
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(worker, range(threads)))
+
+
+def confirmed_count(listing):
+    return JobListingStats.objects.filter(pk=listing.pk).values_list('confirmed', flat=True).first() or 0
+
+
+def run_confirmation_harness(rounds=20, threads=16, base_url=None, log=None):
+    ctx = BenchmarkContext()
+    statuses = Counter()
+    latencies = []
+    winners_per_round = []
+    created = []
+    confirmed_before = confirmed_count(ctx.listing)
+
+    try:
+        for _ in range(rounds):
+            application = JobApplication.objects.create(applicant=ctx.profile, job_listing=ctx.listing)
+            record_application(application)
+            created.append(application.pk)
+
+            path = reverse('confirm-job-application', args=[application.pk])
+            post = live_poster(ctx, path, base_url) if base_url else in_process_poster(ctx, path)
+            results = hammer(post, threads)
+            codes = Counter(code for code, _ in results)
+            statuses.update(codes)
+            latencies.extend(elapsed for _, elapsed in results)
+            winners_per_round.append(codes[200])
+            if log:
+                log(application.pk, dict(codes))
+
+        confirmed_delta = confirmed_count(ctx.listing) - confirmed_before
+        all_confirmed = not JobApplication.objects.filter(pk__in=created, is_confirmed=False).exists()
+    finally:
+        JobApplication.objects.filter(pk__in=created).delete()
+
+    latencies.sort()
+    return {
+        'rounds': rounds,
+        'threads': threads,
+        'statuses': dict(statuses),
+        'rounds_with_one_winner': sum(1 for winners in winners_per_round if winners == 1),
+        'confirmed_counter_delta': confirmed_delta,
+        'all_confirmed': all_confirmed,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+    }
@@ -0,0 +1,274 @@
+import datetime
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from candidates.models import (Candidate, JobPost, TestSchedule, JobListing, JobQuestion,
+                               Profile, Education, WorkHistory,
+                               JobApplication, ApplicationAnswer, ApplicationDocument)
+
+User = get_user_model()
+
+BENCH_PREFIX = 'BENCH'
+BENCH_EMAIL_DOMAIN = 'bench.local'
+BENCH_PASSWORD = 'bench-password-123'
+BENCH_USER_EMAIL = f'bench-user@{BENCH_EMAIL_DOMAIN}'
+BENCH_STAFF_EMAIL = f'bench-staff@{BENCH_EMAIL_DOMAIN}'
+
+DEFAULT_SIZES = {
+    'job_posts': 40,
+    'job_listings': 200,
+    'candidates': 100_000,
+    'test_schedules': 1_000_000,
+    'profiles': 50_000,
+    'applications': 100_000,
+}
+
+BATCH_SIZE = 5000
+
+CITIES = ['Islamabad', 'Lahore', 'Karachi', 'Peshawar', 'Quetta', 'Multan', 'Faisalabad']
+SESSIONS = [('Morning', '08:30 AM', '09:00 AM - 10:30 AM'), ('Evening', '01:30 PM', '02:00 PM - 03:30 PM')]
+DEGREES = ['matric', 'intermediate', 'bachelors', 'masters']
+FIELDS = ['Chemistry', 'Biology', 'Computer Science', 'Physics', 'Pharmacy', 'Forensic Science']
+PARAGRAPH = (
+    "The candidate will assist the forensic laboratory in evidence handling, documentation, "
+    "chain of custody maintenance and reporting in line with standard operating procedures. "
+)
+
+
+def scaled_sizes(scale=1.0):
+    return {key: max(1, int(value * scale)) for key, value in DEFAULT_SIZES.items()}
+
+
+def bench_cnic(i):
+    digits = f"{i:013d}"
+    return f"{digits[:5]}-{digits[5:12]}-{digits[12]}"
+
+
+def _batched(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk(model, objects):
+    created = []
+    for batch in _batched(objects):
+        created.extend(model.objects.bulk_create(batch, batch_size=BATCH_SIZE))
+    return created
+
+
+def _stream(model, objects):
+    count = 0
+    for batch in _batched(objects):
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        count += len(batch)
+    return count
+
+
+def seed_job_posts(rng, count, prefix=BENCH_PREFIX):
+    return _bulk(JobPost, (
+        JobPost(code=f"{prefix}_{i:04d}", title=f"Forensic Post {i} (NFAPS-{rng.randint(1, 17)})",
+                description=PARAGRAPH)
+        for i in range(count)
+    ))
+
+
+def seed_job_listings(rng, job_posts, count):
+    today = datetime.date.today()
+    listings = _bulk(JobListing, (
+        JobListing(
+            job_post=job_posts[i % len(job_posts)],
+            location=rng.choice(CITIES),
+            application_deadline=today + datetime.timedelta(days=rng.randint(-180, 90)),
+            number_of_positions=rng.randint(1, 50),
+            salary_range=f"{rng.randint(3, 8) * 10000}-{rng.randint(9, 15) * 10000} PKR",
+            minimum_age=rng.choice([None, 18, 21]),
+            minimum_qualification=rng.choice([None] + DEGREES),
+            required_experience=rng.choice([None, 0, 1, 2, 5]),
+            requirements=PARAGRAPH * 4,
+            responsibilities=PARAGRAPH * 6,
+            additional_info=PARAGRAPH * 2,
+            status=rng.choice(['open', 'open', 'open', 'closed', 'draft']),
+        )
+        for i in range(count)
+    ))
+    questions = _bulk(JobQuestion, (
+        JobQuestion(job_listing=listing, question_text=f"Question {n} for listing {listing.pk}?")
+        for listing in listings for n in range(3)
+    ))
+    return listings, questions
+
+
+def seed_candidates(rng, count):
+    return _bulk(Candidate, (
+        Candidate(
+            roll_no=f"{BENCH_PREFIX}{i:08d}",
+            name=f"Candidate {i}",
+            father_name=f"Father {i}",
+            cnic=bench_cnic(i),
+            postal_address=f"House {i}, Street {i % 97}, {rng.choice(CITIES)}",
+            mobile_no=f"03{rng.randint(0, 999999999):09d}",
+        )
+        for i in range(count)
+    ))
+
+
+def seed_test_schedules(rng, candidates, job_posts, count):
+    start = datetime.date.today() + datetime.timedelta(days=14)
+
+    def rows():
+        for i in range(count):
+            session, reporting, conduct = SESSIONS[i % len(SESSIONS)]
+            cycle = i // (len(candidates) * len(job_posts))
+            yield TestSchedule(
+                candidate_id=candidates[i % len(candidates)].pk,
+                job_post_id=job_posts[(i // len(candidates)) % len(job_posts)].pk,
+                paper=f"Paper {1 + i % 3}",
+                test_date=start + datetime.timedelta(days=cycle * 30 + i % 30),
+                session=session,
+                reporting_time=reporting,
+                conduct_time=conduct,
+                venue=f"Venue {i % 300}, {CITIES[i % len(CITIES)]}",
+            )
+
+    return _stream(TestSchedule, rows())
+
+
+def seed_profiles(rng, count, prefix='applicant', cnic_base=10 ** 12):
+    password = make_password(BENCH_PASSWORD)
+    users = _bulk(User, (
+        User(email=f"{prefix}{i}@{BENCH_EMAIL_DOMAIN}", cnic=bench_cnic(cnic_base + i), password=password)
+        for i in range(count)
+    ))
+    profiles = _bulk(Profile, (
+        Profile(
+            user=user,
+            date_of_birth=datetime.date(rng.randint(1970, 2004), rng.randint(1, 12), rng.randint(1, 28)),
+            postal_address=f"Street {i % 131}, {rng.choice(CITIES)}",
+            phone_number=f"03{rng.randint(0, 999999999):09d}",
+        )
+        for i, user in enumerate(users)
+    ))
+
+    def educations():
+        for profile in profiles:
+            year = profile.date_of_birth.year + 16
+            for level in range(rng.randint(1, 4)):
+                yield Education(
+                    profile=profile,
+                    institution_name=f"Institute {rng.randint(1, 500)}",
+                    degree=DEGREES[level],
+                    field_of_study=rng.choice(FIELDS),
+                    start_date=datetime.date(year + level * 2, 9, 1),
+                    end_date=datetime.date(year + level * 2 + 2, 6, 30),
+                    grade=rng.choice(['A', 'B', 'C']),
+                )
+
+    def work_histories():
+        for profile in profiles:
+            year = profile.date_of_birth.year + 22
+            for n in range(rng.randint(0, 3)):
+                yield WorkHistory(
+                    profile=profile,
+                    company_name=f"Company {rng.randint(1, 1000)}",
+                    job_title=rng.choice(['Lab Assistant', 'Analyst', 'Clerk', 'Technician']),
+                    start_date=datetime.date(year + n * 2, 1, 1),
+                    end_date=datetime.date(year + n * 2 + 2, 1, 1),
+                )
+
+    _stream(Education, educations())
+    _stream(WorkHistory, work_histories())
+    return profiles
+
+
+def seed_applications(rng, profiles, listings, questions, count):
+    questions_by_listing = {}
+    for question in questions:
+        questions_by_listing.setdefault(question.job_listing_id, []).append(question)
+
+    applications = _bulk(JobApplication, (
+        JobApplication(
+            applicant=profiles[i % len(profiles)],
+            job_listing=listings[rng.randrange(len(listings))],
+            is_confirmed=rng.random() < 0.7,
+        )
+        for i in range(count)
+    ))
+    _stream(ApplicationAnswer, (
+        ApplicationAnswer(application=application, question=question, answer_text=PARAGRAPH)
+        for application in applications
+        for question in questions_by_listing.get(application.job_listing_id, [])
+    ))
+    _stream(ApplicationDocument, (
+        ApplicationDocument(application=application, name=name,
+                            file=f"applications/{application.pk}/{name.lower()}.pdf")
+        for application in applications
+        for name in ('CNIC', 'Degree')
+    ))
+    return applications
+
+
+def ensure_bench_accounts():
+    user = User.objects.filter(email=BENCH_USER_EMAIL).first()
+    if user is None:
+        user = User.objects.create_user(email=BENCH_USER_EMAIL, cnic=bench_cnic(9 * 10 ** 12),
+                                        password=BENCH_PASSWORD)
+    Profile.objects.get_or_create(
+        user=user,
+        defaults={'date_of_birth': datetime.date(1995, 5, 5), 'postal_address': 'Bench Street, Islamabad'},
+    )
+    if not user.profile.educations.exists():
+        Education.objects.create(profile=user.profile, institution_name='Bench University', degree='masters',
+                                 field_of_study='Chemistry', start_date=datetime.date(2014, 9, 1),
+                                 end_date=datetime.date(2016, 6, 30))
+        WorkHistory.objects.create(profile=user.profile, company_name='Bench Labs', job_title='Analyst',
+                                   start_date=datetime.date(2017, 1, 1), end_date=datetime.date(2023, 1, 1))
+
+    staff = User.objects.filter(email=BENCH_STAFF_EMAIL).first()
+    if staff is None:
+        staff = User.objects.create_user(email=BENCH_STAFF_EMAIL, cnic=bench_cnic(9 * 10 ** 12 + 1),
+                                         password=BENCH_PASSWORD, is_staff=True)
+    return user, staff
+
+
+def bench_data_exists():
+    return JobPost.objects.filter(code__startswith=BENCH_PREFIX).exists()
+
+
+def clear_bench_data():
+    JobPost.objects.filter(code__startswith=BENCH_PREFIX).delete()
+    Candidate.objects.filter(roll_no__startswith=BENCH_PREFIX).delete()
+    User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").delete()
+
+
+def seed(sizes, seed_value=42, log=None):
+    rng = random.Random(seed_value)
+    log = log or (lambda message: None)
+
+    with transaction.atomic():
+        job_posts = seed_job_posts(rng, sizes['job_posts'])
+        listings, questions = seed_job_listings(rng, job_posts, sizes['job_listings'])
+        log(f"Seeded {len(job_posts)} job posts, {len(listings)} listings, {len(questions)} questions")
+
+    with transaction.atomic():
+        candidates = seed_candidates(rng, sizes['candidates'])
+        schedules = seed_test_schedules(rng, candidates, job_posts, sizes['test_schedules'])
+        log(f"Seeded {len(candidates)} candidates, {schedules} test schedules")
+
+    with transaction.atomic():
+        profiles = seed_profiles(rng, sizes['profiles'])
+        log(f"Seeded {len(profiles)} profiles with education and work history")
+
+    with transaction.atomic():
+        applications = seed_applications(rng, profiles, listings, questions, sizes['applications'])
+        log(f"Seeded {len(applications)} applications with answers and documents")
+
+    ensure_bench_accounts()
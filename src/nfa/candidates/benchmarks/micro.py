@@ -0,0 +1,339 @@
+import csv
+import datetime
+import io
+import random
+import time
+import uuid
+import zipfile
+from xml.sax.saxutils import escape
+
+import openpyxl
+
+from django.db import DatabaseError, connection, transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from nfa.renderers import FastJSONRenderer
+from candidates.allocation import (DEFAULT_SESSIONS, Applicant, Session, Venue, assign_roll_numbers, build_slots,
+                                   plan_schedule, save_assignments, test_dates)
+from candidates.importing import (FIELD_LIMITS, REQUIRED_FIELDS, SCHEDULE_COLUMNS, VALUE_FIELDS, ScheduleRow, _text,
+                                  normalize_cnic, normalize_mobile, parse_excel_date, parse_rows, validate_rows)
+from candidates.merit import add_late_applications, generate
+from candidates.models import JobApplication, JobListing
+from candidates.readers import read_schedule
+from candidates.references import new_reference_number
+from candidates.serializers import JobListingSerializer, JobListingValuesSerializer
+from .factories import CITIES, DEGREES, bench_cnic, seed_job_listings, seed_job_posts, seed_profiles
+
+MICROBENCHMARKS = {}
+
+
+def microbenchmark(name):
+    def decorator(func):
+        MICROBENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def timed(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+@microbenchmark('listing_serialization')
+def listing_serialization(size=1000, repeat=5):
+    request = APIRequestFactory().get('/api/candidates/joblistings/')
+    results = {}
+    with transaction.atomic():
+        rng = random.Random(7)
+        job_posts = seed_job_posts(rng, 20, prefix='MICRO')
+        seed_job_listings(rng, job_posts, size)
+        listings = JobListing.objects.filter(job_post__in=job_posts)
+
+        def model_serializer():
+            return JobListingSerializer(listings.all(), many=True, context={'request': request}).data
+
+        def values_serializer():
+            return JobListingValuesSerializer(listings.all(), context={'request': request}).data
+
+        cases = {
+            'ModelSerializer + JSONRenderer': (model_serializer, JSONRenderer()),
+            'ModelSerializer + FastJSONRenderer': (model_serializer, FastJSONRenderer()),
+            'ValuesSerializer + JSONRenderer': (values_serializer, JSONRenderer()),
+            'ValuesSerializer + FastJSONRenderer': (values_serializer, FastJSONRenderer()),
+        }
+        for label, (serialize, renderer) in cases.items():
+            serialize_time = timed(serialize, repeat)
+            data = serialize()
+            render_time = timed(lambda: renderer.render(data), repeat)
+            results[label] = {
+                'serialize_ms_per_1k': round(serialize_time * 1000 * 1000 / size, 2),
+                'render_ms_per_1k': round(render_time * 1000 * 1000 / size, 2),
+            }
+        transaction.set_rollback(True)
+    return results
+
+
+@microbenchmark('merit_list')
+def merit_list(size=10000, late=20):
+    results = {}
+    with transaction.atomic():
+        rng = random.Random(11)
+        listing = seed_job_listings(rng, seed_job_posts(rng, 1, prefix='MERIT'), 1)[0][0]
+        JobListing.objects.filter(pk=listing.pk).update(minimum_qualification=None, number_of_positions=50)
+        listing.refresh_from_db()
+        profiles = seed_profiles(rng, size + late, prefix='merit', cnic_base=7 * 10 ** 12)
+        JobApplication.objects.bulk_create([
+            JobApplication(applicant=profile, job_listing=listing, is_confirmed=i < size,
+                           highest_qualification=rng.choice(DEGREES))
+            for i, profile in enumerate(profiles)
+        ], batch_size=5000)
+
+        start = time.perf_counter()
+        generated = generate(listing)
+        elapsed = time.perf_counter() - start
+        results['full generation'] = {
+            'applicants': generated.applicants,
+            'seconds': round(elapsed, 3),
+            'ms_per_1k': round(elapsed * 1000 * 1000 / max(generated.applicants, 1), 2),
+        }
+
+        JobApplication.objects.filter(job_listing=listing, is_confirmed=False).update(is_confirmed=True)
+        start = time.perf_counter()
+        added = add_late_applications(listing)
+        elapsed = time.perf_counter() - start
+        results['late confirmations'] = {
+            'inserted': added,
+            'seconds': round(elapsed, 3),
+            'ms_each': round(elapsed * 1000 / max(added, 1), 2),
+        }
+        transaction.set_rollback(True)
+    return results
+
+
+
+INDEX_SIZE_SQL = {
+    'postgresql': """
+        SELECT SUM(pg_relation_size(i.indexrelid)) FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = %s::regclass AND i.indnatts = 1 AND a.attname = %s
+    """,
+    'sqlite': """
+        SELECT SUM(pgsize) FROM dbstat WHERE name IN (
+            SELECT il.name FROM pragma_index_list(%s) il
+            WHERE (SELECT group_concat(ii.name) FROM pragma_index_info(il.name) ii) = %s)
+    """,
+}
+
+
+def _index_kib(model, column):
+    if connection.vendor not in INDEX_SIZE_SQL:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(INDEX_SIZE_SQL[connection.vendor], [model._meta.db_table, column])
+            size = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    return size // 1024 if size is not None else None
+
+
+@microbenchmark('application_inserts')
+def application_inserts(size=100000, batch_size=1000):
+    results = {}
+    for label, reference in (('uuid4', lambda: str(uuid.uuid4())), ('time_ordered', new_reference_number)):
+        with transaction.atomic():
+            rng = random.Random(13)
+            listing = seed_job_listings(rng, seed_job_posts(rng, 1, prefix='REFS'), 1)[0][0]
+            profiles = seed_profiles(rng, 100, prefix='refs', cnic_base=3 * 10 ** 12)
+            start = time.perf_counter()
+            for offset in range(0, size, batch_size):
+                JobApplication.objects.bulk_create([
+                    JobApplication(applicant=profiles[i % len(profiles)], job_listing=listing, reference_number=reference())
+                    for i in range(offset, min(offset + batch_size, size))
+                ])
+            elapsed = time.perf_counter() - start
+            results[label] = {
+                'rows': size,
+                'seconds': round(elapsed, 3),
+                'rows_per_s': round(size / elapsed),
+                'generate_us': round(timed(lambda: [reference() for _ in range(10000)]) * 100, 2),
+                'length': len(reference()),
+                'index_kib': _index_kib(JobApplication, 'reference_number'),
+            }
+            transaction.set_rollback(True)
+    return results
+
+@microbenchmark('schedule_allocation')
+def schedule_allocation(size=200000, venues=150):
+    results = {}
+    with transaction.atomic():
+        rng = random.Random(13)
+        job_post = seed_job_posts(rng, 1, prefix='ALLOC')[0]
+        applicants = [
+            Applicant(bench_cnic(6 * 10 ** 12 + i), f"Applicant {i}", f"House {i}, {rng.choice(CITIES)}",
+                      f"03{rng.randint(0, 999999999):09d}")
+            for i in range(size)
+        ]
+        venue_list = [Venue(f"Venue {n}, {CITIES[n % len(CITIES)]}", CITIES[n % len(CITIES)], rng.randint(80, 400))
+                      for n in range(venues)]
+        sessions = [Session(*session) for session in DEFAULT_SESSIONS]
+        capacity = sum(venue.capacity for venue in venue_list) * len(sessions)
+        dates = test_dates(datetime.date.today(), -(-size * 11 // 10 // capacity))
+        slots = build_slots(venue_list, sessions, dates)
+
+        start = time.perf_counter()
+        plan = plan_schedule(applicants, slots)
+        planned = time.perf_counter()
+        assignments = assign_roll_numbers(applicants, plan, 'ALLOC')
+        numbered = time.perf_counter()
+        save_assignments(job_post, assignments)
+        saved = time.perf_counter()
+
+        results['allocation'] = {
+            'candidates': size,
+            'slots': len(slots),
+            'plan_s': round(planned - start, 3),
+            'roll_numbers_s': round(numbered - planned, 3),
+            'insert_s': round(saved - numbered, 3),
+            'total_s': round(saved - start, 3),
+        }
+        transaction.set_rollback(True)
+    return results
+
+
+def _schedule_sheet_rows(count):
+    test_date = datetime.date.today() + datetime.timedelta(days=30)
+    for i in range(count):
+        yield [
+            i + 1, f"ING{i:08d}", f"Candidate {i}", f"Father {i}", bench_cnic(4 * 10 ** 12 + i), "Ingestion Post",
+            f"House {i}, {CITIES[i % len(CITIES)]}", f"0300{i:07d}", "Paper 1",
+            (test_date + datetime.timedelta(days=i % 5)).strftime('%d %b %Y'), "Morning",
+            "08:30 AM", "09:00 AM - 10:30 AM", f"Venue {i % 100}",
+        ]
+
+
+def _csv_bytes(count):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(SCHEDULE_COLUMNS)
+    writer.writerows(_schedule_sheet_rows(count))
+    return out.getvalue().encode('utf-8')
+
+
+def _xlsx_bytes(count, sheets=4):
+    wb = openpyxl.Workbook(write_only=True)
+    per_sheet = -(-count // sheets)
+    rows = _schedule_sheet_rows(count)
+    for n in range(sheets):
+        ws = wb.create_sheet(f"Centre {n + 1}")
+        ws.append(SCHEDULE_COLUMNS)
+        for _, row in zip(range(per_sheet), rows):
+            ws.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def _ods_cell(value):
+    if isinstance(value, int):
+        return f'<table:table-cell office:value-type="float" office:value="{value}"><text:p>{value}</text:p></table:table-cell>'
+    return f'<table:table-cell office:value-type="string"><text:p>{escape(value)}</text:p></table:table-cell>'
+
+
+def _ods_bytes(count):
+    rows = "".join(f"<table:table-row>{''.join(_ods_cell(value) for value in row)}</table:table-row>"
+                   for row in [SCHEDULE_COLUMNS, *_schedule_sheet_rows(count)])
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+        f'<office:body><office:spreadsheet><table:table table:name="Schedule">{rows}</table:table>'
+        '</office:spreadsheet></office:body></office:document-content>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.spreadsheet', zipfile.ZIP_STORED)
+        archive.writestr('content.xml', content)
+    return out.getvalue()
+
+
+@microbenchmark('schedule_ingestion')
+def schedule_ingestion(size=20000):
+    results = {}
+    for extension, build in (('.csv', _csv_bytes), ('.xlsx', _xlsx_bytes), ('.ods', _ods_bytes)):
+        content = build(size)
+
+        start = time.perf_counter()
+        for _ in read_schedule(io.BytesIO(content), f"schedule{extension}"):
+            pass
+        read = time.perf_counter() - start
+
+        errors, skipped = [], []
+        start = time.perf_counter()
+        rows = parse_rows(read_schedule(io.BytesIO(content), f"schedule{extension}"), errors, skipped)
+        parsed = time.perf_counter() - start
+
+        results[extension] = {
+            'rows': len(rows),
+            'errors': len(errors) + len(skipped),
+            'kib': len(content) // 1024,
+            'read_s': round(read, 3),
+            'read_parse_s': round(parsed, 3),
+            'rows_per_s': round(len(rows) / parsed) if parsed else 0,
+        }
+    return results
+
+
+def _validate_per_row(batch, errors):
+    rows = []
+    for sheet, line, values in batch:
+        values = dict(zip(VALUE_FIELDS, values))
+        try:
+            test_date = parse_excel_date(values.pop('test_date'))
+            values = {field: _text(value) for field, value in values.items()}
+            values['cnic'] = normalize_cnic(values['cnic'])
+            values['mobile_no'] = normalize_mobile(values['mobile_no']) if values['mobile_no'] else ''
+        except ValueError as e:
+            errors.append((sheet, line, str(e)))
+            continue
+        row = ScheduleRow(sheet, line, test_date=test_date, **values)
+        missing = [field for field in REQUIRED_FIELDS if not getattr(row, field)]
+        too_long = [field for field, limit in FIELD_LIMITS.items() if len(getattr(row, field)) > limit]
+        if missing or too_long:
+            errors.append((sheet, line, "missing or too long"))
+            continue
+        rows.append(row)
+    return rows
+
+
+@microbenchmark('schedule_validation')
+def schedule_validation(size=100000, repeat=3):
+    test_date = datetime.date.today() + datetime.timedelta(days=30)
+    batch = []
+    for i, row in enumerate(_schedule_sheet_rows(size)):
+        cnic, mobile = row[4], row[7]
+        if i % 3 == 1:
+            cnic, mobile = cnic.replace('-', ''), f"+92 {mobile[1:4]} {mobile[4:]}"
+        if i % 500 == 0:
+            cnic = 'unknown'
+        schedule_date = (test_date + datetime.timedelta(days=i % 5)).strftime('%d/%m/%Y')
+        batch.append(('Schedule', i + 2, (*row[1:4], cnic, row[5], row[6], mobile, row[8], schedule_date, *row[10:])))
+
+    results = {}
+    for label, validate in (('per_row', _validate_per_row), ('columnar', validate_rows)):
+        errors = []
+        rows = validate(batch, errors)
+        results[label] = {
+            'rows': len(rows),
+            'errors': len(errors),
+            'best_s': round(timed(lambda: validate(batch, []), repeat=repeat), 3),
+        }
+    results['columnar']['speedup'] = round(results['per_row']['best_s'] / results['columnar']['best_s'], 2)
+    return results
@@ -0,0 +1,255 @@
+import datetime
+import json
+import math
+import time
+from io import BytesIO
+
+import openpyxl
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.conf import settings
+from django.test import Client
+from django.test.client import BOUNDARY, encode_multipart
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from nfa.metrics import QueryTimer
+from candidates.models import JobPost, JobListing, JobQuestion, JobApplication
+from candidates.throttling import UploadDocumentThrottle
+from .factories import (BENCH_PREFIX, BENCH_PASSWORD, BENCH_USER_EMAIL,
+                        bench_cnic, ensure_bench_accounts)
+
+SCHEDULE_HEADERS = [
+    'Sr.No.', 'Roll No', 'Name', 'Father Name', 'CNIC', 'Post Applied For',
+    'Postal Address', 'Mobile No.', 'Paper', 'Test Date', 'Session',
+    'Reporting Time', 'Conduct Time', 'Venue'
+]
+
+FLOOD_ADDR = '198.51.100.7'
+FLOOD_CONTENT_TYPE = f'multipart/form-data; boundary={BOUNDARY}'
+
+SCENARIOS = {}
+
+
+class Scenario:
+    def __init__(self, name, setup, expected_status, iterations=None):
+        self.name = name
+        self.setup = setup
+        self.expected_status = expected_status
+        self.iterations = iterations
+
+
+def scenario(name, expected_status=200, iterations=None):
+    def decorator(func):
+        SCENARIOS[name] = Scenario(name, func, expected_status, iterations)
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    def __init__(self):
+        self.user, self.staff = ensure_bench_accounts()
+        self.profile = self.user.profile
+        job_post, _ = JobPost.objects.get_or_create(
+            code=f"{BENCH_PREFIX}_OPEN", defaults={'title': 'Benchmark Open Post'}
+        )
+        self.listing, created = JobListing.objects.get_or_create(
+            job_post=job_post,
+            defaults={
+                'location': 'Islamabad',
+                'application_deadline': datetime.date.today() + datetime.timedelta(days=365),
+                'minimum_age': 18,
+                'minimum_qualification': 'bachelors',
+                'required_experience': 1,
+                'status': 'open',
+            },
+        )
+        if created:
+            JobQuestion.objects.bulk_create([
+                JobQuestion(job_listing=self.listing, question_text=f"Benchmark question {n}?") for n in range(3)
+            ])
+        self.questions = list(self.listing.questions.all())
+        self.application, _ = JobApplication.objects.get_or_create(applicant=self.profile, job_listing=self.listing)
+
+    def api_client(self, user=None):
+        client = APIClient()
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        return client
+
+    def staff_client(self):
+        client = Client()
+        client.force_login(self.staff)
+        return client
+
+
+def build_schedule_workbook(iteration, rows, job_post_title):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(SCHEDULE_HEADERS)
+    test_date = datetime.date.today() + datetime.timedelta(days=30)
+    for r in range(rows):
+        serial = iteration * rows + r
+        ws.append([
+            r + 1, f"BUP{serial:09d}", f"Upload Candidate {serial}", f"Father {serial}",
+            bench_cnic(8 * 10 ** 12 + serial), job_post_title, f"House {serial}, Islamabad",
+            f"0300{serial:07d}", "Paper 1", test_date.strftime('%d %b %Y'), "Morning",
+            "08:30 AM", "09:00 AM - 10:30 AM", "Venue 1, Islamabad",
+        ])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@scenario('list_job_listings')
+def list_job_listings(ctx):
+    client = ctx.api_client()
+    url = reverse('list-job-listings')
+    return lambda i: client.get(url)
+
+
+@scenario('application_eligibility_check')
+def application_eligibility_check(ctx):
+    client = ctx.api_client(ctx.user)
+    url = reverse('application-eligibility-check')
+    return lambda i: client.post(url, {'job_id': ctx.listing.pk}, format='json')
+
+
+@scenario('create_job_application', expected_status=201)
+def create_job_application(ctx):
+    client = ctx.api_client(ctx.user)
+    url = reverse('create-job-application')
+    payload = {
+        'job_listing': ctx.listing.pk,
+        'answers': json.dumps([{'question': q.pk, 'answer_text': 'Benchmark answer'} for q in ctx.questions]),
+        'document_ids': '[]',
+    }
+    return lambda i: client.post(url, payload, format='multipart')
+
+
+@scenario('review_job_application')
+def review_job_application(ctx):
+    client = ctx.api_client(ctx.user)
+    url = reverse('review-job-application', args=[ctx.application.pk])
+    return lambda i: client.get(url)
+
+
+@scenario('login', iterations=20)
+def login(ctx):
+    client = ctx.api_client()
+    url = reverse('login')
+    payload = {'email': BENCH_USER_EMAIL, 'password': BENCH_PASSWORD}
+    return lambda i: client.post(url, payload, format='json')
+
+
+@scenario('upload_schedule', expected_status=200, iterations=10)
+def upload_schedule(ctx):
+    client = ctx.staff_client()
+    url = reverse('upload-schedule')
+    title = ctx.listing.job_post.title
+
+    def request(i):
+        content = build_schedule_workbook(i, 200, title)
+        upload = SimpleUploadedFile('schedule.xlsx', content,
+                                    content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        return client.post(url, {'schedule_file': upload})
+    return request
+
+
+def exhaust_window(throttle_class, ident):
+    throttle = throttle_class()
+    now = throttle.timer()
+    for window_start in (now, now + throttle.duration):
+        throttle.cache.set(throttle.window_key(ident, window_start), throttle.num_requests, 2 * throttle.duration)
+
+
+@scenario('upload_document_throttled_flood', expected_status=429, iterations=500)
+def upload_document_throttled_flood(ctx):
+    client = Client(REMOTE_ADDR=FLOOD_ADDR)
+    url = reverse('upload-document')
+    exhaust_window(UploadDocumentThrottle, FLOOD_ADDR)
+    body = encode_multipart(BOUNDARY, {
+        'name': 'Flood', 'purpose': 'Flood',
+        'file': SimpleUploadedFile('flood.pdf', b'%PDF-1.4\n' + b'0' * 1024 * 1024),
+    })
+    return lambda i: client.post(url, body, content_type=FLOOD_CONTENT_TYPE)
+
+
+@scenario('contact_us_oversized_flood', expected_status=413, iterations=500)
+def contact_us_oversized_flood(ctx):
+    client = Client(REMOTE_ADDR=FLOOD_ADDR)
+    url = reverse('contact-us')
+    declared = settings.INGESTION_MAX_BODY_SIZE['contact_us'] + 1
+    body = encode_multipart(BOUNDARY, {'name': 'Flood'})
+    return lambda i: client.post(url, body, content_type=FLOOD_CONTENT_TYPE, CONTENT_LENGTH=str(declared))
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values), math.ceil(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(scenario, ctx, iterations, warmup=3):
+    iterations = iterations or scenario.iterations or 100
+    latencies = []
+    queries = []
+
+    with transaction.atomic():
+        request = scenario.setup(ctx)
+        for i in range(warmup):
+            request(i)
+
+        started = time.perf_counter()
+        for i in range(warmup, warmup + iterations):
+            timer = QueryTimer()
+            t0 = time.perf_counter()
+            with timer.capture():
+                response = request(i)
+            latencies.append(time.perf_counter() - t0)
+            queries.append(timer.count)
+            if response.status_code != scenario.expected_status:
+                raise AssertionError(
+                    f"{scenario.name}: expected HTTP {scenario.expected_status}, got {response.status_code}"
+                )
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'throughput': round(iterations / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'queries_per_request': round(sum(queries) / len(queries), 2),
+    }
+
+
+def run(names=None, iterations=None, warmup=3, log=None):
+    ctx = BenchmarkContext()
+    results = {}
+    for name in names or SCENARIOS:
+        results[name] = run_scenario(SCENARIOS[name], ctx, iterations, warmup)
+        if log:
+            log(name, results[name])
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if result['throughput'] < base['throughput'] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']}/s vs baseline {base['throughput']}/s")
+        if result['queries_per_request'] > base['queries_per_request'] + 0.5:
+            regressions.append(
+                f"{name}: {result['queries_per_request']} queries/request vs baseline {base['queries_per_request']}"
+            )
+    return regressions
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+DOCUMENTS_VERSION_KEY = 'documents:version'
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache():
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PROCESS_LOCAL_BACKENDS)
+
+
+def documents_cache_version():
+    version = cache.get(DOCUMENTS_VERSION_KEY)
+    if version is None:
+        cache.add(DOCUMENTS_VERSION_KEY, 1, None)
+        version = cache.get(DOCUMENTS_VERSION_KEY, 1)
+    return version
+
+
+def bump_documents_cache_version():
+    try:
+        cache.incr(DOCUMENTS_VERSION_KEY)
+    except ValueError:
+        cache.add(DOCUMENTS_VERSION_KEY, 1, None)
+
+
+def invalidate_documents_cache():
+    transaction.on_commit(bump_documents_cache_version)
+
+
+def documents_cache_key(request, name):
+    query = "&".join(f"{key}={value}" for key, values in sorted(request.GET.lists()) for value in values)
+    return f"documents:{documents_cache_version()}:{name}:{request.scheme}://{request.get_host()}?{query}"
+
+
+def documents_cache_timeout():
+    return settings.DOCUMENTS_CACHE_TIMEOUT if is_shared_cache() else settings.DOCUMENTS_LOCAL_CACHE_TIMEOUT
+
+
+def _cached(key, build):
+    timeout = documents_cache_timeout()
+    if not timeout:
+        return build()
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout)
+    return data
+
+
+def cached_documents(request, name, build):
+    return _cached(documents_cache_key(request, name), build)
+
+
+def cached_documents_state(build):
+    return _cached(f"documents:{documents_cache_version()}:state", build)
@@ -0,0 +1,40 @@
+from collections import Counter
+
+from django.db import transaction
+
+from .merit import refresh_after_confirmation
+from .models import JobApplication
+from .stats import record
+
+
+def confirm_application(application_id, user=None):
+    applications = JobApplication.objects.filter(pk=application_id)
+    if user is not None:
+        applications = applications.filter(applicant__user=user)
+
+    with transaction.atomic():
+        won = applications.filter(is_confirmed=False).update(is_confirmed=True)
+        if won:
+            listing_id, qualification = applications.values_list('job_listing_id', 'highest_qualification').get()
+            record(listing_id, qualification, confirmed=1)
+            refresh_after_confirmation([listing_id])
+    return bool(won)
+
+
+def confirm_applications(application_ids, batch_size=500):
+    confirmed = []
+    application_ids = list(application_ids)
+    for start in range(0, len(application_ids), batch_size):
+        batch = application_ids[start:start + batch_size]
+        with transaction.atomic():
+            rows = list(JobApplication.objects.select_for_update()
+                        .filter(pk__in=batch, is_confirmed=False).order_by('pk')
+                        .values_list('pk', 'job_listing_id', 'highest_qualification'))
+            if not rows:
+                continue
+            JobApplication.objects.filter(pk__in=[pk for pk, _, _ in rows], is_confirmed=False).update(is_confirmed=True)
+            for (listing_id, qualification), count in Counter((row[1], row[2]) for row in rows).items():
+                record(listing_id, qualification, confirmed=count)
+            refresh_after_confirmation(row[1] for row in rows)
+        confirmed.extend(pk for pk, _, _ in rows)
+    return confirmed
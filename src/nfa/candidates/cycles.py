@@ -0,0 +1,183 @@
+import datetime
+import gzip
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .exports import export_schedule
+from .models import ApplicationAnswer, ApplicationDocument, ArchivedCycle, JobApplication, TestSchedule
+from .storage import archive_storage
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+APPLICATION_FIELDS = (
+    'pk', 'reference_number', 'job_listing_id', 'job_listing__job_post__code', 'applicant__user__email',
+    'applicant__user__cnic', 'submitted_at', 'is_confirmed', 'highest_qualification',
+)
+
+
+def cycle_of(day):
+    return day.year if day.month >= settings.RECRUITMENT_CYCLE_START_MONTH else day.year - 1
+
+
+def current_cycle(today=None):
+    return cycle_of(today or timezone.localdate())
+
+
+def cycle_label(cycle):
+    if settings.RECRUITMENT_CYCLE_START_MONTH == 1:
+        return str(cycle)
+    return f"{cycle}-{(cycle + 1) % 100:02d}"
+
+
+def parse_cycle(label):
+    try:
+        return int(str(label).split('-')[0])
+    except ValueError:
+        raise ValueError(f"Invalid cycle {label!r}; use the year it starts in, e.g. 2025.")
+
+
+def cycle_bounds(cycle):
+    month = settings.RECRUITMENT_CYCLE_START_MONTH
+    return datetime.date(cycle, month, 1), datetime.date(cycle + 1, month, 1)
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _write_schedules(queryset, out, storage, prefix, copied):
+    last_pk = queryset.aggregate(last=Max('pk'))['last']
+    queryset = queryset.filter(pk__lte=last_pk)
+    stream, _ = export_schedule(queryset, 'csv')
+    for chunk in stream:
+        out.write(chunk)
+
+    def delete():
+        return queryset.delete()[1].get(TestSchedule._meta.label, 0)
+    return queryset.count(), delete
+
+
+def _copy_document(document, storage, prefix):
+    name = f"{prefix}/documents/{document['application_id']}/{os.path.basename(document['file'])}"
+    try:
+        with ApplicationDocument._meta.get_field('file').storage.open(document['file'], 'rb') as source:
+            return storage.save(name, source)
+    except FileNotFoundError:
+        logger.warning("Application %s references missing file %s", document['application_id'], document['file'])
+        return ''
+
+
+def _write_applications(queryset, out, storage, prefix, copied):
+    pks = []
+    last = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last).order_by('pk').values(*APPLICATION_FIELDS)[:BATCH_SIZE])
+        if not batch:
+            break
+        ids = [row['pk'] for row in batch]
+        answers, documents = defaultdict(list), defaultdict(list)
+        for answer in (ApplicationAnswer.objects.filter(application_id__in=ids).order_by('pk')
+                       .values('application_id', 'question_id', 'question__question_text', 'answer_text')):
+            answers[answer['application_id']].append({
+                'question_id': answer['question_id'], 'question': answer['question__question_text'],
+                'answer': answer['answer_text'],
+            })
+        for document in ApplicationDocument.objects.filter(application_id__in=ids).order_by('pk').values(
+                'application_id', 'name', 'file'):
+            name = _copy_document(document, storage, prefix) if document['file'] else ''
+            if name:
+                copied.append(name)
+            documents[document['application_id']].append({'name': document['name'], 'file': name})
+
+        lines = []
+        for row in batch:
+            record = {
+                'id': row['pk'], 'reference_number': row['reference_number'], 'job_listing_id': row['job_listing_id'],
+                'job_post': row['job_listing__job_post__code'], 'email': row['applicant__user__email'],
+                'cnic': row['applicant__user__cnic'], 'submitted_at': row['submitted_at'],
+                'is_confirmed': row['is_confirmed'], 'highest_qualification': row['highest_qualification'],
+                'answers': answers[row['pk']], 'documents': documents[row['pk']],
+            }
+            lines.append(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False))
+        out.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        pks.extend(ids)
+        last = ids[-1]
+
+    def delete():
+        deleted = 0
+        for start in range(0, len(pks), BATCH_SIZE):
+            deleted += JobApplication.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).delete()[1].get(
+                JobApplication._meta.label, 0)
+        return deleted
+    return len(pks), delete
+
+
+ARCHIVES = {
+    'test_schedules': (TestSchedule, 'test_date', _write_schedules, 'csv.gz'),
+    'job_applications': (JobApplication, 'submitted_at', _write_applications, 'jsonl.gz'),
+}
+
+
+def cycle_queryset(kind, cycle):
+    model, field, _, _ = ARCHIVES[kind]
+    start, end = cycle_bounds(cycle)
+    if field == 'submitted_at':
+        start, end = _aware(start), _aware(end)
+    return model.objects.filter(**{f'{field}__gte': start, f'{field}__lt': end})
+
+
+def archive_cycle(kind, cycle, storage=None):
+    if cycle >= current_cycle():
+        raise ValueError(f"Cycle {cycle_label(cycle)} is still current and cannot be archived.")
+    _, _, write, extension = ARCHIVES[kind]
+    queryset = cycle_queryset(kind, cycle)
+    if not queryset.exists():
+        return None
+
+    storage = storage or archive_storage()
+    label = cycle_label(cycle)
+    prefix = f"cycles/{kind}/{label}"
+    copied = []
+    with tempfile.TemporaryFile() as tmp:
+        with transaction.atomic():
+            try:
+                with gzip.GzipFile(fileobj=tmp, mode='wb') as out:
+                    rows, delete = write(queryset, out, storage, prefix, copied)
+                tmp.seek(0)
+                name = storage.save(f"{prefix}/{kind}-{label}-{timezone.now():%Y%m%d%H%M%S}.{extension}", File(tmp))
+                copied.append(name)
+                archived = ArchivedCycle.objects.create(kind=kind, cycle=label, rows=rows, file=name)
+                delete()
+            except Exception:
+                for name in copied:
+                    storage.delete(name)
+                raise
+    return archived
+
+
+def cycles_with_rows(kind):
+    model, field, _, _ = ARCHIVES[kind]
+    bounds = model.objects.aggregate(first=Min(field), last=Max(field))
+    if bounds['first'] is None:
+        return []
+    first, last = (timezone.localdate(value) if isinstance(value, datetime.datetime) else value
+                   for value in (bounds['first'], bounds['last']))
+    return list(range(cycle_of(first), cycle_of(last) + 1))
+
+
+def expired_cycles(kind, keep=None):
+    keep = settings.RECRUITMENT_CYCLES_KEPT if keep is None else keep
+    oldest_kept = current_cycle() - max(keep, 1) + 1
+    return [cycle for cycle in cycles_with_rows(kind) if cycle < oldest_kept]
@@ -0,0 +1,189 @@
+import csv
+import zipfile
+from io import RawIOBase
+from itertools import groupby
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from .importing import SCHEDULE_COLUMNS
+from .models import TestSchedule
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+FLUSH_SIZE = 64 * 1024
+
+ROW_FIELDS = (
+    'candidate__roll_no', 'candidate__name', 'candidate__father_name', 'candidate__cnic', 'job_post__title',
+    'candidate__postal_address', 'candidate__mobile_no', 'paper', 'test_date', 'session',
+    'reporting_time', 'conduct_time', 'venue',
+)
+DATE_INDEX = ROW_FIELDS.index('test_date')
+VENUE_INDEX = ROW_FIELDS.index('venue')
+
+SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    f'<cols><col min="1" max="{len(SCHEDULE_COLUMNS)}" width="18" customWidth="1"/></cols>'
+    '<sheetData>'
+)
+SHEET_FOOTER = '</sheetData></worksheet>'
+
+
+def schedule_rows(queryset=None):
+    queryset = TestSchedule.objects.all() if queryset is None else queryset
+    rows = (queryset.order_by('venue', 'test_date', 'session', 'candidate__roll_no', 'pk')
+            .values_list(*ROW_FIELDS).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE))
+    for row in rows:
+        yield row[:DATE_INDEX] + (row[DATE_INDEX].strftime('%d %b %Y'),) + row[DATE_INDEX + 1:]
+
+
+def _numbered(rows):
+    for venue, group in groupby(rows, key=lambda row: row[VENUE_INDEX]):
+        yield venue, ((serial,) + row for serial, row in enumerate(group, start=1))
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield ('﻿' + writer.writerow(SCHEDULE_COLUMNS)).encode('utf-8')
+    buffer = []
+    size = 0
+    for _, group in _numbered(rows):
+        for row in group:
+            line = writer.writerow(row)
+            buffer.append(line)
+            size += len(line)
+            if size >= FLUSH_SIZE:
+                yield ''.join(buffer).encode('utf-8')
+                buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+class _Pipe(RawIOBase):
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks, self.size = [], 0
+        return data
+
+
+def _cell(value):
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, int):
+        return f'<c t="n"><v>{value}</v></c>'
+    text = escape(ILLEGAL_CHARACTERS_RE.sub('', str(value)))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def _row(values):
+    return f"<row>{''.join(_cell(value) for value in values)}</row>"
+
+
+def sheet_title(venue, used):
+    title = ''.join(' ' if char in '[]:*?/\\' else char for char in (venue or 'No venue')).strip()[:31] or 'Venue'
+    candidate, n = title, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate, n = title[:31 - len(suffix)] + suffix, n + 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _workbook_parts(titles):
+    sheets = ''.join(f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+                     for n, title in enumerate(titles, start=1))
+    relationships = ''.join(
+        f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{n}.xml"/>'
+        for n in range(1, len(titles) + 1)
+    )
+    overrides = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+        f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for n in range(1, len(titles) + 1)
+    )
+    return {
+        'xl/workbook.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relationships}</Relationships>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ),
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{overrides}</Types>'
+        ),
+    }
+
+
+def stream_xlsx(rows):
+    pipe = _Pipe()
+    titles = []
+    used = set()
+    header = _row(SCHEDULE_COLUMNS)
+    with zipfile.ZipFile(pipe, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for venue, group in _numbered(rows):
+            titles.append(sheet_title(venue, used))
+            with archive.open(f'xl/worksheets/sheet{len(titles)}.xml', 'w', force_zip64=True) as sheet:
+                sheet.write((SHEET_HEADER + header).encode('utf-8'))
+                for row in group:
+                    sheet.write(_row(row).encode('utf-8'))
+                    if pipe.size >= FLUSH_SIZE:
+                        yield pipe.drain()
+                sheet.write(SHEET_FOOTER.encode('utf-8'))
+            yield pipe.drain()
+
+        if not titles:
+            titles.append('Schedule')
+            archive.writestr('xl/worksheets/sheet1.xml', SHEET_HEADER + header + SHEET_FOOTER)
+        for name, content in _workbook_parts(titles).items():
+            archive.writestr(name, content)
+    yield pipe.drain()
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, CSV_CONTENT_TYPE),
+    'xlsx': (stream_xlsx, XLSX_CONTENT_TYPE),
+}
+
+
+def export_schedule(queryset, export_format):
+    stream, content_type = EXPORT_FORMATS[export_format]
+    return stream(schedule_rows(queryset)), content_type
@@ -0,0 +1,407 @@
+import datetime
+import hashlib
+import re
+from collections import defaultdict, namedtuple
+from itertools import compress, groupby, islice
+
+from django.db import transaction
+
+from .models import Candidate, JobPost, TestSchedule
+
+SCHEDULE_COLUMNS = [
+    'Sr.No.', 'Roll No', 'Name', 'Father Name', 'CNIC', 'Post Applied For',
+    'Postal Address', 'Mobile No.', 'Paper', 'Test Date', 'Session',
+    'Reporting Time', 'Conduct Time', 'Venue'
+]
+
+BATCH_SIZE = 5000
+DATE_FORMATS = ("%d %b %Y", "%d %B %Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d-%b-%Y", "%d-%b-%y",
+                "%Y-%m-%d %H:%M:%S")
+CNIC_RE = re.compile(r'\d{5}-\d{7}-\d')
+CNIC_DIGITS_RE = re.compile(r'\d{13}')
+MOBILE_RE = re.compile(r'0\d{9,10}')
+INTERNATIONAL_RE = re.compile(r'\+?\d{7,15}')
+REQUIRED_FIELDS = ('roll_no', 'name', 'cnic', 'post_title', 'paper', 'test_date', 'session')
+CANDIDATE_FIELDS = ('name', 'father_name', 'cnic', 'postal_address', 'mobile_no')
+SCHEDULE_FIELDS = ('reporting_time', 'conduct_time', 'venue', 'row_hash')
+KEY_FIELDS = ('candidate', 'job_post', 'paper', 'test_date', 'session')
+
+VALUE_FIELDS = ('roll_no', 'name', 'father_name', 'cnic', 'post_title', 'postal_address', 'mobile_no',
+                'paper', 'test_date', 'session', 'reporting_time', 'conduct_time', 'venue')
+ScheduleRow = namedtuple('ScheduleRow', ('sheet', 'line') + VALUE_FIELDS)
+
+HEADER_SCAN_ROWS = 10
+HEADER_PROFILES = {
+    'default': {
+        'roll_no': ('Roll No', 'Roll Number', 'Roll #', 'Roll'),
+        'name': ('Name', 'Candidate Name', 'Applicant Name', 'Full Name'),
+        'father_name': ('Father Name', "Father's Name", 'Father / Husband Name', 'F/Name'),
+        'cnic': ('CNIC', 'CNIC No', 'CNIC Number', 'NIC'),
+        'post_title': ('Post Applied For', 'Post', 'Post Name', 'Job Post'),
+        'postal_address': ('Postal Address', 'Address', 'Mailing Address'),
+        'mobile_no': ('Mobile No.', 'Mobile', 'Mobile Number', 'Phone', 'Phone No', 'Contact No'),
+        'paper': ('Paper', 'Paper Name', 'Test Paper'),
+        'test_date': ('Test Date', 'Date', 'Date of Test', 'Exam Date'),
+        'session': ('Session', 'Shift'),
+        'reporting_time': ('Reporting Time', 'Reporting'),
+        'conduct_time': ('Conduct Time', 'Test Time', 'Timing'),
+        'venue': ('Venue', 'Test Venue', 'Test Centre', 'Test Center', 'Centre', 'Center'),
+    },
+}
+
+FIELD_LIMITS = {
+    **{name: Candidate._meta.get_field(name).max_length for name in ('roll_no', 'name', 'father_name', 'cnic', 'mobile_no')},
+    **{name: TestSchedule._meta.get_field(name).max_length
+       for name in ('paper', 'session', 'reporting_time', 'conduct_time')},
+    'post_title': JobPost._meta.get_field('title').max_length,
+}
+
+
+def parse_excel_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    value_str = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value_str, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date format: {value_str}")
+
+
+def normalize_cnic(value):
+    digits = re.sub(r'[\s-]', '', value)
+    if not CNIC_DIGITS_RE.fullmatch(digits):
+        raise ValueError(f"Invalid CNIC: {value}")
+    return f"{digits[:5]}-{digits[5:12]}-{digits[12]}"
+
+
+def normalize_mobile(value):
+    digits = re.sub(r'[\s()./-]', '', value)
+    if digits.startswith('+92'):
+        digits = '0' + digits[3:]
+    elif digits.startswith('92') and len(digits) == 12:
+        digits = '0' + digits[2:]
+    elif digits.startswith('3') and len(digits) == 10:
+        digits = '0' + digits
+    if not (MOBILE_RE.fullmatch(digits) or INTERNATIONAL_RE.fullmatch(digits)):
+        raise ValueError(f"Invalid mobile no: {value}")
+    return digits
+
+
+class ColumnFormats:
+    def __init__(self):
+        self.date_format = None
+        self.dates = {}
+
+    def parse_date(self, value):
+        if self.date_format:
+            try:
+                return datetime.datetime.strptime(value, self.date_format).date()
+            except ValueError:
+                pass
+        for fmt in DATE_FORMATS:
+            try:
+                parsed = datetime.datetime.strptime(value, fmt).date()
+            except ValueError:
+                continue
+            self.date_format = self.date_format or fmt
+            return parsed
+        raise ValueError(f"Invalid date format: {value}")
+
+
+def text_column(values):
+    try:
+        return list(map(str.strip, values))
+    except TypeError:
+        return [value.strip() if type(value) is str else _text(value) for value in values]
+
+
+def date_column(values, formats, problems):
+    dates = formats.dates
+    parsed = []
+    for i, value in enumerate(values):
+        if isinstance(value, datetime.date):
+            parsed.append(value.date() if isinstance(value, datetime.datetime) else value)
+            continue
+        key = _text(value)
+        if key not in dates:
+            try:
+                dates[key] = formats.parse_date(key)
+            except ValueError as e:
+                dates[key] = e
+        result = dates[key]
+        if isinstance(result, ValueError):
+            problems[i].append(str(result))
+            result = None
+        parsed.append(result)
+    return parsed
+
+
+def normalized_column(values, canonical_re, normalize, problems):
+    matches = canonical_re.fullmatch
+    result = list(values)
+    for i, value in enumerate(values):
+        if value and not matches(value):
+            try:
+                result[i] = normalize(value)
+            except ValueError as e:
+                problems[i].append(str(e))
+    return result
+
+
+def job_post_code(title):
+    return title.strip().upper().replace(" ", "_")[:20]
+
+
+def schedule_row_digest(values):
+    text = '\x1f'.join(value.isoformat() if isinstance(value, datetime.date) else (value or '') for value in values)
+    return hashlib.sha1(text.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _is_blank(row):
+    return all(cell is None or (isinstance(cell, str) and cell.strip() == "") for cell in row)
+
+
+def _normalize_header(value):
+    return re.sub(r'[^a-z0-9]', '', str(value).lower()) if value is not None else ''
+
+
+def header_lookup(profile='default', overrides=None):
+    aliases = {field: list(names) for field, names in HEADER_PROFILES[profile].items()}
+    for field, name in (overrides or {}).items():
+        aliases.setdefault(field, []).insert(0, name)
+    return {_normalize_header(name): field for field, names in aliases.items() for name in reversed(names)}
+
+
+def column_map(header, lookup):
+    columns = {}
+    for index, value in enumerate(header):
+        field = lookup.get(_normalize_header(value))
+        if field and field not in columns:
+            columns[field] = index
+    return columns if all(field in columns for field in REQUIRED_FIELDS) else None
+
+
+def _mapped_rows(records, lookup, skipped):
+    for sheet, rows in groupby(records, key=lambda record: record[0]):
+        columns = None
+        for _, line, row in rows:
+            if columns is None:
+                if line > HEADER_SCAN_ROWS:
+                    skipped.append((sheet, "no header row with the required columns"))
+                    break
+                columns = column_map(row, lookup)
+                continue
+            if _is_blank(row):
+                continue
+            width = len(row)
+            yield sheet, line, tuple(row[columns[field]] if field in columns and columns[field] < width else None
+                                     for field in VALUE_FIELDS)
+        else:
+            if columns is None:
+                skipped.append((sheet, "no header row with the required columns"))
+
+
+def validate_rows(batch, errors, formats=None):
+    if not batch:
+        return []
+    formats = formats or ColumnFormats()
+    sheets, lines, values = zip(*batch)
+    problems = defaultdict(list)
+    columns = {}
+    for field, column in zip(VALUE_FIELDS, zip(*values)):
+        columns[field] = date_column(column, formats, problems) if field == 'test_date' else text_column(column)
+    columns['cnic'] = normalized_column(columns['cnic'], CNIC_RE, normalize_cnic, problems)
+    columns['mobile_no'] = normalized_column(columns['mobile_no'], MOBILE_RE, normalize_mobile, problems)
+
+    missing = defaultdict(list)
+    for field in REQUIRED_FIELDS:
+        if field != 'test_date' and not all(columns[field]):
+            for i, value in enumerate(columns[field]):
+                if not value:
+                    missing[i].append(field)
+    too_long = defaultdict(list)
+    for field, limit in FIELD_LIMITS.items():
+        if max(map(len, columns[field])) > limit:
+            for i, value in enumerate(columns[field]):
+                if len(value) > limit:
+                    too_long[i].append(field)
+    for i, fields in missing.items():
+        problems[i].append(f"missing {', '.join(fields)}")
+    for i, fields in too_long.items():
+        problems[i].append(f"too long: {', '.join(fields)}")
+
+    rows = zip(sheets, lines, *(columns[field] for field in VALUE_FIELDS))
+    if problems:
+        for i in sorted(problems):
+            errors.append((sheets[i], lines[i], "; ".join(problems[i])))
+        rows = compress(rows, (i not in problems for i in range(len(batch))))
+    return list(map(ScheduleRow._make, rows))
+
+
+def parse_rows(records, errors, skipped, lookup=None):
+    mapped = _mapped_rows(records, lookup or header_lookup(), skipped)
+    formats = ColumnFormats()
+    rows = []
+    while batch := list(islice(mapped, BATCH_SIZE)):
+        rows.extend(validate_rows(batch, errors, formats))
+    return rows
+
+
+class ImportReport:
+    def __init__(self):
+        self.added = []
+        self.changed = []
+        self.removed = []
+        self.unchanged = 0
+        self.errors = []
+        self.skipped = []
+        self.pruned = False
+        self.prune_blocked = False
+        self.dry_run = False
+
+    @property
+    def summary(self):
+        return (f"{len(self.added)} added, {len(self.changed)} changed, {self.unchanged} unchanged, "
+                f"{len(self.removed)} {'removed' if self.pruned else 'missing from the sheet'}, "
+                f"{len(self.errors)} error(s)" + (f", {len(self.skipped)} sheet(s) skipped" if self.skipped else "")
+                + (", nothing pruned until the errors are fixed" if self.prune_blocked else ""))
+
+
+def row_key(row):
+    return row.roll_no, job_post_code(row.post_title), row.paper, row.test_date, row.session
+
+
+def row_values(row):
+    return tuple(getattr(row, field) for field in VALUE_FIELDS)
+
+
+def _existing_schedules(codes):
+    rows = (TestSchedule.objects.filter(job_post__code__in=codes)
+            .values_list('pk', 'candidate__roll_no', 'job_post__code', 'paper', 'test_date', 'session', 'row_hash')
+            .iterator(chunk_size=BATCH_SIZE))
+    return {(roll_no, code, paper, test_date, session): (pk, row_hash)
+            for pk, roll_no, code, paper, test_date, session, row_hash in rows}
+
+
+def _chunks(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _changed_columns(changed):
+    fields = ('pk', 'candidate__roll_no', 'candidate__name', 'candidate__father_name', 'candidate__cnic',
+              'job_post__title', 'candidate__postal_address', 'candidate__mobile_no', 'paper', 'test_date',
+              'session', 'reporting_time', 'conduct_time', 'venue')
+    current = {}
+    for chunk in _chunks(pk for pk, _ in changed):
+        for pk, *values in TestSchedule.objects.filter(pk__in=chunk).values_list(*fields):
+            current[pk] = tuple(values)
+    labels = SCHEDULE_COLUMNS[1:]
+    return [
+        (row, [label for label, old, new in zip(labels, current.get(pk, ()), row_values(row))
+               if (old or '') != new])
+        for pk, row in changed
+    ]
+
+
+def _check_identities(rows, errors):
+    cnic_owner = {}
+    for chunk in _chunks({row.cnic for row in rows}):
+        cnic_owner.update(Candidate.objects.filter(cnic__in=chunk).values_list('cnic', 'roll_no'))
+    valid = []
+    for row in rows:
+        owner = cnic_owner.setdefault(row.cnic, row.roll_no)
+        if owner != row.roll_no:
+            errors.append((row.sheet, row.line, f"CNIC {row.cnic} already belongs to roll no {owner}"))
+        else:
+            valid.append(row)
+    return valid
+
+
+def _save(rows):
+    posts = {}
+    for row in rows:
+        posts[job_post_code(row.post_title)] = row.post_title
+    post_ids = {}
+    for code, title in posts.items():
+        job_post, _ = JobPost.objects.update_or_create(code=code, defaults={'title': title})
+        post_ids[code] = job_post.pk
+
+    candidates = {row.roll_no: row for row in rows}
+    for chunk in _chunks(candidates.values()):
+        Candidate.objects.bulk_create(
+            [Candidate(roll_no=row.roll_no, **{field: getattr(row, field) for field in CANDIDATE_FIELDS})
+             for row in chunk],
+            update_conflicts=True, unique_fields=['roll_no'], update_fields=list(CANDIDATE_FIELDS),
+        )
+    candidate_ids = {}
+    for chunk in _chunks(candidates):
+        candidate_ids.update(Candidate.objects.filter(roll_no__in=chunk).values_list('roll_no', 'pk'))
+
+    for chunk in _chunks(rows):
+        TestSchedule.objects.bulk_create(
+            [TestSchedule(candidate_id=candidate_ids[row.roll_no], job_post_id=post_ids[job_post_code(row.post_title)],
+                          paper=row.paper, test_date=row.test_date, session=row.session,
+                          reporting_time=row.reporting_time, conduct_time=row.conduct_time, venue=row.venue or None,
+                          row_hash=schedule_row_digest(row_values(row)))
+             for row in chunk],
+            update_conflicts=True, unique_fields=list(KEY_FIELDS), update_fields=list(SCHEDULE_FIELDS),
+        )
+
+
+def import_schedule(records, prune=False, dry_run=False, lookup=None):
+    report = ImportReport()
+    report.dry_run = dry_run
+    rows = parse_rows(records, report.errors, report.skipped, lookup)
+
+    latest = {}
+    for row in rows:
+        key = row_key(row)
+        if key in latest:
+            report.errors.append((row.sheet, row.line, f"Duplicate of {latest[key].sheet} row {latest[key].line}"))
+            continue
+        latest[key] = row
+
+    existing = _existing_schedules({key[1] for key in latest})
+    pending, changed = [], []
+    for key, row in latest.items():
+        current = existing.get(key)
+        if current is None:
+            pending.append(row)
+        elif current[1] == schedule_row_digest(row_values(row)):
+            report.unchanged += 1
+        else:
+            pending.append(row)
+            changed.append((current[0], row))
+
+    pending = _check_identities(pending, report.errors)
+    accepted = {(row.sheet, row.line) for row in pending}
+    changed = [(pk, row) for pk, row in changed if (row.sheet, row.line) in accepted]
+    changed_lines = {(row.sheet, row.line) for _, row in changed}
+    report.added = [row for row in pending if (row.sheet, row.line) not in changed_lines]
+    report.changed = _changed_columns(changed)
+    report.removed = sorted((key, pk) for key, (pk, _) in existing.items() if key not in latest)
+    report.errors.sort()
+    report.prune_blocked = prune and bool(report.errors)
+    report.pruned = prune and not dry_run and not report.prune_blocked
+
+    if not dry_run:
+        with transaction.atomic():
+            _save(pending)
+            if report.pruned:
+                for chunk in _chunks(pk for _, pk in report.removed):
+                    TestSchedule.objects.filter(pk__in=chunk).delete()
+    return report
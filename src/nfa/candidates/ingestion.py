@@ -0,0 +1,70 @@
+import os
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework import serializers
+
+SIGNATURES = [
+    ('pdf', (b'%PDF-',)),
+    ('jpeg', (b'\xff\xd8\xff',)),
+    ('png', (b'\x89PNG\r\n\x1a\n',)),
+    ('gif', (b'GIF87a', b'GIF89a')),
+    ('tiff', (b'II*\x00', b'MM\x00*')),
+    ('ole', (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',)),
+    ('zip', (b'PK\x03\x04',)),
+]
+
+EXTENSIONS = {
+    'pdf': {'.pdf'},
+    'jpeg': {'.jpg', '.jpeg'},
+    'png': {'.png'},
+    'gif': {'.gif'},
+    'tiff': {'.tif', '.tiff'},
+    'webp': {'.webp'},
+    'ole': {'.doc', '.xls', '.ppt'},
+    'zip': {'.docx', '.xlsx', '.pptx', '.odt', '.ods'},
+}
+
+DOCUMENT_TYPES = ('pdf', 'jpeg', 'png', 'ole', 'zip')
+CONTACT_ATTACHMENT_TYPES = ('pdf', 'jpeg', 'png', 'webp', 'tiff', 'ole', 'zip')
+
+HEADER_SIZE = 16
+
+
+def sniff_file_type(file):
+    position = file.tell()
+    header = file.read(HEADER_SIZE)
+    file.seek(position)
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    for kind, magics in SIGNATURES:
+        if header.startswith(magics):
+            return kind
+    return None
+
+
+def validate_file_signature(file, allowed):
+    kind = sniff_file_type(file)
+    if kind not in allowed:
+        raise serializers.ValidationError("Unsupported file type.")
+    ext = os.path.splitext(file.name)[1].lower()
+    if ext not in EXTENSIONS[kind]:
+        raise serializers.ValidationError(f"File extension {ext or '(none)'} does not match its contents.")
+    return file
+
+
+def limit_body_size(name):
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            limit = settings.INGESTION_MAX_BODY_SIZE[name]
+            try:
+                length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                return JsonResponse({"detail": "Invalid Content-Length."}, status=400)
+            if length > limit:
+                return JsonResponse({"detail": f"Request body exceeds {limit} bytes."}, status=413)
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
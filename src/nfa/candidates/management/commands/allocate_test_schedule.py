@@ -0,0 +1,67 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.allocation import (DEFAULT_PAPER, DEFAULT_SESSIONS, Session, allocate, read_venues, test_dates,
+                                   write_plan)
+from candidates.models import JobPost
+
+
+def parse_session(value):
+    parts = [part.strip() for part in value.split('|')]
+    if len(parts) != 3 or not all(parts):
+        raise ValueError
+    return Session(*parts)
+
+
+class Command(BaseCommand):
+    help = "Assign roll numbers, venues, dates and sessions to the shortlisted applicants of a job post."
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_post', help="Job post code.")
+        parser.add_argument('--venues', required=True, help="CSV file with venue, city and capacity columns.")
+        parser.add_argument('--start-date', required=True, type=datetime.date.fromisoformat, help="First test date (YYYY-MM-DD).")
+        parser.add_argument('--days', type=int, default=1, help="Number of test days.")
+        parser.add_argument('--skip-weekends', action='store_true', help="Do not schedule tests on Saturdays and Sundays.")
+        parser.add_argument('--session', action='append', dest='sessions', metavar='NAME|REPORTING|CONDUCT',
+                            help="Session, e.g. 'Morning|08:30 AM|09:00 AM - 10:30 AM' (repeatable).")
+        parser.add_argument('--paper', default=DEFAULT_PAPER)
+        parser.add_argument('--roll-prefix', help="Roll number prefix (default: the zero-padded job post id).")
+        parser.add_argument('--dry-run', action='store_true', help="Plan without writing candidates or schedules.")
+        parser.add_argument('--output', help="Write the plan to this .xlsx file (required with --dry-run).")
+
+    def handle(self, *args, **options):
+        if options['dry_run'] and not options['output']:
+            raise CommandError("--dry-run needs --output to export the plan.")
+        job_post = JobPost.objects.filter(code=options['job_post']).first()
+        if job_post is None:
+            raise CommandError(f"Unknown job post {options['job_post']!r}.")
+
+        try:
+            sessions = [parse_session(value) for value in options['sessions']] if options['sessions'] \
+                else [Session(*session) for session in DEFAULT_SESSIONS]
+        except ValueError:
+            raise CommandError("Sessions must look like 'NAME|REPORTING TIME|CONDUCT TIME'.")
+
+        started = time.perf_counter()
+        try:
+            with open(options['venues'], newline='', encoding='utf-8-sig') as fileobj:
+                venues = read_venues(fileobj)
+            dates = test_dates(options['start_date'], options['days'], options['skip_weekends'])
+            assignments = allocate(job_post, venues, sessions, dates, paper=options['paper'],
+                                   roll_prefix=options['roll_prefix'], dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        if options['output']:
+            write_plan(assignments, job_post, options['output'], paper=options['paper'])
+            self.stdout.write(f"Plan written to {options['output']}")
+
+        used = len({assignment.slot.index for assignment in assignments})
+        verb = "Planned" if options['dry_run'] else "Scheduled"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(assignments)} candidate(s) for {job_post.code} across {used} venue/session slot(s) "
+            f"in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidates.archival import archivable_contact_requests, archive_contact_requests
+from candidates.models import ContactRequest
+
+
+class Command(BaseCommand):
+    help = "Move old contact requests and their files into the archive table and storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help="Archive requests submitted more than this many days ago.")
+        parser.add_argument('--status', nargs='*', choices=[choice for choice, _ in ContactRequest.STATUS_CHOICES],
+                            help="Only archive requests in these statuses (default: resolved and closed).")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            count = archivable_contact_requests(cutoff, options['status']).count()
+            self.stdout.write(f"Would archive {count} contact request(s) submitted before {cutoff:%Y-%m-%d}.")
+            return
+
+        archived, files = archive_contact_requests(
+            cutoff, statuses=options['status'], batch_size=options['batch_size'],
+            log=lambda archived, files: self.stdout.write(f"  archived {archived} request(s), {files} file(s)"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} contact request(s) and {files} file(s)."))
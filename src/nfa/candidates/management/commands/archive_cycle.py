@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.cycles import ARCHIVES, archive_cycle, cycle_label, cycle_queryset, parse_cycle
+
+
+class Command(BaseCommand):
+    help = "Export one recruitment cycle of test schedules and/or job applications to compressed archive files and remove it from the live tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('cycle', help="Cycle to archive, by the year it starts in (e.g. 2024).")
+        parser.add_argument('--kind', choices=[*ARCHIVES, 'all'], default='all')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            cycle = parse_cycle(options['cycle'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        kinds = list(ARCHIVES) if options['kind'] == 'all' else [options['kind']]
+        for kind in kinds:
+            if options['dry_run']:
+                count = cycle_queryset(kind, cycle).count()
+                self.stdout.write(f"Would archive {count} {kind.replace('_', ' ')} from cycle {cycle_label(cycle)}.")
+                continue
+            try:
+                archived = archive_cycle(kind, cycle)
+            except ValueError as e:
+                raise CommandError(str(e))
+            if archived is None:
+                self.stdout.write(f"No {kind.replace('_', ' ')} in cycle {cycle_label(cycle)}.")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Archived {archived.rows} {kind.replace('_', ' ')} to {archived.file.name}."))
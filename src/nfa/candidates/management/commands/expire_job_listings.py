@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidates.models import JobListing
+
+
+class Command(BaseCommand):
+    help = "Mark open job listings whose application deadline has passed as expired."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['dry_run']:
+            count = JobListing.objects.past_deadline(today).count()
+            self.stdout.write(f"Would expire {count} job listing(s) with a deadline before {today}.")
+            return
+
+        expired = JobListing.objects.expire_past_deadline(today)
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} job listing(s) with a deadline before {today}."))
@@ -0,0 +1,43 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.exports import EXPORT_FORMATS, export_schedule
+from candidates.models import TestSchedule
+from candidates.serializers import ScheduleExportFilterSerializer
+
+
+class Command(BaseCommand):
+    help = "Export test schedules as attendance sheets (one sheet per venue for .xlsx)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Output file; the format follows the extension (.xlsx or .csv).")
+        parser.add_argument('--job-post', help="Job post code.")
+        parser.add_argument('--venue')
+        parser.add_argument('--session')
+        parser.add_argument('--test-date', help="YYYY-MM-DD")
+        parser.add_argument('--date-from', help="YYYY-MM-DD")
+        parser.add_argument('--date-to', help="YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        extension = os.path.splitext(options['output'])[1].lstrip('.').lower()
+        if extension not in EXPORT_FORMATS:
+            raise CommandError(f"Unsupported format {extension!r}; use one of {', '.join(EXPORT_FORMATS)}.")
+
+        filters = ScheduleExportFilterSerializer(data={
+            key: options[key] for key in ('job_post', 'venue', 'session', 'test_date', 'date_from', 'date_to')
+            if options[key]
+        })
+        if not filters.is_valid():
+            raise CommandError(filters.errors)
+
+        started = time.perf_counter()
+        stream, _ = export_schedule(filters.filter_queryset(TestSchedule.objects.all()), extension)
+        size = 0
+        with open(options['output'], 'wb') as out:
+            for chunk in stream:
+                out.write(chunk)
+                size += len(chunk)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {size / 1024:.0f} KiB to {options['output']} in {elapsed:.2f}s."))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from candidates.storage import collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed upload blobs that are no longer referenced."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recount', action='store_true',
+                            help="Recompute reference counts from the referencing tables first.")
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help="Keep unreferenced blobs younger than this many hours.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            changed = recount_references()
+            self.stdout.write(f"Corrected reference counts on {changed} blob(s).")
+
+        removed, freed = collect_garbage(grace=timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        verb = "Would remove" if options['dry_run'] else "Removed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} blob(s), {freed / 1024 / 1024:.1f} MiB."))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from candidates.merit import add_late_applications, generate
+from candidates.models import JobListing
+
+
+class Command(BaseCommand):
+    help = "Rank confirmed applications per job listing and persist the merit list."
+
+    def add_arguments(self, parser):
+        parser.add_argument('listings', nargs='*', type=int, help="Job listing ids (default: every listing past its deadline).")
+        parser.add_argument('--incremental', action='store_true',
+                            help="Only insert confirmed applications missing from existing merit lists.")
+
+    def handle(self, *args, **options):
+        if options['listings']:
+            listings = JobListing.objects.filter(pk__in=options['listings'])
+            missing = set(options['listings']) - set(listings.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"Unknown job listings: {', '.join(map(str, sorted(missing)))}")
+        else:
+            listings = JobListing.objects.filter(application_deadline__lt=timezone.localdate())
+        if options['incremental']:
+            listings = listings.filter(merit_list__generated_at__isnull=False)
+
+        for listing in listings.select_related('job_post').order_by('pk'):
+            started = time.perf_counter()
+            if options['incremental']:
+                added = add_late_applications(listing)
+                summary = f"{added} late application(s) inserted"
+            else:
+                merit_list = generate(listing)
+                summary = f"{merit_list.applicants} ranked, {merit_list.shortlisted} shortlisted"
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"  {listing.pk} {listing.job_post.title}: {summary} in {elapsed:.2f}s")
+        self.stdout.write(self.style.SUCCESS("Merit lists up to date."))
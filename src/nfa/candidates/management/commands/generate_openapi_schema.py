@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from nfa.schema import build_bundle, write_bundle
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once and store it with gzip and brotli variants."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help="Directory to write to (default: OPENAPI_SCHEMA_DIR).")
+
+    def handle(self, *args, **options):
+        bundle = build_bundle()
+        write_bundle(bundle, options['output_dir'])
+        sizes = ", ".join(f"{coding}={len(content)}B" for coding, content in bundle.variants.items())
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI schema {bundle.digest} written ({sizes})."))
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.importing import HEADER_PROFILES, VALUE_FIELDS, header_lookup, import_schedule
+from candidates.readers import read_schedule, supported_extensions
+
+
+def parse_column(value):
+    field, _, header = value.partition('=')
+    if field not in VALUE_FIELDS or not header:
+        raise ValueError
+    return field, header
+
+
+class Command(BaseCommand):
+    help = "Import a test schedule file, updating changed rows and skipping unchanged ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('schedule_file', help=f"Schedule file ({', '.join(supported_extensions())}).")
+        parser.add_argument('--profile', default='default', choices=sorted(HEADER_PROFILES),
+                            help="Header mapping profile.")
+        parser.add_argument('--column', action='append', default=[], metavar='FIELD=HEADER',
+                            help=f"Map a header to a field, e.g. 'roll_no=Seat No' (fields: {', '.join(VALUE_FIELDS)}).")
+        parser.add_argument('--prune', action='store_true',
+                            help="Delete schedules of the file's job posts that are missing from it.")
+        parser.add_argument('--dry-run', action='store_true', help="Report the changes without saving them.")
+        parser.add_argument('--verbose-diff', action='store_true', help="List every added, changed and removed row.")
+
+    def handle(self, *args, **options):
+        try:
+            overrides = dict(parse_column(value) for value in options['column'])
+        except ValueError:
+            raise CommandError("--column must look like FIELD=HEADER with a known field.")
+
+        started = time.perf_counter()
+        try:
+            with open(options['schedule_file'], 'rb') as fileobj:
+                records = read_schedule(fileobj, options['schedule_file'])
+                report = import_schedule(records, prune=options['prune'], dry_run=options['dry_run'],
+                                         lookup=header_lookup(options['profile'], overrides))
+        except Exception as e:
+            raise CommandError(f"Error reading file: {e}")
+        elapsed = time.perf_counter() - started
+
+        for sheet, reason in report.skipped:
+            self.stderr.write(f"  skipped sheet {sheet}: {reason}")
+        for sheet, line, problem in report.errors:
+            self.stderr.write(f"  {sheet} row {line}: {problem}")
+        if options['verbose_diff']:
+            for row in report.added:
+                self.stdout.write(f"  + {row.sheet} row {row.line}: {row.roll_no} {row.test_date} {row.session} {row.venue}")
+            for row, columns in report.changed:
+                self.stdout.write(f"  ~ {row.sheet} row {row.line}: {row.roll_no} {row.test_date} {row.session} "
+                                  f"({', '.join(columns)})")
+            for key, _ in report.removed:
+                self.stdout.write(f"  - {' '.join(map(str, key))}")
+        prefix = "Dry run: " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(f"{prefix}{report.summary} in {elapsed:.2f}s."))
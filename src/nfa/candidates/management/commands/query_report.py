@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+
+STATEMENTS_SQL = """
+    SELECT calls, {total} AS total_ms, {mean} AS mean_ms, rows, shared_blks_hit, shared_blks_read, query
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) AND calls >= %s
+    ORDER BY {total} DESC
+    LIMIT %s
+"""
+
+SEQUENTIAL_SCANS_SQL = """
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0), n_live_tup
+    FROM pg_stat_user_tables
+    WHERE seq_scan > 0 AND n_live_tup >= %s
+    ORDER BY seq_tup_read DESC
+    LIMIT %s
+"""
+
+
+def _statement(query, width=100):
+    text = ' '.join(query.split())
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+class Command(BaseCommand):
+    help = "Report the most expensive statements from pg_stat_statements and tables read mostly by sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--min-calls', type=int, default=5, help="Ignore statements called fewer times.")
+        parser.add_argument('--min-rows', type=int, default=10000,
+                            help="Only report sequential scans on tables with at least this many live rows.")
+        parser.add_argument('--reset', action='store_true', help="Reset pg_stat_statements after reporting.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(f"Query statistics need PostgreSQL; the {connection.vendor} database has none. Skipping.")
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+            installed = cursor.fetchone() is not None
+        if installed:
+            self._statements(options)
+        else:
+            self.stdout.write("pg_stat_statements is not installed; add it to shared_preload_libraries and run "
+                              "CREATE EXTENSION pg_stat_statements. Skipping statement report.")
+        self._sequential_scans(options)
+
+    def _statements(self, options):
+        legacy = connection.pg_version < 130000
+        sql = STATEMENTS_SQL.format(total='total_time' if legacy else 'total_exec_time',
+                                    mean='mean_time' if legacy else 'mean_exec_time')
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [options['min_calls'], options['limit']])
+                rows = cursor.fetchall()
+                if options['reset']:
+                    cursor.execute("SELECT pg_stat_statements_reset()")
+        except DatabaseError as e:
+            self.stdout.write(f"pg_stat_statements is not readable ({str(e).strip()}). Skipping statement report.")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Most expensive statements"))
+        self.stdout.write(f"{'total ms':>12}{'calls':>9}{'mean ms':>10}{'rows/call':>11}{'hit %':>7}  statement")
+        for calls, total_ms, mean_ms, returned, hit, read, query in rows:
+            hit_ratio = 100 * hit / (hit + read) if hit + read else 100
+            self.stdout.write(f"{total_ms:>12.0f}{calls:>9}{mean_ms:>10.2f}{returned / calls:>11.1f}{hit_ratio:>7.1f}  "
+                              f"{_statement(query)}")
+
+    def _sequential_scans(self, options):
+        with connection.cursor() as cursor:
+            cursor.execute(SEQUENTIAL_SCANS_SQL, [options['min_rows'], options['limit']])
+            rows = cursor.fetchall()
+        self.stdout.write(self.style.MIGRATE_HEADING("Tables read by sequential scans"))
+        if not rows:
+            self.stdout.write(f"  none with at least {options['min_rows']} live rows")
+        for table, seq_scans, tuples_read, index_scans, live in rows:
+            flag = '  <- mostly unindexed' if seq_scans > index_scans else ''
+            self.stdout.write(f"  {table:<40}{seq_scans:>8} seq scans ({tuples_read} rows read), "
+                              f"{index_scans} index scans, {live} live rows{flag}")
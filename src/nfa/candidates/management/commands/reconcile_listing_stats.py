@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from candidates.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute per-listing application statistics from the applications table."
+
+    def handle(self, *args, **options):
+        corrected = reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} statistics row(s)."))
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from candidates.cycles import ARCHIVES, archive_cycle, cycle_label, cycle_queryset, expired_cycles
+
+
+class Command(BaseCommand):
+    help = "Archive every recruitment cycle older than the ones kept in the live tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=settings.RECRUITMENT_CYCLES_KEPT,
+                            help="Number of cycles, the current one included, to keep live.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        total = 0
+        for kind in ARCHIVES:
+            for cycle in expired_cycles(kind, options['keep']):
+                if options['dry_run']:
+                    count = cycle_queryset(kind, cycle).count()
+                    self.stdout.write(f"Would archive {count} {kind.replace('_', ' ')} from cycle {cycle_label(cycle)}.")
+                    continue
+                archived = archive_cycle(kind, cycle)
+                if archived:
+                    total += archived.rows
+                    self.stdout.write(f"  {kind.replace('_', ' ')} {archived.cycle}: {archived.rows} row(s) -> {archived.file.name}")
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Archived {total} row(s)."))
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.benchmarks.runner import SCENARIOS, compare, run
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = "Drive the hot API endpoints in-process and report throughput, latency percentiles and queries per request."
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help=f"Scenarios to run (default: all). Choices: {', '.join(SCENARIOS)}")
+        parser.add_argument('--iterations', type=int, help="Measured iterations per scenario.")
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline JSON file to compare against.")
+        parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline.")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown before flagging.")
+        parser.add_argument('--output', help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        unknown = set(options['scenarios']) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'scenario':<32}{'iters':>7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+        results = run(options['scenarios'], options['iterations'], options['warmup'], log=self._log)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+            return
+
+        regressions = compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(regression))
+            raise CommandError(f"{len(regressions)} regression(s) against {baseline_path}")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def _log(self, name, result):
+        self.stdout.write(
+            f"{name:<32}{result['iterations']:>7}{result['throughput']:>10}{result['p50_ms']:>10}"
+            f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['queries_per_request']:>9}"
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.benchmarks.concurrency import run_confirmation_harness
+
+
+class Command(BaseCommand):
+    help = "Confirm the same application from many threads at once and check exactly one request wins."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help="Number of applications to race on.")
+        parser.add_argument('--threads', type=int, default=16, help="Concurrent requests per application.")
+        parser.add_argument('--base-url', help="Hit a running server (e.g. http://localhost:8080) instead of the in-process client.")
+
+    def handle(self, *args, **options):
+        result = run_confirmation_harness(
+            rounds=options['rounds'], threads=options['threads'], base_url=options['base_url'],
+            log=lambda pk, codes: self.stdout.write(f"  application {pk}: {codes}") if options['verbosity'] > 1 else None,
+        )
+        for key, value in result.items():
+            self.stdout.write(f"{key:<26}{value}")
+
+        rounds = result['rounds']
+        if (result['rounds_with_one_winner'] != rounds or result['confirmed_counter_delta'] != rounds
+                or not result['all_confirmed']):
+            raise CommandError("Confirmation is not race-free: expected exactly one winner per application.")
+        self.stdout.write(self.style.SUCCESS("Every application was confirmed exactly once."))
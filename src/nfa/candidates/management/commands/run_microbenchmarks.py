@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.benchmarks.micro import MICROBENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run in-process microbenchmarks (results are rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmarks', nargs='*', help=f"Benchmarks to run (default: all). Choices: {', '.join(MICROBENCHMARKS)}")
+        parser.add_argument('--size', type=int, help="Override the dataset size of each benchmark.")
+
+    def handle(self, *args, **options):
+        unknown = set(options['benchmarks']) - set(MICROBENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+        for name in options['benchmarks'] or MICROBENCHMARKS:
+            kwargs = {'size': options['size']} if options['size'] else {}
+            results = MICROBENCHMARKS[name](**kwargs)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, metrics in results.items():
+                values = "  ".join(f"{key}={value}" for key, value in metrics.items())
+                self.stdout.write(f"  {label:<40}{values}")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.benchmarks.factories import bench_data_exists, clear_bench_data, scaled_sizes, seed
+
+
+class Command(BaseCommand):
+    help = "Seed a realistic benchmark dataset (100k candidates, 1M test schedules, 50k profiles at scale 1.0)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiplier applied to the default sizes.")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducible data.")
+        parser.add_argument('--reset', action='store_true', help="Delete existing benchmark data first.")
+
+    def handle(self, *args, **options):
+        if bench_data_exists():
+            if not options['reset']:
+                raise CommandError("Benchmark data already exists. Use --reset to recreate it.")
+            self.stdout.write("Removing existing benchmark data...")
+            clear_bench_data()
+
+        sizes = scaled_sizes(options['scale'])
+        self.stdout.write(f"Seeding benchmark data: {sizes}")
+        seed(sizes, options['seed'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS("Benchmark data seeded."))
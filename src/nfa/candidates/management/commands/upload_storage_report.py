@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Sum
+
+from candidates.models import Blob
+
+
+def _mib(value):
+    return f"{(value or 0) / 1024 / 1024:.1f} MiB"
+
+
+class Command(BaseCommand):
+    help = "Report storage used by uploads and the space saved by deduplication and image normalization."
+
+    def handle(self, *args, **options):
+        totals = Blob.objects.aggregate(blobs=Count('id'), stored=Sum('size'))
+        dedup_saved = Blob.objects.filter(ref_count__gt=1).aggregate(
+            saved=Sum(F('size') * (F('ref_count') - 1))
+        )['saved']
+        normalized = Blob.objects.filter(processed=True, original_size__isnull=False).aggregate(
+            count=Count('id'), before=Sum('original_size'), after=Sum('size')
+        )
+        normalized_saved = (normalized['before'] or 0) - (normalized['after'] or 0)
+
+        self.stdout.write(f"Stored blobs:            {totals['blobs']} ({_mib(totals['stored'])})")
+        self.stdout.write(f"Saved by deduplication:  {_mib(dedup_saved)}")
+        self.stdout.write(
+            f"Normalized images:       {normalized['count']} "
+            f"({_mib(normalized['before'])} -> {_mib(normalized['after'])}, saved {_mib(normalized_saved)})"
+        )
@@ -0,0 +1,175 @@
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (Case, DateField, DurationField, ExpressionWrapper, F, IntegerField, OuterRef, Q,
+                              Subquery, Sum, Value, When, Window)
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+from .models import JobApplication, JobListing, MeritList, MeritListEntry, WorkHistory
+from .utils import QUALIFICATION_ORDER
+
+logger = logging.getLogger(__name__)
+
+QUALIFICATION_LEVEL = Case(
+    *[When(highest_qualification=degree, then=Value(level)) for degree, level in QUALIFICATION_ORDER.items()],
+    default=Value(0), output_field=IntegerField(),
+)
+
+RANK_ORDER = [
+    F('qualification_level').desc(),
+    F('experience').desc(),
+    F('date_of_birth').asc(),
+    F('submitted_at').asc(),
+    F('pk').asc(),
+]
+
+ROW_FIELDS = ('pk', 'qualification_level', 'experience', 'date_of_birth', 'submitted_at')
+
+
+def shortlist_size(listing):
+    return math.ceil(listing.number_of_positions * settings.MERIT_SHORTLIST_RATIO)
+
+
+def _years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def ranking_queryset(listing, today=None):
+    today = today or timezone.localdate()
+    worked = ExpressionWrapper(
+        Coalesce(F('end_date'), Value(today, output_field=DateField())) - F('start_date'),
+        output_field=DurationField(),
+    )
+    experience = (WorkHistory.objects.filter(profile_id=OuterRef('applicant_id')).order_by()
+                  .values('profile_id').annotate(total=Sum(worked)).values('total'))
+    applications = (JobApplication.objects.filter(job_listing=listing, is_confirmed=True)
+                    .annotate(qualification_level=QUALIFICATION_LEVEL,
+                              experience=Coalesce(Subquery(experience), Value(timedelta(0)),
+                                                  output_field=DurationField()),
+                              date_of_birth=F('applicant__date_of_birth')))
+    if listing.minimum_qualification:
+        applications = applications.filter(
+            qualification_level__gte=QUALIFICATION_ORDER.get(listing.minimum_qualification, 0),
+        )
+    if listing.minimum_age:
+        applications = applications.filter(date_of_birth__lte=_years_before(today, listing.minimum_age))
+    if listing.required_experience:
+        applications = applications.filter(experience__gte=timedelta(days=365 * listing.required_experience))
+    return applications
+
+
+def _entry(listing, row, rank, cutoff):
+    pk, level, experience, date_of_birth, submitted_at = row
+    return MeritListEntry(
+        job_listing=listing, application_id=pk, rank=rank, shortlisted=rank <= cutoff,
+        qualification_level=level, experience=experience,
+        date_of_birth=date_of_birth, submitted_at=submitted_at,
+    )
+
+
+def _insert_ranked(listing):
+    ranked = (ranking_queryset(listing).order_by()
+              .annotate(merit_rank=Window(RowNumber(), order_by=RANK_ORDER),
+                        merit_application=F('pk'), merit_submitted_at=F('submitted_at'))
+              .values('merit_application', 'merit_rank', 'qualification_level', 'experience', 'date_of_birth',
+                      'merit_submitted_at'))
+    select_sql, select_params = ranked.query.sql_with_params()
+
+    qn = connection.ops.quote_name
+    opts = MeritListEntry._meta
+    fields = ['job_listing', 'application', 'rank', 'shortlisted',
+              'qualification_level', 'experience', 'date_of_birth', 'submitted_at']
+    sources = ['%s', 'ranked.merit_application', 'ranked.merit_rank', '%s',
+               'ranked.qualification_level', 'ranked.experience', 'ranked.date_of_birth', 'ranked.merit_submitted_at']
+    sql = (f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(opts.get_field(name).column) for name in fields)}) "
+           f"SELECT {', '.join(sources)} FROM ({select_sql}) ranked")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (listing.pk, False, *select_params))
+        return cursor.rowcount
+
+
+def _lock(listing):
+    MeritList.objects.get_or_create(job_listing=listing)
+    return MeritList.objects.select_for_update().get(job_listing=listing)
+
+
+def _finish(merit_list, cutoff):
+    merit_list.applicants = MeritListEntry.objects.filter(job_listing_id=merit_list.job_listing_id).count()
+    merit_list.shortlisted = min(merit_list.applicants, cutoff)
+    merit_list.save()
+    return merit_list
+
+
+def generate(listing):
+    cutoff = shortlist_size(listing)
+    with transaction.atomic():
+        merit_list = _lock(listing)
+        MeritListEntry.objects.filter(job_listing=listing).delete()
+
+        _insert_ranked(listing)
+        MeritListEntry.objects.filter(job_listing=listing, rank__lte=cutoff).update(shortlisted=True)
+
+        merit_list.generated_at = timezone.now()
+        return _finish(merit_list, cutoff)
+
+
+def _ranked_above(level, experience, date_of_birth, submitted_at, pk):
+    same_level = Q(qualification_level=level)
+    same_experience = same_level & Q(experience=experience)
+    same_age = same_experience & Q(date_of_birth=date_of_birth)
+    return (Q(qualification_level__gt=level)
+            | same_level & Q(experience__gt=experience)
+            | same_experience & Q(date_of_birth__lt=date_of_birth)
+            | same_age & Q(submitted_at__lt=submitted_at)
+            | same_age & Q(submitted_at=submitted_at, application_id__lt=pk))
+
+
+def add_late_applications(listing):
+    cutoff = shortlist_size(listing)
+    with transaction.atomic():
+        merit_list = MeritList.objects.select_for_update().filter(job_listing=listing, generated_at__isnull=False).first()
+        if merit_list is None:
+            return 0
+
+        late = list(ranking_queryset(listing).filter(merit_entry__isnull=True)
+                    .order_by(*RANK_ORDER).values_list(*ROW_FIELDS))
+        if len(late) > settings.MERIT_INCREMENTAL_LIMIT:
+            generate(listing)
+            return len(late)
+
+        entries = MeritListEntry.objects.filter(job_listing=listing)
+        added = 0
+        for row in late:
+            entry = _entry(listing, row, 1, cutoff)
+            rank = entries.filter(_ranked_above(entry.qualification_level, entry.experience,
+                                                entry.date_of_birth, entry.submitted_at, entry.application_id)).count() + 1
+            entries.filter(rank__gte=rank).update(rank=F('rank') + 1)
+            entry.rank, entry.shortlisted = rank, rank <= cutoff
+            entry.save()
+            if entry.shortlisted:
+                entries.filter(rank=cutoff + 1, shortlisted=True).update(shortlisted=False)
+            added += 1
+
+        if added:
+            _finish(merit_list, cutoff)
+        return added
+
+
+def refresh_after_confirmation(listing_ids):
+    listing_ids = set(listing_ids)
+    if not MeritList.objects.filter(job_listing_id__in=listing_ids, generated_at__isnull=False).exists():
+        return
+
+    def refresh():
+        for listing in JobListing.objects.filter(pk__in=listing_ids, merit_list__generated_at__isnull=False):
+            added = add_late_applications(listing)
+            logger.info("Inserted %s late application(s) into the merit list of listing %s", added, listing.pk)
+
+    transaction.on_commit(refresh, robust=True)
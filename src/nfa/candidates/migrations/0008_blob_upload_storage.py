@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:27
+
+import candidates.models
+import candidates.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0007_applicationdocument_uploaded_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_referenced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='applicationdocument',
+            name='file',
+            field=models.FileField(storage=candidates.storage.upload_storage, upload_to=candidates.models.application_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='contactrequest',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=candidates.storage.upload_storage, upload_to=candidates.models.contact_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(storage=candidates.storage.upload_storage, upload_to='documents/'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0008_blob_upload_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blob',
+            name='original_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='preview_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='processed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='source_name',
+            field=models.CharField(blank=True, db_index=True, help_text='Original blob this one was normalized from', max_length=255),
+        ),
+    ]
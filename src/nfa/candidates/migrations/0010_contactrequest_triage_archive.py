@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:36
+
+import candidates.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0009_blob_processing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContactRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(max_length=50)),
+                ('service', models.CharField(choices=[('fingerprint_analysis', 'Fingerprint Analysis'), ('digital_forensics', 'Digital Forensics'), ('narcotics_analysis', 'Narcotics Analysis'), ('crime_scene_investigation', 'Crime Scene Investigation'), ('firearms_tool_marks', 'Firearms & Tool Marks'), ('dna_forensics', 'DNA Forensics'), ('questioned_documents', 'Questioned Documents'), ('toxicology', 'Toxicology'), ('serology', 'Serology'), ('pathology', 'Pathology'), ('explosives_analysis', 'Explosives Analysis')], max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('preferred_contact', models.CharField(choices=[('email', 'Email'), ('phone', 'Phone')], max_length=10)),
+                ('file', models.FileField(blank=True, max_length=255, null=True, storage=candidates.storage.archive_storage, upload_to='')),
+                ('submitted_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='contactrequest',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_contact_requests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='contactrequest',
+            name='status',
+            field=models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], default='new', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='contactrequest',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['service', '-submitted_at'], name='contact_service_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['status', '-submitted_at'], name='contact_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['preferred_contact', '-submitted_at'], name='contact_pref_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['-submitted_at'], name='contact_submitted_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedcontactrequest',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcontactrequest',
+            index=models.Index(fields=['service', '-submitted_at'], name='archived_service_submitted_idx'),
+        ),
+    ]
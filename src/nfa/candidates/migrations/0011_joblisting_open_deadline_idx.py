@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0010_contactrequest_triage_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['application_deadline'], name='joblisting_open_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+QUALIFICATION_LEVELS = {'matric': 1, 'intermediate': 2, 'bachelors': 3, 'masters': 4}
+
+
+def populate_stats(apps, schema_editor):
+    JobApplication = apps.get_model('candidates', 'JobApplication')
+    Education = apps.get_model('candidates', 'Education')
+    JobListingStats = apps.get_model('candidates', 'JobListingStats')
+    JobListingQualificationStats = apps.get_model('candidates', 'JobListingQualificationStats')
+
+    level = Case(*[When(degree=degree, then=Value(n)) for degree, n in QUALIFICATION_LEVELS.items()], default=Value(0))
+    highest = (Education.objects.filter(profile_id=OuterRef('applicant_id'))
+               .annotate(level=level).order_by('-level').values('degree')[:1])
+    JobApplication.objects.update(highest_qualification=Coalesce(Subquery(highest), Value('')))
+
+    rows = (JobApplication.objects.order_by()
+            .values('job_listing_id', 'highest_qualification')
+            .annotate(applications=Count('pk'), confirmed=Count('pk', filter=Q(is_confirmed=True))))
+    per_listing = {}
+    qualification_stats = []
+    for row in rows:
+        applications, confirmed = per_listing.get(row['job_listing_id'], (0, 0))
+        per_listing[row['job_listing_id']] = (applications + row['applications'], confirmed + row['confirmed'])
+        qualification_stats.append(JobListingQualificationStats(
+            job_listing_id=row['job_listing_id'], qualification=row['highest_qualification'],
+            applications=row['applications'], confirmed=row['confirmed'],
+        ))
+    JobListingQualificationStats.objects.bulk_create(qualification_stats, batch_size=1000)
+    JobListingStats.objects.bulk_create([
+        JobListingStats(job_listing_id=listing_id, applications=applications, confirmed=confirmed)
+        for listing_id, (applications, confirmed) in per_listing.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0011_joblisting_open_deadline_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobListingStats',
+            fields=[
+                ('job_listing', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='candidates.joblisting')),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('confirmed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='highest_qualification',
+            field=models.CharField(blank=True, choices=[('matric', 'Matric'), ('intermediate', 'Intermediate'), ('bachelors', 'Bachelors'), ('masters', 'Masters')], default='', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='JobListingQualificationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('qualification', models.CharField(blank=True, max_length=20)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('confirmed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='qualification_stats', to='candidates.joblisting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job_listing', 'qualification'), name='unique_listing_qualification_stats')],
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
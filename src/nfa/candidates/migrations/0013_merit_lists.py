@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:46
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0012_joblisting_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeritList',
+            fields=[
+                ('job_listing', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='merit_list', serialize=False, to='candidates.joblisting')),
+                ('applicants', models.PositiveIntegerField(default=0)),
+                ('shortlisted', models.PositiveIntegerField(default=0)),
+                ('generated_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MeritListEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('shortlisted', models.BooleanField(default=False)),
+                ('qualification_level', models.PositiveSmallIntegerField(default=0)),
+                ('experience', models.DurationField(default=datetime.timedelta)),
+                ('date_of_birth', models.DateField()),
+                ('submitted_at', models.DateTimeField()),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='merit_entry', to='candidates.jobapplication')),
+                ('job_listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merit_entries', to='candidates.joblisting')),
+            ],
+            options={
+                'ordering': ['job_listing', 'rank'],
+                'indexes': [models.Index(fields=['job_listing', 'rank'], name='merit_listing_rank_idx'), models.Index(fields=['job_listing', '-qualification_level', '-experience', 'date_of_birth'], name='merit_listing_key_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:56
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+KEY_FIELDS = ('candidate', 'job_post', 'paper', 'test_date', 'session')
+
+
+def drop_duplicate_schedules(apps, schema_editor):
+    TestSchedule = apps.get_model('candidates', 'TestSchedule')
+    duplicates = (TestSchedule.objects.values(*KEY_FIELDS).order_by()
+                  .annotate(copies=Count('pk'), keep=Max('pk')).filter(copies__gt=1))
+    for duplicate in duplicates.iterator():
+        keep = duplicate.pop('keep')
+        duplicate.pop('copies')
+        TestSchedule.objects.filter(**duplicate).exclude(pk=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0013_merit_lists'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testschedule',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Digest of the imported sheet row, used to skip unchanged rows on re-import', max_length=40),
+        ),
+        migrations.RunPython(drop_duplicate_schedules, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='testschedule',
+            constraint=models.UniqueConstraint(fields=('candidate', 'job_post', 'paper', 'test_date', 'session'), name='testschedule_natural_key'),
+        ),
+    ]
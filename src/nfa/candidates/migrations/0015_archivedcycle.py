@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:17
+
+import candidates.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0014_testschedule_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('test_schedules', 'Test schedules'), ('job_applications', 'Job applications')], max_length=20)),
+                ('cycle', models.CharField(help_text="Recruitment cycle, e.g. '2025' or '2025-26'", max_length=10)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('file', models.FileField(max_length=255, storage=candidates.storage.archive_storage, upload_to='')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
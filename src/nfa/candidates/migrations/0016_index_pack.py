@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:18
+
+from candidates.operations import AddIndexConcurrentlyOnPostgres
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('candidates', '0015_archivedcycle'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='applicationanswer',
+            index=models.Index(fields=['application', 'question'], name='answer_app_question_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='document',
+            index=models.Index(fields=['purpose', '-uploaded_at'], name='document_purpose_uploaded_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='jobapplication',
+            index=models.Index(fields=['applicant', 'job_listing'], name='application_applicant_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('is_confirmed', True)), fields=['job_listing'], name='application_confirmed_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblisting',
+            index=models.Index(fields=['status', '-application_deadline'], name='joblisting_status_deadline_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='testschedule',
+            index=models.Index(fields=['job_post', 'test_date', 'session'], name='testschedule_post_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='testschedule',
+            index=models.Index(fields=['test_date'], name='testschedule_test_date_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+import candidates.references
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0016_index_pack'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='reference_number',
+            field=models.CharField(default=candidates.references.new_reference_number, max_length=50, unique=True),
+        ),
+    ]
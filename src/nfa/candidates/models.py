@@ -1,14 +1,18 @@
 import os
+import datetime
 import uuid
 import re
 from django.conf import settings
 from django.db import models, transaction
 from django.utils import timezone
 from django.core.files.base import ContentFile
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django_ckeditor_5.fields import CKEditor5Field
 from .utils import html_to_pdf_bytes
+from .storage import upload_storage, archive_storage
+from .caching import invalidate_documents_cache
+from .references import new_reference_number
 
 
 def contact_upload_path(instance, filename):
@@ -29,6 +33,17 @@ class JobPost(models.Model):
     def __str__(self):
         return f"{self.title} [{self.code}]"
     
+class JobListingQuerySet(models.QuerySet):
+    def open(self, today=None):
+        return self.filter(status='open', application_deadline__gte=today or timezone.localdate())
+
+    def past_deadline(self, today=None):
+        return self.filter(status='open', application_deadline__lt=today or timezone.localdate())
+
+    def expire_past_deadline(self, today=None):
+        return self.past_deadline(today).update(status='expired', updated_at=timezone.now())
+
+
 class JobListing(models.Model):
     STATUS_CHOICES = [
         ('open', 'Open / Active / Published'),
@@ -63,12 +78,23 @@ class JobListing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JobListingQuerySet.as_manager()
+
     class Meta:
         ordering = ['-application_deadline']
+        indexes = [
+            models.Index(fields=['application_deadline'], condition=models.Q(status='open'),
+                         name='joblisting_open_deadline_idx'),
+            models.Index(fields=['status', '-application_deadline'], name='joblisting_status_deadline_idx'),
+        ]
 
     def __str__(self):
         return f"{self.job_post.title} - {self.location or 'N/A'} ({self.status})"
 
+    @property
+    def is_open(self):
+        return self.status == 'open' and self.application_deadline >= timezone.localdate()
+
 class Candidate(models.Model):
     roll_no = models.CharField(max_length=20, unique=True)
     name = models.CharField(max_length=100)
@@ -90,6 +116,18 @@ class TestSchedule(models.Model):
     reporting_time = models.CharField(max_length=20)
     conduct_time = models.CharField(max_length=50)
     venue = models.TextField(blank=True, null=True, help_text="Test venue/location")
+    row_hash = models.CharField(max_length=40, blank=True, default='', editable=False,
+                                help_text="Digest of the imported sheet row, used to skip unchanged rows on re-import")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'job_post', 'paper', 'test_date', 'session'],
+                                    name='testschedule_natural_key'),
+        ]
+        indexes = [
+            models.Index(fields=['job_post', 'test_date', 'session'], name='testschedule_post_date_idx'),
+            models.Index(fields=['test_date'], name='testschedule_test_date_idx'),
+        ]
 
     def __str__(self):
         return f"TestSchedule for {self.candidate.roll_no} - {self.job_post.code} on {self.test_date} at {self.venue or 'N/A'}"
@@ -110,6 +148,12 @@ class ContactRequest(models.Model):
         ('explosives_analysis', 'Explosives Analysis'),
     ]
     PREFERRED_CONTACT_CHOICES = [('email', 'Email'), ('phone', 'Phone')]
+    STATUS_CHOICES = [
+        ('new', 'New'),
+        ('in_progress', 'In Progress'),
+        ('resolved', 'Resolved'),
+        ('closed', 'Closed'),
+    ]
 
     name = models.CharField(max_length=255)
     email = models.EmailField()
@@ -117,22 +161,94 @@ class ContactRequest(models.Model):
     service = models.CharField(max_length=100, choices=SERVICE_CHOICES)
     description = models.TextField(blank=True, null=True)
     preferred_contact = models.CharField(max_length=10, choices=PREFERRED_CONTACT_CHOICES)
-    file = models.FileField(upload_to=contact_upload_path, blank=True, null=True)
+    file = models.FileField(upload_to=contact_upload_path, storage=upload_storage, blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
+    assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='assigned_contact_requests')
+    status_changed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['service', '-submitted_at'], name='contact_service_submitted_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='contact_status_submitted_idx'),
+            models.Index(fields=['preferred_contact', '-submitted_at'], name='contact_pref_submitted_idx'),
+            models.Index(fields=['-submitted_at'], name='contact_submitted_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.service} ({self.submitted_at.strftime('%Y-%m-%d %H:%M')})"
 
 
+class ArchivedContactRequest(models.Model):
+    original_id = models.BigIntegerField(unique=True)
+    name = models.CharField(max_length=255)
+    email = models.EmailField()
+    phone = models.CharField(max_length=50)
+    service = models.CharField(max_length=100, choices=ContactRequest.SERVICE_CHOICES)
+    description = models.TextField(blank=True, null=True)
+    preferred_contact = models.CharField(max_length=10, choices=ContactRequest.PREFERRED_CONTACT_CHOICES)
+    file = models.FileField(storage=archive_storage, max_length=255, blank=True, null=True)
+    submitted_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=ContactRequest.STATUS_CHOICES)
+    assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='+')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['service', '-submitted_at'], name='archived_service_submitted_idx')]
+
+    def __str__(self):
+        return f"{self.name} - {self.service} (archived {self.submitted_at.strftime('%Y-%m-%d')})"
+
+
+class ArchivedCycle(models.Model):
+    KIND_CHOICES = [
+        ('test_schedules', 'Test schedules'),
+        ('job_applications', 'Job applications'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    cycle = models.CharField(max_length=10, help_text="Recruitment cycle, e.g. '2025' or '2025-26'")
+    rows = models.PositiveIntegerField(default=0)
+    file = models.FileField(storage=archive_storage, max_length=255)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.cycle} ({self.rows} rows)"
+
+
+class Blob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+
+    processed = models.BooleanField(default=False)
+    source_name = models.CharField(max_length=255, blank=True, db_index=True,
+                                   help_text="Original blob this one was normalized from")
+    original_size = models.BigIntegerField(blank=True, null=True)
+    preview_name = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
 class Document(models.Model):
     name = models.CharField(max_length=255, help_text="Display name of the document")
     purpose = models.TextField(blank=True, help_text="Purpose or description of the document")
-    file = models.FileField(upload_to='documents/')
+    file = models.FileField(upload_to='documents/', storage=upload_storage)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [models.Index(fields=['purpose', '-uploaded_at'], name='document_purpose_uploaded_idx')]
         verbose_name = "Add Document"
         verbose_name_plural = "Add Documents"
 
@@ -190,6 +306,19 @@ def delete_document_file(sender, instance, **kwargs):
         except Exception: pass
 
 
+@receiver(post_save, sender=Document)
+@receiver(post_delete, sender=Document)
+def invalidate_document_listing(sender, instance, **kwargs):
+    invalidate_documents_cache()
+
+
+@receiver(post_delete, sender=ContactRequest)
+def delete_contact_request_file(sender, instance, **kwargs):
+    if instance.file:
+        try: instance.file.delete(save=False)
+        except Exception: pass
+
+
 @receiver(post_delete, sender=Advertisement)
 def delete_advertisement_document(sender, instance, **kwargs):
     if instance.document:
@@ -258,13 +387,80 @@ class JobQuestion(models.Model):
 class JobApplication(models.Model):
     applicant = models.ForeignKey('Profile', on_delete=models.CASCADE, related_name='applications')
     job_listing = models.ForeignKey('JobListing', on_delete=models.CASCADE, related_name='applications')
-    reference_number = models.CharField(max_length=50, unique=True, default=uuid.uuid4)
+    reference_number = models.CharField(max_length=50, unique=True, default=new_reference_number)
     submitted_at = models.DateTimeField(auto_now_add=True)
     is_confirmed = models.BooleanField(default=False)
+    highest_qualification = models.CharField(max_length=20, choices=Education.QUALIFICATION_CHOICES, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applicant', 'job_listing'], name='application_applicant_idx'),
+            models.Index(fields=['job_listing'], condition=models.Q(is_confirmed=True),
+                         name='application_confirmed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.reference_number} - {self.applicant.user.email}"
 
+
+class MeritList(models.Model):
+    job_listing = models.OneToOneField(JobListing, on_delete=models.CASCADE, primary_key=True, related_name='merit_list')
+    applicants = models.PositiveIntegerField(default=0)
+    shortlisted = models.PositiveIntegerField(default=0)
+    generated_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Merit list for listing {self.job_listing_id}"
+
+
+class MeritListEntry(models.Model):
+    job_listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='merit_entries')
+    application = models.OneToOneField(JobApplication, on_delete=models.CASCADE, related_name='merit_entry')
+    rank = models.PositiveIntegerField()
+    shortlisted = models.BooleanField(default=False)
+    qualification_level = models.PositiveSmallIntegerField(default=0)
+    experience = models.DurationField(default=datetime.timedelta)
+    date_of_birth = models.DateField()
+    submitted_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['job_listing', 'rank']
+        indexes = [
+            models.Index(fields=['job_listing', 'rank'], name='merit_listing_rank_idx'),
+            models.Index(fields=['job_listing', '-qualification_level', '-experience', 'date_of_birth'],
+                         name='merit_listing_key_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.application_id} (listing {self.job_listing_id})"
+
+
+class JobListingStats(models.Model):
+    job_listing = models.OneToOneField(JobListing, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    applications = models.PositiveIntegerField(default=0)
+    confirmed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for listing {self.job_listing_id}"
+
+
+class JobListingQualificationStats(models.Model):
+    job_listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='qualification_stats')
+    qualification = models.CharField(max_length=20, blank=True)
+    applications = models.PositiveIntegerField(default=0)
+    confirmed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job_listing', 'qualification'], name='unique_listing_qualification_stats'),
+        ]
+
+    def __str__(self):
+        return f"Stats for listing {self.job_listing_id} ({self.qualification or 'none'})"
+
 def application_upload_path(instance, filename):
     uid = uuid.uuid4().hex
     if getattr(instance, 'application', None):
@@ -280,8 +476,15 @@ class ApplicationDocument(models.Model):
         null=True,
         blank=True
     )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='application_documents',
+        null=True,
+        blank=True
+    )
     name = models.CharField(max_length=255)
-    file = models.FileField(upload_to=application_upload_path)
+    file = models.FileField(upload_to=application_upload_path, storage=upload_storage)
 
     def __str__(self):
         return f"{self.name} - {self.application.reference_number if self.application else 'TEMP'}"
@@ -291,5 +494,21 @@ class ApplicationAnswer(models.Model):
     question = models.ForeignKey(JobQuestion, on_delete=models.CASCADE)
     answer_text = models.TextField()
 
+    class Meta:
+        indexes = [models.Index(fields=['application', 'question'], name='answer_app_question_idx')]
+
     def __str__(self):
         return f"{self.question.question_text[:50]} - {self.application.reference_number}"
+
+
+@receiver(post_delete, sender=ApplicationDocument)
+def delete_application_document_file(sender, instance, **kwargs):
+    if instance.file:
+        try: instance.file.delete(save=False)
+        except Exception: pass
+
+
+@receiver(post_delete, sender=JobApplication)
+def release_application_stats(sender, instance, **kwargs):
+    from .stats import record_deletion
+    record_deletion(instance)
@@ -0,0 +1,13 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class DocumentPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class DashboardPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .storage import is_blob_name
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff', '.heic'}
+PAGE_INCHES = (8.27, 11.69)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.UPLOAD_PROCESSING_WORKERS,
+                thread_name_prefix='upload-processing',
+            )
+    return _executor
+
+
+def schedule_processing(instance, field_name='file'):
+    field_file = getattr(instance, field_name)
+    if not field_file or os.path.splitext(field_file.name)[1].lower() not in IMAGE_EXTENSIONS:
+        return
+    label, pk = instance._meta.label, instance.pk
+    transaction.on_commit(lambda: submit(label, pk, field_name))
+
+
+def submit(label, pk, field_name):
+    if settings.UPLOAD_PROCESSING_WORKERS <= 0:
+        return process_upload(label, pk, field_name)
+    return get_executor().submit(_run, label, pk, field_name)
+
+
+def _run(label, pk, field_name):
+    try:
+        process_upload(label, pk, field_name)
+    except Exception:
+        logger.exception("Failed to process upload %s:%s.%s", label, pk, field_name)
+    finally:
+        connections.close_all()
+
+
+def _target_box(dpi):
+    return int(PAGE_INCHES[0] * dpi), int(PAGE_INCHES[1] * dpi)
+
+
+def _to_jpeg(image, quality, dpi=None):
+    if image.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    out = BytesIO()
+    options = {'quality': quality, 'optimize': True, 'progressive': True}
+    if dpi:
+        options['dpi'] = (dpi, dpi)
+    image.save(out, 'JPEG', **options)
+    return out.getvalue()
+
+
+def normalize_image(fileobj, dpi=None, quality=None, preview_size=None):
+    dpi = dpi or settings.UPLOAD_IMAGE_TARGET_DPI
+    quality = quality or settings.UPLOAD_IMAGE_QUALITY
+    preview_size = preview_size or settings.UPLOAD_PREVIEW_SIZE
+    width, height = _target_box(dpi)
+
+    try:
+        with Image.open(fileobj) as image:
+            image.draft('RGB', (height, height))
+            image = ImageOps.exif_transpose(image)
+            box = (height, width) if image.width > image.height else (width, height)
+            image.thumbnail(box, Image.Resampling.LANCZOS)
+            normalized = _to_jpeg(image, quality, dpi)
+            image.thumbnail((preview_size, preview_size), Image.Resampling.LANCZOS)
+            preview = _to_jpeg(image, 70)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        return None, None
+    return normalized, preview
+
+
+def preview_name_for(name):
+    digest = os.path.splitext(os.path.basename(name))[0]
+    return f"previews/{digest[:2]}/{digest}.jpg"
+
+
+def process_upload(label, pk, field_name='file'):
+    model = apps.get_model(label)
+    Blob = apps.get_model('candidates', 'Blob')
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not getattr(instance, field_name):
+        return
+
+    field_file = getattr(instance, field_name)
+    name = field_file.name
+    storage = field_file.storage
+    if not is_blob_name(name) or Blob.objects.filter(name=name, processed=True).exists():
+        return
+
+    derived = Blob.objects.filter(source_name=name, processed=True).first()
+    if derived is not None:
+        new_name = derived.name
+        storage.acquire(new_name)
+    else:
+        with storage.open(name, 'rb') as original:
+            normalized, preview = normalize_image(original)
+        if normalized is None:
+            return
+
+        preview_name = preview_name_for(name)
+        original_size = storage.size(name)
+        if len(normalized) >= original_size:
+            storage.save_derivative(preview_name, ContentFile(preview))
+            Blob.objects.filter(name=name).update(processed=True, preview_name=preview_name)
+            return
+
+        base = os.path.splitext(os.path.basename(name))[0]
+        new_name = storage.save(f"{base}.jpg", ContentFile(normalized))
+        preview_name = preview_name_for(new_name)
+        storage.save_derivative(preview_name, ContentFile(preview))
+        Blob.objects.filter(name=new_name).update(
+            processed=True, source_name=name, original_size=original_size, preview_name=preview_name,
+        )
+
+    updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{field_name: new_name})
+    if not updated:
+        storage.delete(new_name)
+    elif not settings.UPLOAD_KEEP_ORIGINALS:
+        storage.delete(name)
+    return new_name
@@ -0,0 +1,114 @@
+import csv
+import datetime
+import io
+import os
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+import openpyxl
+
+READERS = {}
+MAX_COLUMNS = 64
+SNIFF_SIZE = 8192
+
+TABLE = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+OFFICE = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+TEXT = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+
+
+def reader(*extensions):
+    def decorator(func):
+        for extension in extensions:
+            READERS[extension] = func
+        return func
+    return decorator
+
+
+def supported_extensions():
+    return sorted(READERS)
+
+
+def read_schedule(fileobj, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported file type {extension or '(none)'}; upload one of {', '.join(supported_extensions())}.")
+    return READERS[extension](fileobj, filename)
+
+
+@reader('.csv')
+def read_csv(fileobj, filename):
+    text = io.TextIOWrapper(getattr(fileobj, 'file', fileobj), encoding='utf-8-sig', errors='replace', newline='')
+    sample = text.read(SNIFF_SIZE)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    sheet = os.path.splitext(os.path.basename(filename))[0]
+    try:
+        for line, row in enumerate(csv.reader(text, dialect), start=1):
+            yield sheet, line, row
+    finally:
+        text.detach()
+
+
+@reader('.xlsx', '.xlsm')
+def read_xlsx(fileobj, filename):
+    wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            for line, row in enumerate(ws.iter_rows(values_only=True), start=1):
+                yield ws.title, line, row
+    finally:
+        wb.close()
+
+
+def _ods_value(cell):
+    kind = cell.get(f'{OFFICE}value-type')
+    if kind == 'date':
+        value = datetime.datetime.fromisoformat(cell.get(f'{OFFICE}date-value'))
+        return value.date() if value.time() == datetime.time() else value
+    if kind in ('float', 'percentage', 'currency'):
+        value = float(cell.get(f'{OFFICE}value'))
+        return int(value) if value.is_integer() else value
+    paragraphs = [''.join(paragraph.itertext()) for paragraph in cell.iter(f'{TEXT}p')]
+    return '\n'.join(paragraphs) or None
+
+
+def _ods_row(element):
+    values = []
+    for cell in element:
+        if cell.tag not in (f'{TABLE}table-cell', f'{TABLE}covered-table-cell'):
+            continue
+        value = _ods_value(cell)
+        repeat = int(cell.get(f'{TABLE}number-columns-repeated', 1))
+        values.extend([value] * min(repeat, MAX_COLUMNS - len(values)))
+        if len(values) >= MAX_COLUMNS:
+            break
+    while values and values[-1] is None:
+        values.pop()
+    return tuple(values)
+
+
+@reader('.ods')
+def read_ods(fileobj, filename):
+    with zipfile.ZipFile(fileobj) as archive, archive.open('content.xml') as content:
+        table, sheet, line = None, None, 0
+        for event, element in iterparse(content, events=('start', 'end')):
+            if event == 'start':
+                if element.tag == f'{TABLE}table':
+                    table, sheet, line = element, element.get(f'{TABLE}name'), 0
+                continue
+            if element.tag == f'{TABLE}table-row':
+                repeat = int(element.get(f'{TABLE}number-rows-repeated', 1))
+                row = _ods_row(element)
+                if row:
+                    for _ in range(repeat):
+                        line += 1
+                        yield sheet, line, row
+                else:
+                    line += repeat
+                element.clear()
+            elif element.tag == f'{TABLE}table' and table is not None:
+                table.clear()
+                table = None
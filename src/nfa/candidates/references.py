@@ -0,0 +1,15 @@
+import secrets
+import time
+from base64 import b32encode
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+RANDOM_BITS = 35
+_CROCKFORD = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567', ALPHABET.encode())
+
+
+def new_reference_number(milliseconds=None):
+    if milliseconds is None:
+        milliseconds = time.time_ns() // 1_000_000
+    value = (milliseconds << RANDOM_BITS | secrets.randbits(RANDOM_BITS)).to_bytes(10, 'big')
+    text = b32encode(value).translate(_CROCKFORD).decode('ascii')
+    return f"{text[:8]}-{text[8:]}"
@@ -1,8 +1,16 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
+from .stats import record_application
+from .utils import get_highest_qualification
+from .ingestion import validate_file_signature, DOCUMENT_TYPES, CONTACT_ATTACHMENT_TYPES
+from django.core.exceptions import ObjectDoesNotExist
 from .models import (ContactRequest, Document,
                      Profile, Education, WorkHistory, 
                      JobListing, JobPost, 
-                     JobApplication, ApplicationDocument, ApplicationAnswer, JobQuestion)
+                     JobApplication, ApplicationDocument, ApplicationAnswer, JobQuestion, MeritListEntry)
 
 class ContactRequestSerializer(serializers.ModelSerializer):
     class Meta:
@@ -17,6 +25,9 @@ class ContactRequestSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({field: "This field is required."})
         return data
 
+    def validate_file(self, value):
+        return validate_file_signature(value, CONTACT_ATTACHMENT_TYPES) if value else value
+
 
 class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,8 +35,108 @@ class DocumentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'purpose', 'file', 'uploaded_at', 'last_updated']
         read_only_fields = ['uploaded_at', 'last_updated']
 
+    def validate_file(self, value):
+        return validate_file_signature(value, DOCUMENT_TYPES)
+
+
+def format_datetime(value):
+    if value is None:
+        return None
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def format_date(value):
+    return value.isoformat() if value is not None else None
+
+
+class ValuesListSerializer:
+    value_fields = ()
+
+    def __init__(self, queryset, context=None):
+        self.queryset = queryset
+        self.context = context or {}
+
+    def to_representation(self, row):
+        return dict(row)
+
+    @property
+    def data(self):
+        rows = self.queryset.values(*self.value_fields) if isinstance(self.queryset, QuerySet) else self.queryset
+        return [self.to_representation(row) for row in rows]
+
+
+class DocumentValuesSerializer(ValuesListSerializer):
+    value_fields = ('id', 'name', 'purpose', 'file', 'uploaded_at', 'last_updated')
+
+    def __init__(self, queryset, context=None):
+        super().__init__(queryset, context)
+        self.storage = Document._meta.get_field('file').storage
+        request = self.context.get('request')
+        self.origin = request.build_absolute_uri('/')[:-1] if request else ''
+
+    def file_url(self, name):
+        if not name:
+            return None
+        url = self.storage.url(name)
+        return self.origin + url if url.startswith('/') else url
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'purpose': row['purpose'],
+            'file': self.file_url(row['file']),
+            'uploaded_at': format_datetime(row['uploaded_at']),
+            'last_updated': format_datetime(row['last_updated']),
+        }
+
+
+class DocumentFilterSerializer(serializers.Serializer):
+    purpose = serializers.CharField(required=False)
+    uploaded_after = serializers.DateField(required=False)
+    uploaded_before = serializers.DateField(required=False)
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+        if data.get('purpose'):
+            queryset = queryset.filter(purpose__iexact=data['purpose'])
+        if data.get('uploaded_after'):
+            queryset = queryset.filter(uploaded_at__date__gte=data['uploaded_after'])
+        if data.get('uploaded_before'):
+            queryset = queryset.filter(uploaded_at__date__lte=data['uploaded_before'])
+        return queryset
+
+
+class ScheduleExportFilterSerializer(serializers.Serializer):
+    job_post = serializers.CharField(required=False)
+    venue = serializers.CharField(required=False)
+    session = serializers.CharField(required=False)
+    test_date = serializers.DateField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+        if data.get('job_post'):
+            queryset = queryset.filter(job_post__code=data['job_post'])
+        if data.get('venue'):
+            queryset = queryset.filter(venue=data['venue'])
+        if data.get('session'):
+            queryset = queryset.filter(session__iexact=data['session'])
+        if data.get('test_date'):
+            queryset = queryset.filter(test_date=data['test_date'])
+        if data.get('date_from'):
+            queryset = queryset.filter(test_date__gte=data['date_from'])
+        if data.get('date_to'):
+            queryset = queryset.filter(test_date__lte=data['date_to'])
+        return queryset
+
 
 class EducationSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = Education
         fields = '__all__'
@@ -33,12 +144,44 @@ class EducationSerializer(serializers.ModelSerializer):
 
 
 class WorkHistorySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = WorkHistory
         fields = '__all__'
         read_only_fields = ('profile',)
 
 
+def sync_nested(model, profile, items):
+    existing = {obj.pk: obj for obj in model.objects.filter(profile=profile)}
+    seen = set()
+    to_create = []
+    to_update = []
+    changed_fields = set()
+
+    for item in items:
+        item = dict(item)
+        obj = existing.get(item.pop('id', None))
+        if obj is None or obj.pk in seen:
+            to_create.append(model(profile=profile, **item))
+            continue
+        seen.add(obj.pk)
+        changed = [attr for attr, value in item.items() if getattr(obj, attr) != value]
+        for attr in changed:
+            setattr(obj, attr, item[attr])
+        if changed:
+            changed_fields.update(changed)
+            to_update.append(obj)
+
+    removed = existing.keys() - seen
+    if removed:
+        model.objects.filter(pk__in=removed).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(changed_fields))
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     educations = EducationSerializer(many=True, required=False)
     work_histories = WorkHistorySerializer(many=True, required=False)
@@ -49,6 +192,7 @@ class ProfileSerializer(serializers.ModelSerializer):
                   'educations', 'work_histories']
         read_only_fields = ['user']
 
+    @transaction.atomic
     def create(self, validated_data):
         educations_data = validated_data.pop('educations', [])
         work_histories_data = validated_data.pop('work_histories', [])
@@ -56,31 +200,32 @@ class ProfileSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         profile = Profile.objects.create(user=user, **validated_data)
 
-        for edu_data in educations_data:
-            Education.objects.create(profile=profile, **edu_data)
-
-        for work_data in work_histories_data:
-            WorkHistory.objects.create(profile=profile, **work_data)
+        Education.objects.bulk_create([
+            Education(profile=profile, **{k: v for k, v in edu_data.items() if k != 'id'})
+            for edu_data in educations_data
+        ])
+        WorkHistory.objects.bulk_create([
+            WorkHistory(profile=profile, **{k: v for k, v in work_data.items() if k != 'id'})
+            for work_data in work_histories_data
+        ])
 
         return profile
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        educations_data = validated_data.pop('educations', [])
-        work_histories_data = validated_data.pop('work_histories', [])
+        educations_data = validated_data.pop('educations', None)
+        work_histories_data = validated_data.pop('work_histories', None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
 
-        if educations_data:
-            instance.educations.all().delete()
-            for edu_data in educations_data:
-                Education.objects.create(profile=instance, **edu_data)
+        if educations_data is not None:
+            sync_nested(Education, instance, educations_data)
 
-        if work_histories_data:
-            instance.work_histories.all().delete()
-            for work_data in work_histories_data:
-                WorkHistory.objects.create(profile=instance, **work_data)
+        if work_histories_data is not None:
+            sync_nested(WorkHistory, instance, work_histories_data)
 
         return instance
     
@@ -102,31 +247,83 @@ class JobListingSerializer(serializers.ModelSerializer):
             'status', 'created_at', 'updated_at'
         ]
 
+class JobListingValuesSerializer(ValuesListSerializer):
+    value_fields = (
+        'id', 'location', 'application_deadline', 'number_of_positions', 'salary_range',
+        'minimum_age', 'minimum_qualification', 'required_experience',
+        'requirements', 'responsibilities', 'additional_info', 'status', 'created_at', 'updated_at',
+        'job_post__id', 'job_post__code', 'job_post__title', 'job_post__description',
+        'job_post__created_at', 'job_post__updated_at',
+    )
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'job_post': {
+                'id': row['job_post__id'],
+                'code': row['job_post__code'],
+                'title': row['job_post__title'],
+                'description': row['job_post__description'],
+                'created_at': format_datetime(row['job_post__created_at']),
+                'updated_at': format_datetime(row['job_post__updated_at']),
+            },
+            'location': row['location'],
+            'application_deadline': format_date(row['application_deadline']),
+            'number_of_positions': row['number_of_positions'],
+            'salary_range': row['salary_range'],
+            'minimum_age': row['minimum_age'],
+            'minimum_qualification': row['minimum_qualification'],
+            'required_experience': row['required_experience'],
+            'requirements': row['requirements'],
+            'responsibilities': row['responsibilities'],
+            'additional_info': row['additional_info'],
+            'status': row['status'],
+            'created_at': format_datetime(row['created_at']),
+            'updated_at': format_datetime(row['updated_at']),
+        }
+
+
 class ApplicationAnswerSerializer(serializers.ModelSerializer):
     class Meta:
         model = ApplicationAnswer
         fields = ['id', 'question', 'answer_text']
 
 class UploadApplicationDocumentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
     class Meta:
         model = ApplicationDocument
-        fields = ['id', 'name', 'file']
+        fields = ['id', 'name', 'file', 'download_url']
         read_only_fields = ['id']
+        extra_kwargs = {'file': {'write_only': True}}
+
+    def get_download_url(self, obj):
+        url = reverse('download-file', args=['application-documents', obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 class JobApplicationSerializer(serializers.ModelSerializer):
     answers = serializers.ListField(write_only=True)
-    document_ids = serializers.ListField(write_only=True) 
+    document_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
 
     class Meta:
         model = JobApplication
         fields = ['id', 'applicant', 'job_listing', 'reference_number', 'answers', 'document_ids']
         read_only_fields = ['id', 'reference_number', 'applicant']
 
+    def validate_job_listing(self, value):
+        if not value.is_open:
+            raise serializers.ValidationError("This job listing is no longer accepting applications.")
+        return value
+
+    @transaction.atomic
     def create(self, validated_data):
         answers_data = validated_data.pop('answers', [])
         document_ids = validated_data.pop('document_ids', [])
 
+        validated_data['highest_qualification'] = get_highest_qualification(validated_data['applicant']) or ''
         application = JobApplication.objects.create(**validated_data)
+        record_application(application)
 
         for ans in answers_data:
             question = JobQuestion.objects.get(pk=ans['question'])
@@ -136,13 +333,17 @@ class JobApplicationSerializer(serializers.ModelSerializer):
                 answer_text=ans['answer_text']
             )
 
-        for doc_id in document_ids:
-            try:
-                doc = ApplicationDocument.objects.get(pk=doc_id)
-                doc.application = application
-                doc.save()
-            except ApplicationDocument.DoesNotExist:
-                continue
+        document_ids = set(document_ids)
+        if document_ids:
+            attached = ApplicationDocument.objects.filter(
+                pk__in=document_ids, application__isnull=True, uploaded_by_id=application.applicant.user_id,
+            ).update(application=application)
+            if attached != len(document_ids):
+                taken = set(ApplicationDocument.objects.filter(application=application).values_list('pk', flat=True))
+                rejected = sorted(document_ids - taken)
+                raise serializers.ValidationError(
+                    {'document_ids': [f"Document {pk} is not an unattached upload of yours." for pk in rejected]}
+                )
 
         return application
 
@@ -162,3 +363,61 @@ class JobApplicationReviewSerializer(serializers.ModelSerializer):
 
     def get_answers(self, obj):
         return ApplicationAnswer.objects.filter(application=obj).values('question_id', 'answer_text')
+
+
+class JobListingStatsSerializer(serializers.ModelSerializer):
+    job_post_title = serializers.CharField(source='job_post.title', read_only=True)
+    applications = serializers.SerializerMethodField()
+    confirmed = serializers.SerializerMethodField()
+    applicants_per_position = serializers.SerializerMethodField()
+    confirmed_per_position = serializers.SerializerMethodField()
+    by_qualification = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JobListing
+        fields = ['id', 'job_post_title', 'location', 'status', 'application_deadline', 'number_of_positions',
+                  'applications', 'confirmed', 'applicants_per_position', 'confirmed_per_position', 'by_qualification']
+
+    def _counts(self, obj):
+        try:
+            return obj.stats.applications, obj.stats.confirmed
+        except ObjectDoesNotExist:
+            return 0, 0
+
+    def _per_position(self, obj, count):
+        return round(count / obj.number_of_positions, 2) if obj.number_of_positions else None
+
+    def get_applications(self, obj):
+        return self._counts(obj)[0]
+
+    def get_confirmed(self, obj):
+        return self._counts(obj)[1]
+
+    def get_applicants_per_position(self, obj):
+        return self._per_position(obj, self._counts(obj)[0])
+
+    def get_confirmed_per_position(self, obj):
+        return self._per_position(obj, self._counts(obj)[1])
+
+    def get_by_qualification(self, obj):
+        return {
+            row.qualification or 'none': {'applications': row.applications, 'confirmed': row.confirmed}
+            for row in obj.qualification_stats.all()
+        }
+
+
+class MeritListEntrySerializer(serializers.ModelSerializer):
+    application_id = serializers.IntegerField(read_only=True)
+    reference_number = serializers.CharField(source='application.reference_number', read_only=True)
+    email = serializers.EmailField(source='application.applicant.user.email', read_only=True)
+    cnic = serializers.CharField(source='application.applicant.user.cnic', read_only=True)
+    qualification = serializers.CharField(source='application.highest_qualification', read_only=True)
+    experience_years = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MeritListEntry
+        fields = ['rank', 'shortlisted', 'application_id', 'reference_number', 'email', 'cnic',
+                  'qualification', 'experience_years', 'date_of_birth']
+
+    def get_experience_years(self, obj):
+        return round(obj.experience.days / 365, 1)
@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import JobApplication, JobListingStats, JobListingQualificationStats
+
+
+def _bump(model, filters, applications, confirmed, create=True):
+    changes = {
+        'applications': Greatest(F('applications') + Value(applications), Value(0)),
+        'confirmed': Greatest(F('confirmed') + Value(confirmed), Value(0)),
+        'updated_at': timezone.now(),
+    }
+    if model.objects.filter(**filters).update(**changes) or not create:
+        return
+    _, created = model.objects.get_or_create(
+        **filters, defaults={'applications': max(applications, 0), 'confirmed': max(confirmed, 0)},
+    )
+    if not created:
+        model.objects.filter(**filters).update(**changes)
+
+
+def record(listing_id, qualification, applications=0, confirmed=0, create=True):
+    with transaction.atomic():
+        _bump(JobListingStats, {'job_listing_id': listing_id}, applications, confirmed, create)
+        _bump(JobListingQualificationStats, {'job_listing_id': listing_id, 'qualification': qualification or ''},
+              applications, confirmed, create)
+
+
+def record_application(application):
+    record(application.job_listing_id, application.highest_qualification,
+           applications=1, confirmed=1 if application.is_confirmed else 0)
+
+
+def record_deletion(application):
+    record(application.job_listing_id, application.highest_qualification,
+           applications=-1, confirmed=-1 if application.is_confirmed else 0, create=False)
+
+
+def _sync(model, rows, key_fields, expected):
+    now = timezone.now()
+    changed = []
+    for row in rows:
+        key = tuple(getattr(row, field) for field in key_fields)
+        applications, confirmed = expected.pop(key, (0, 0))
+        if (row.applications, row.confirmed) != (applications, confirmed):
+            row.applications, row.confirmed, row.updated_at = applications, confirmed, now
+            changed.append(row)
+    model.objects.bulk_update(changed, ['applications', 'confirmed', 'updated_at'], batch_size=1000)
+    model.objects.bulk_create([
+        model(**dict(zip(key_fields, key)), applications=applications, confirmed=confirmed)
+        for key, (applications, confirmed) in expected.items()
+    ], batch_size=1000)
+    return len(changed) + len(expected)
+
+
+def _expected(applications):
+    rows = (applications.order_by()
+            .values('job_listing_id', 'highest_qualification')
+            .annotate(applications=Count('pk'), confirmed=Count('pk', filter=Q(is_confirmed=True))))
+    per_listing, per_qualification = {}, {}
+    for row in rows:
+        listing_key = (row['job_listing_id'],)
+        applications, confirmed = per_listing.get(listing_key, (0, 0))
+        per_listing[listing_key] = (applications + row['applications'], confirmed + row['confirmed'])
+        per_qualification[(row['job_listing_id'], row['highest_qualification'])] = (
+            row['applications'], row['confirmed'],
+        )
+    return per_listing, per_qualification
+
+
+def _drifted_listings():
+    per_listing, per_qualification = _expected(JobApplication.objects.all())
+    drifted = set()
+    for model, key_fields, expected in ((JobListingStats, ('job_listing_id',), per_listing),
+                                        (JobListingQualificationStats, ('job_listing_id', 'qualification'),
+                                         per_qualification)):
+        for *key, applications, confirmed in model.objects.values_list(*key_fields, 'applications', 'confirmed'):
+            if expected.pop(tuple(key), (0, 0)) != (applications, confirmed):
+                drifted.add(key[0])
+        drifted.update(key[0] for key in expected)
+    return sorted(drifted)
+
+
+def reconcile_listing(listing_id):
+    with transaction.atomic():
+        listing_rows = list(JobListingStats.objects.select_for_update().filter(job_listing_id=listing_id))
+        qualification_rows = list(
+            JobListingQualificationStats.objects.select_for_update().filter(job_listing_id=listing_id)
+        )
+        per_listing, per_qualification = _expected(JobApplication.objects.filter(job_listing_id=listing_id))
+        return (_sync(JobListingStats, listing_rows, ('job_listing_id',), per_listing)
+                + _sync(JobListingQualificationStats, qualification_rows, ('job_listing_id', 'qualification'),
+                        per_qualification))
+
+
+def reconcile():
+    return sum(reconcile_listing(listing_id) for listing_id in _drifted_listings())
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, InMemoryStorage, storages
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+try:
+    from storages.backends.s3 import S3Storage
+except ImportError:
+    S3Storage = None
+
+BLOB_PREFIX = 'blobs'
+CHUNK_SIZE = 64 * 1024
+
+REFERENCING_FIELDS = [
+    ('candidates.Document', 'file'),
+    ('candidates.ContactRequest', 'file'),
+    ('candidates.ApplicationDocument', 'file'),
+]
+
+
+def upload_storage():
+    return storages['uploads']
+
+
+def archive_storage():
+    return storages['archive']
+
+
+def blob_name(digest, ext=''):
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}"
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f"{BLOB_PREFIX}/")
+
+
+class TemporaryBlobFile(File):
+    def __init__(self, file, path):
+        super().__init__(file, name=os.path.basename(path))
+        self._path = path
+
+    def temporary_file_path(self):
+        return self._path
+
+
+class ContentAddressedMixin:
+    def temp_dir(self):
+        return None
+
+    def _save(self, name, content):
+        _, ext = os.path.splitext(name)
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = None
+
+        if hasattr(content, 'temporary_file_path'):
+            payload = content
+            for chunk in content.chunks(CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+        else:
+            fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=self.temp_dir())
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            payload = TemporaryBlobFile(open(tmp_path, 'rb'), tmp_path)
+
+        hexdigest = digest.hexdigest()
+        name = blob_name(hexdigest, ext)
+        try:
+            with transaction.atomic():
+                self.acquire(name, hexdigest, size)
+                if not self.exists(name):
+                    name = super()._save(name, payload)
+        finally:
+            if tmp_path:
+                payload.close()
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+        return name
+
+    def acquire(self, name, digest=None, size=None):
+        Blob = apps.get_model('candidates', 'Blob')
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Blob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, last_referenced_at=now)
+            if not updated:
+                _, created = Blob.objects.get_or_create(
+                    name=name,
+                    defaults={'sha256': digest or '', 'size': size or 0, 'ref_count': 1, 'last_referenced_at': now},
+                )
+                if not created:
+                    Blob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, last_referenced_at=now)
+
+    def delete(self, name):
+        if not is_blob_name(name):
+            return super().delete(name)
+        Blob = apps.get_model('candidates', 'Blob')
+        Blob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+    def save_derivative(self, name, content):
+        if not self.exists(name):
+            super()._save(name, content)
+        return name
+
+    def purge(self, name):
+        super().delete(name)
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(*args, **kwargs)
+
+    def temp_dir(self):
+        path = os.path.join(self.location, BLOB_PREFIX, '.tmp')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+
+class ContentAddressedInMemoryStorage(ContentAddressedMixin, InMemoryStorage):
+    pass
+
+
+if S3Storage is not None:
+    class ContentAddressedS3Storage(ContentAddressedMixin, S3Storage):
+        pass
+
+
+def recount_references():
+    counts = Counter()
+    for label, field in REFERENCING_FIELDS:
+        model = apps.get_model(label)
+        names = model.objects.filter(**{f'{field}__startswith': f'{BLOB_PREFIX}/'}).values_list(field, flat=True)
+        counts.update(names.iterator(chunk_size=5000))
+
+    Blob = apps.get_model('candidates', 'Blob')
+    if settings.UPLOAD_KEEP_ORIGINALS:
+        derived = Blob.objects.filter(processed=True).exclude(source_name='').values_list('name', 'source_name')
+        for name, source_name in derived.iterator(chunk_size=5000):
+            if counts.get(name):
+                counts[source_name] += 1
+
+    changed = []
+    for blob in Blob.objects.only('id', 'name', 'ref_count').iterator(chunk_size=5000):
+        expected = counts.get(blob.name, 0)
+        if blob.ref_count != expected:
+            blob.ref_count = expected
+            changed.append(blob)
+    Blob.objects.bulk_update(changed, ['ref_count'], batch_size=1000)
+    return len(changed)
+
+
+def collect_garbage(storage=None, grace=timedelta(hours=24), dry_run=False):
+    storage = storage or upload_storage()
+    Blob = apps.get_model('candidates', 'Blob')
+    cutoff = timezone.now() - grace
+    candidates = Blob.objects.filter(ref_count=0, last_referenced_at__lt=cutoff)
+
+    removed = 0
+    freed = 0
+    for pk in candidates.values_list('pk', flat=True).iterator(chunk_size=1000):
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update(skip_locked=True).filter(pk=pk, ref_count=0).first()
+            if blob is None:
+                continue
+            if not dry_run:
+                blob.delete()
+                storage.purge(blob.name)
+                if blob.preview_name:
+                    storage.purge(blob.preview_name)
+            removed += 1
+            freed += blob.size
+    return removed, freed
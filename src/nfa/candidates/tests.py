@@ -1,3 +1,1450 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+import brotli
+import openpyxl
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import InMemoryStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, models, transaction
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from nfa.compression import STREAM_FLUSH_BYTES, compress_stream
+from nfa.metrics import QueryTimer, registry
+from nfa.middleware import CompressionMiddleware, WeakETagMiddleware
+from nfa import schema
+from nfa.routers import STICKY_COOKIE, ReplicaRouter, replica_safe
+
+from . import stats
+from .allocation import (DEFAULT_SESSIONS, ROLL_DIGITS, Session, Venue, allocate, next_roll_number, plan_row,
+                         write_plan)
+from .archival import archive_contact_requests
+from .caching import bump_documents_cache_version, cached_documents
+from .confirmation import confirm_application, confirm_applications
+from .cycles import archive_cycle
+from .importing import (SCHEDULE_COLUMNS, ColumnFormats, header_lookup, import_schedule, schedule_row_digest,
+                        validate_rows)
+from .merit import add_late_applications, generate
+from .operations import AddIndexConcurrentlyOnPostgres
+from .processing import normalize_image
+from .models import (ApplicationAnswer, ApplicationDocument, ArchivedContactRequest, ArchivedCycle, Blob, Candidate,
+                     ContactRequest, Document, Education, JobApplication, JobListing, JobListingQualificationStats,
+                     JobListingStats, JobPost, JobQuestion, MeritList, MeritListEntry, Profile, TestSchedule,
+                     WorkHistory)
+from .readers import read_schedule
+from .references import new_reference_number
+from .serializers import JobListingSerializer, JobListingValuesSerializer, ValuesListSerializer
+from .stats import reconcile, record_application
+from .storage import upload_storage
+from .throttling import ContactUsThrottle
+
+User = get_user_model()
+
+PDF = b'%PDF-1.4\n%test\n'
+MEDIA_ROOT = tempfile.mkdtemp(prefix='nfa-tests-')
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+def make_user(email, **extra):
+    return User.objects.create_user(email=email, **extra)
+
+
+def make_profile(email, date_of_birth=datetime.date(1995, 1, 1)):
+    return Profile.objects.create(user=make_user(email), date_of_birth=date_of_birth, postal_address='Islamabad')
+
+
+def make_listing(code='NQ (1)', **extra):
+    job_post, _ = JobPost.objects.get_or_create(code=code, defaults={'title': f'{code} post'})
+    extra.setdefault('application_deadline', timezone.localdate() + datetime.timedelta(days=7))
+    extra.setdefault('status', 'open')
+    return JobListing.objects.create(job_post=job_post, **extra)
+
+
+def pdf(name='file.pdf', content=PDF):
+    return SimpleUploadedFile(name, content, content_type='application/pdf')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class DownloadAuthorizationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = make_profile('owner@example.com')
+        cls.other = make_user('other@example.com')
+        cls.staff = make_user('staff@example.com', is_staff=True)
+        application = JobApplication.objects.create(applicant=cls.owner, job_listing=make_listing())
+        cls.files = {
+            'documents': Document.objects.create(name='Advert', file=pdf('advert.pdf', PDF + b'advert')),
+            'contact-requests': ContactRequest.objects.create(
+                name='Visitor', email='visitor@example.com', phone='03001234567', service='other',
+                preferred_contact='email', file=pdf('contact.pdf', PDF + b'contact'),
+            ),
+            'application-documents': ApplicationDocument.objects.create(
+                application=application, uploaded_by=cls.owner.user, name='Degree',
+                file=pdf('degree.pdf', PDF + b'degree'),
+            ),
+        }
+
+    def download(self, kind, user=None):
+        if user is not None:
+            self.client.force_login(user)
+        return self.client.get(reverse('download-file', args=[kind, self.files[kind].pk]))
+
+    def test_authorization_matrix(self):
+        expected = {
+            'documents': {'anonymous': 200, 'owner': 200, 'other': 200, 'staff': 200},
+            'contact-requests': {'anonymous': 401, 'owner': 403, 'other': 403, 'staff': 200},
+            'application-documents': {'anonymous': 401, 'owner': 200, 'other': 403, 'staff': 200},
+        }
+        users = {'anonymous': None, 'owner': self.owner.user, 'other': self.other, 'staff': self.staff}
+        for kind, statuses in expected.items():
+            for who, status in statuses.items():
+                with self.subTest(kind=kind, user=who):
+                    self.client.logout()
+                    response = self.download(kind, users[who])
+                    self.assertEqual(response.status_code, status)
+                    if status == 200:
+                        self.assertTrue(b''.join(response.streaming_content).startswith(PDF))
+
+    def test_inactive_owner_is_refused(self):
+        User.objects.filter(pk=self.owner.user.pk).update(is_active=False)
+        self.assertEqual(self.download('application-documents', self.owner.user).status_code, 401)
+
+    def test_unknown_kind_is_not_found(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('download-file', args=['profiles', 1])).status_code, 404)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ApplicationDocumentAttachmentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.applicant = make_profile('applicant@example.com')
+        cls.listing = make_listing()
+
+    def setUp(self):
+        self.client.force_authenticate(self.applicant.user)
+
+    def upload(self, name):
+        response = self.client.post(reverse('upload-application-file'),
+                                    {'name': name, 'file': pdf(f'{name}.pdf', PDF + name.encode())})
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def apply(self, document_ids):
+        return self.client.post(reverse('create-job-application'), {
+            'job_listing': self.listing.pk, 'answers': '[]', 'document_ids': json.dumps(document_ids),
+        })
+
+    def test_upload_response_links_the_download_view_only(self):
+        body = self.upload('cnic')
+        self.assertNotIn('file', body)
+        self.assertTrue(body['download_url'].endswith(
+            reverse('download-file', args=['application-documents', body['id']])))
+
+    def test_own_uploads_are_attached(self):
+        ids = [self.upload('cnic')['id'], self.upload('degree')['id']]
+        response = self.apply(ids)
+        self.assertEqual(response.status_code, 201)
+        application = JobApplication.objects.get(applicant=self.applicant)
+        self.assertCountEqual(application.documents.values_list('pk', flat=True), ids)
+
+    def test_foreign_or_attached_documents_reject_the_application(self):
+        mine = self.upload('cnic')['id']
+        other = make_profile('someone@example.com')
+        theirs = ApplicationDocument.objects.create(uploaded_by=other.user, name='theirs',
+                                                    file=pdf('theirs.pdf', PDF + b'theirs'))
+        legacy = ApplicationDocument.objects.create(name='legacy', file=pdf('legacy.pdf', PDF + b'legacy'))
+
+        response = self.apply([mine, theirs.pk, legacy.pk])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['document_ids']), 2)
+        self.assertFalse(JobApplication.objects.filter(applicant=self.applicant).exists())
+        self.assertFalse(ApplicationDocument.objects.filter(application__isnull=False).exists())
+
+    def test_documents_cannot_move_between_applications(self):
+        document = self.upload('cnic')['id']
+        self.assertEqual(self.apply([document]).status_code, 201)
+        self.listing = make_listing('ASST (2)')
+        self.assertEqual(self.apply([document]).status_code, 400)
+
+
+class ConfirmationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.applicant = make_profile('applicant@example.com')
+        cls.listing = make_listing()
+        cls.application = JobApplication.objects.create(applicant=cls.applicant, job_listing=cls.listing,
+                                                        highest_qualification='matric')
+
+    def confirmed_count(self):
+        return JobListingStats.objects.filter(job_listing=self.listing).values_list('confirmed', flat=True).first()
+
+    def test_only_the_first_of_two_racing_confirmations_wins(self):
+        stale = JobApplication.objects.get(pk=self.application.pk)
+        self.assertTrue(confirm_application(self.application.pk, user=self.applicant.user))
+        self.assertFalse(stale.is_confirmed)
+        self.assertFalse(confirm_application(stale.pk, user=self.applicant.user))
+        self.assertEqual(self.confirmed_count(), 1)
+
+    def test_confirmation_is_scoped_to_the_applicant(self):
+        other = make_user('other@example.com')
+        self.assertFalse(confirm_application(self.application.pk, user=other))
+        self.application.refresh_from_db()
+        self.assertFalse(self.application.is_confirmed)
+
+    def test_confirm_view_reports_repeats_and_strangers(self):
+        url = reverse('confirm-job-application', args=[self.application.pk])
+        self.client.force_authenticate(make_user('other@example.com'))
+        self.assertEqual(self.client.post(url).status_code, 404)
+        self.client.force_authenticate(self.applicant.user)
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(self.confirmed_count(), 1)
+
+    def test_bulk_confirmation_partitions_ids(self):
+        second = JobApplication.objects.create(applicant=make_profile('second@example.com'), job_listing=self.listing)
+        confirm_application(self.application.pk)
+        self.client.force_authenticate(make_user('staff@example.com', is_staff=True))
+
+        response = self.client.post(reverse('bulk-confirm-job-applications'),
+                                    {'application_ids': [self.application.pk, second.pk, 999999]}, format='json')
+
+        self.assertEqual(response.json(), {
+            'confirmed': [second.pk], 'already_confirmed': [self.application.pk], 'not_found': [999999],
+        })
+        self.assertEqual(confirm_applications([self.application.pk, second.pk]), [])
+        self.assertEqual(self.confirmed_count(), 2)
+
+
+@override_settings(MERIT_SHORTLIST_RATIO=1, MERIT_INCREMENTAL_LIMIT=25)
+class MeritListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.listing = make_listing(number_of_positions=2, minimum_qualification='intermediate')
+        cls.masters = cls.apply('masters@example.com', 'masters')
+        cls.senior = cls.apply('senior@example.com', 'bachelors', years=3)
+        cls.older = cls.apply('older@example.com', 'bachelors', years=1, born=datetime.date(1990, 1, 1))
+        cls.younger = cls.apply('younger@example.com', 'bachelors', years=1, born=datetime.date(1995, 1, 1))
+        cls.apply('matric@example.com', 'matric', years=10)
+        cls.apply('pending@example.com', 'masters', years=10, confirmed=False)
+
+    @classmethod
+    def apply(cls, email, qualification, years=0, born=datetime.date(1995, 1, 1), confirmed=True, listing=None):
+        profile = make_profile(email, date_of_birth=born)
+        if years:
+            WorkHistory.objects.create(profile=profile, company_name='NFA', job_title='Clerk',
+                                       start_date=timezone.localdate() - datetime.timedelta(days=365 * years + 1))
+        return JobApplication.objects.create(applicant=profile, job_listing=listing or cls.listing,
+                                             highest_qualification=qualification, is_confirmed=confirmed)
+
+    def ranking(self):
+        return list(self.listing.merit_entries.order_by('rank').values_list('application_id', 'shortlisted'))
+
+    def test_generate_ranks_by_qualification_experience_and_age(self):
+        merit_list = generate(self.listing)
+        self.assertEqual(self.ranking(), [
+            (self.masters.pk, True), (self.senior.pk, True), (self.older.pk, False), (self.younger.pk, False),
+        ])
+        self.assertEqual((merit_list.applicants, merit_list.shortlisted), (4, 2))
+
+    def test_late_confirmations_are_inserted_in_rank_order(self):
+        generate(self.listing)
+        middle = self.apply('middle@example.com', 'bachelors', years=2, confirmed=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            confirm_application(middle.pk)
+        self.assertEqual(self.ranking(), [
+            (self.masters.pk, True), (self.senior.pk, True), (middle.pk, False), (self.older.pk, False),
+            (self.younger.pk, False),
+        ])
+
+        top = self.apply('top@example.com', 'masters', years=5, confirmed=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            confirm_application(top.pk)
+        self.assertEqual([pk for pk, _ in self.ranking()],
+                         [top.pk, self.masters.pk, self.senior.pk, middle.pk, self.older.pk, self.younger.pk])
+        self.assertEqual([shortlisted for _, shortlisted in self.ranking()], [True, True, False, False, False, False])
+        self.assertEqual(MeritList.objects.get(job_listing=self.listing).applicants, 6)
+
+    def test_incremental_inserts_match_a_full_regeneration(self):
+        generate(self.listing)
+        for n, qualification in enumerate(['bachelors', 'masters', 'intermediate', 'bachelors']):
+            self.apply(f'late{n}@example.com', qualification, years=n)
+        add_late_applications(self.listing)
+        incremental = self.ranking()
+        generate(self.listing)
+        self.assertEqual(incremental, self.ranking())
+
+    def test_late_inserts_wait_for_a_generated_list(self):
+        self.assertEqual(add_late_applications(self.listing), 0)
+        self.assertFalse(self.listing.merit_entries.exists())
+
+    def test_minimum_age_and_required_experience_are_enforced(self):
+        listing = make_listing('ASST (2)', minimum_age=30, required_experience=2)
+        eligible = self.apply('eligible@example.com', 'bachelors', years=2, born=datetime.date(1980, 1, 1),
+                              listing=listing)
+        self.apply('young@example.com', 'bachelors', years=2, born=datetime.date(2010, 1, 1),
+                   listing=listing)
+        self.apply('junior@example.com', 'bachelors', years=1, born=datetime.date(1980, 1, 1), listing=listing)
+        generate(listing)
+        self.assertEqual(list(listing.merit_entries.values_list('application_id', flat=True)), [eligible.pk])
+
+
+def schedule_row(n, venue='Hall A', test_date='2027-01-05', session='Morning'):
+    return [n, f'R{n:04d}', f'Candidate {n}', 'Father', f'11111-{n:07d}-1', 'Naib Qasid', 'Islamabad', '03001234567',
+            'General', test_date, session, '8:30 AM', '9:00 AM', venue]
+
+
+def schedule_records(*rows, sheet='Schedule', header=SCHEDULE_COLUMNS):
+    return [(sheet, line, row) for line, row in enumerate([header, *rows], start=1)]
+
+
+class ScheduleImportTests(TestCase):
+    def setUp(self):
+        self.rows = [schedule_row(n) for n in range(1, 4)]
+        self.first = import_schedule(schedule_records(*self.rows))
+
+    def test_reimporting_the_same_sheet_changes_nothing(self):
+        self.assertEqual(len(self.first.added), 3)
+        before = list(TestSchedule.objects.order_by('pk').values_list('pk', 'row_hash'))
+
+        report = import_schedule(schedule_records(*self.rows))
+
+        self.assertEqual((len(report.added), len(report.changed), report.unchanged, len(report.removed)), (0, 0, 3, 0))
+        self.assertEqual(list(TestSchedule.objects.order_by('pk').values_list('pk', 'row_hash')), before)
+
+    def test_report_lists_changed_columns_and_missing_rows(self):
+        report = import_schedule(schedule_records(schedule_row(1, venue='Hall B'), schedule_row(2), schedule_row(4)))
+
+        self.assertEqual([row.roll_no for row in report.added], ['R0004'])
+        self.assertEqual([(row.roll_no, columns) for row, columns in report.changed], [('R0001', ['Venue'])])
+        self.assertEqual([key[0] for key, _ in report.removed], ['R0003'])
+        self.assertEqual(TestSchedule.objects.get(candidate__roll_no='R0001').venue, 'Hall B')
+        self.assertTrue(TestSchedule.objects.filter(candidate__roll_no='R0003').exists())
+
+    def test_dry_run_saves_nothing(self):
+        report = import_schedule(schedule_records(schedule_row(1, venue='Hall B')), prune=True, dry_run=True)
+        self.assertEqual((len(report.changed), len(report.removed), report.pruned), (1, 2, False))
+        self.assertEqual(TestSchedule.objects.count(), 3)
+        self.assertFalse(TestSchedule.objects.filter(venue='Hall B').exists())
+
+    def test_prune_deletes_rows_missing_from_the_sheet(self):
+        report = import_schedule(schedule_records(schedule_row(1)), prune=True)
+        self.assertTrue(report.pruned)
+        self.assertEqual(list(TestSchedule.objects.values_list('candidate__roll_no', flat=True)), ['R0001'])
+
+    def test_prune_is_refused_while_rows_have_errors(self):
+        invalid = schedule_row(2, test_date='not a date')
+        report = import_schedule(schedule_records(schedule_row(1), invalid, schedule_row(3)), prune=True)
+
+        self.assertEqual(len(report.errors), 1)
+        self.assertTrue(report.prune_blocked)
+        self.assertFalse(report.pruned)
+        self.assertIn('nothing pruned', report.summary)
+        self.assertEqual(TestSchedule.objects.count(), 3)
+
+    def test_duplicate_rows_keep_the_first_and_report_the_rest(self):
+        report = import_schedule(schedule_records(schedule_row(1, venue='Hall B'), schedule_row(1, venue='Hall C')))
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(TestSchedule.objects.get(candidate__roll_no='R0001').venue, 'Hall B')
+
+
+class ScheduleValidationTests(SimpleTestCase):
+    def validate(self, *rows, formats=None):
+        errors = []
+        valid = validate_rows([('Schedule', line, row[1:]) for line, row in enumerate(rows, start=2)], errors, formats)
+        return valid, errors
+
+    def test_dates_parse_per_column_in_any_supported_format(self):
+        formats = ColumnFormats()
+        rows, errors = self.validate(schedule_row(1, test_date='05/01/2027'), schedule_row(2, test_date='2027-01-06'),
+                                     schedule_row(3, test_date=datetime.datetime(2027, 1, 7, 0, 0)), formats=formats)
+        self.assertEqual(errors, [])
+        self.assertEqual([row.test_date for row in rows],
+                         [datetime.date(2027, 1, 5), datetime.date(2027, 1, 6), datetime.date(2027, 1, 7)])
+        self.assertEqual(formats.date_format, '%d/%m/%Y')
+        self.assertEqual(set(formats.dates), {'05/01/2027', '2027-01-06'})
+
+    def test_cnic_and_mobile_are_normalized(self):
+        row = schedule_row(1)
+        row[4], row[7] = '11111 0000001 1', '+92 300 1234567'
+        rows, errors = self.validate(row, schedule_row(2))
+        self.assertEqual(errors, [])
+        self.assertEqual([(row.cnic, row.mobile_no) for row in rows],
+                         [('11111-0000001-1', '03001234567'), ('11111-0000002-1', '03001234567')])
+
+    def test_a_row_reports_all_of_its_problems(self):
+        bad = schedule_row(2, test_date='someday')
+        bad[2], bad[4] = '', '123'
+        rows, errors = self.validate(schedule_row(1), bad, schedule_row(3))
+        self.assertEqual([row.roll_no for row in rows], ['R0001', 'R0003'])
+        [(sheet, line, message)] = errors
+        self.assertEqual((sheet, line), ('Schedule', 3))
+        self.assertEqual(message, 'Invalid date format: someday; Invalid CNIC: 123; missing name')
+
+
+class ScheduleExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rows = [schedule_row(n) for n in range(1, 4)] + [schedule_row(n, venue='Hall B') for n in range(4, 6)]
+        import_schedule(schedule_records(*rows))
+
+    def setUp(self):
+        self.client.force_authenticate(make_user('staff@example.com', is_staff=True))
+
+    def export(self, extension, **params):
+        return self.client.get(reverse('export-test-schedules', args=[extension]), params)
+
+    def test_xlsx_streams_one_sheet_per_venue(self):
+        response = self.export('xlsx')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.openxmlformats'))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test-schedules.xlsx"')
+
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Hall A', 'Hall B'])
+        rows = {title: list(workbook[title].iter_rows(values_only=True)) for title in workbook.sheetnames}
+        self.assertEqual(list(rows['Hall A'][0]), SCHEDULE_COLUMNS)
+        self.assertEqual((len(rows['Hall A']), len(rows['Hall B'])), (4, 3))
+        first = dict(zip(SCHEDULE_COLUMNS, rows['Hall B'][1]))
+        self.assertEqual((first['Sr.No.'], first['Roll No'], first['Test Date']), (1, 'R0004', '05 Jan 2027'))
+
+    def test_empty_export_is_still_a_workbook(self):
+        response = self.export('xlsx', venue='Nowhere')
+        workbook = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertEqual([list(row) for row in workbook['Schedule'].iter_rows(values_only=True)], [SCHEDULE_COLUMNS])
+
+    def test_csv_matches_the_xlsx_rows(self):
+        response = self.export('csv', venue='Hall B')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test-schedules.csv"')
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('1,R0004,Candidate 4,'))
+
+    def test_export_is_staff_only(self):
+        self.client.force_authenticate(make_user('applicant@example.com'))
+        self.assertEqual(self.export('xlsx').status_code, 403)
+
+
+def ods_bytes(rows):
+    def cell(value):
+        if isinstance(value, datetime.date):
+            return f'<table:table-cell office:value-type="date" office:date-value="{value.isoformat()}"/>'
+        if isinstance(value, int):
+            return f'<table:table-cell office:value-type="float" office:value="{value}"/>'
+        if value is None:
+            return '<table:table-cell table:number-columns-repeated="3"/>'
+        return f'<table:table-cell office:value-type="string"><text:p>{value}</text:p></table:table-cell>'
+
+    body = ''.join(f"<table:table-row>{''.join(cell(value) for value in row)}</table:table-row>" for row in rows)
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+        f'<office:body><office:spreadsheet><table:table table:name="Lahore">{body}'
+        '<table:table-row table:number-rows-repeated="1000"><table:table-cell/></table:table-row>'
+        '</table:table></office:spreadsheet></office:body></office:document-content>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w') as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.spreadsheet')
+        archive.writestr('content.xml', content)
+    out.seek(0)
+    return out
+
+
+class ScheduleReaderTests(TestCase):
+    def imported(self, fileobj, filename, lookup=None):
+        report = import_schedule(read_schedule(fileobj, filename), lookup=lookup)
+        self.assertEqual(report.errors, [])
+        return report
+
+    def test_csv_with_semicolons_and_header_aliases(self):
+        text = ('Candidate Name;Roll Number;CNIC No;Job Post;Date;Shift;Paper;Test Centre;Mobile\r\n'
+                'Ali Khan;CSV001;1111111111111;Naib Qasid;05/01/2027;Morning;General;Hall 1;3001234567\r\n')
+        report = self.imported(io.BytesIO(('\ufeff' + text).encode('utf-8')), 'centres.csv')
+
+        row, = report.added
+        self.assertEqual((row.sheet, row.roll_no, row.name, row.venue), ('centres', 'CSV001', 'Ali Khan', 'Hall 1'))
+        self.assertEqual((row.cnic, row.mobile_no), ('11111-1111111-1', '03001234567'))
+        self.assertEqual(row.test_date, datetime.date(2027, 1, 5))
+
+    def test_xlsx_reads_every_sheet_below_title_blocks(self):
+        wb = openpyxl.Workbook()
+        wb.active.title = 'Instructions'
+        wb.active.append(['Fill in one sheet per centre'])
+        lahore = wb.create_sheet('Lahore')
+        lahore.append(['NFA Test Schedule - Lahore'])
+        lahore.append([])
+        lahore.append(['S.No', 'Venue', 'Roll No', 'Name', 'CNIC', 'Post', 'Paper', 'Test Date', 'Session'])
+        lahore.append([1, 'Hall L', 'XL001', 'Sara', '22222-2222222-2', 'Naib Qasid', 'General',
+                       datetime.datetime(2027, 1, 6), 'Evening'])
+        karachi = wb.create_sheet('Karachi')
+        karachi.append(['Roll No', 'Name', 'CNIC', 'Post Applied For', 'Paper', 'Test Date', 'Session'])
+        karachi.append(['XL002', 'Omar', '22222-2222222-3', 'Naib Qasid', 'General', '2027-01-07', 'Morning'])
+        out = io.BytesIO()
+        wb.save(out)
+        out.seek(0)
+
+        report = self.imported(out, 'centres.xlsx')
+
+        self.assertEqual([(row.sheet, row.line, row.roll_no) for row in report.added],
+                         [('Lahore', 4, 'XL001'), ('Karachi', 2, 'XL002')])
+        self.assertEqual([sheet for sheet, _ in report.skipped], ['Instructions'])
+
+    def test_ods_dates_numbers_and_repeated_cells(self):
+        fileobj = ods_bytes([
+            ['Roll No', 'Name', 'CNIC', None, 'Post', 'Paper', 'Test Date', 'Session'],
+            [1234, 'Hina', '33333-3333333-3', None, 'Naib Qasid', 'General', datetime.date(2027, 1, 8), 'Morning'],
+        ])
+        row, = self.imported(fileobj, 'centres.ods').added
+        self.assertEqual((row.sheet, row.roll_no, row.test_date), ('Lahore', '1234', datetime.date(2027, 1, 8)))
+
+    def test_column_overrides_map_unknown_headers(self):
+        text = ('Seat No,Name,CNIC,Post,Paper,Test Date,Session\n'
+                'S-1,Zara,44444-4444444-4,Naib Qasid,General,2027-01-09,Morning\n')
+        report = import_schedule(read_schedule(io.BytesIO(text.encode()), 'seats.csv'))
+        self.assertEqual(report.skipped, [('seats', 'no header row with the required columns')])
+
+        lookup = header_lookup(overrides={'roll_no': 'Seat No'})
+        row, = self.imported(io.BytesIO(text.encode()), 'seats.csv', lookup).added
+        self.assertEqual(row.roll_no, 'S-1')
+
+    def test_unsupported_extensions_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Unsupported file type .pdf'):
+            read_schedule(io.BytesIO(PDF), 'schedule.pdf')
+
+
+@override_settings(DATABASE_REPLICAS=('replica_1',))
+class ReplicaRouterTests(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.reads = []
+
+        @replica_safe
+        def view(request, write=False):
+            self.reads.append(self.router.db_for_read(JobListing))
+            if write:
+                self.router.db_for_write(JobListing)
+            with transaction.atomic():
+                self.reads.append(self.router.db_for_read(JobListing))
+            self.reads.append(self.router.db_for_read(JobListing))
+            return HttpResponse()
+
+        self.view = view
+
+    def test_safe_requests_read_from_a_replica_outside_transactions(self):
+        self.view(self.factory.get('/'))
+        self.assertEqual(self.reads, ['replica_1', None, 'replica_1'])
+        self.assertIsNone(self.router.db_for_read(JobListing))
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        self.view(self.factory.get('/'), write=True)
+        self.assertEqual(self.reads, ['replica_1', None, None])
+
+    def test_sticky_clients_and_unsafe_methods_use_the_primary(self):
+        sticky = self.factory.get('/')
+        sticky.COOKIES[STICKY_COOKIE] = '1'
+        self.view(sticky)
+        self.view(self.factory.post('/'))
+        self.assertEqual(self.reads, [None] * 6)
+
+    @override_settings(DATABASE_REPLICAS=())
+    def test_without_replicas_everything_uses_the_primary(self):
+        self.view(self.factory.get('/'))
+        self.assertEqual(self.reads, [None] * 3)
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica_1', 'candidates'))
+        self.assertIsNone(self.router.allow_migrate('default', 'candidates'))
+
+
+class ReferenceNumberTests(SimpleTestCase):
+    def test_references_sort_by_time(self):
+        earlier, later = new_reference_number(1_700_000_000_000), new_reference_number(1_700_000_000_001)
+        self.assertLess(earlier, later)
+        self.assertEqual(len(earlier), 17)
+
+
+class ReferenceNumberMigrationTests(TransactionTestCase):
+    before = [('candidates', '0016_index_pack')]
+    after = [('candidates', '0017_time_ordered_reference_numbers')]
+    legacy = '3f2b8c1e-9a4d-4c6b-8e2f-1a2b3c4d5e6f'
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_existing_references_survive_the_migration_both_ways(self):
+        apps = self.migrate(self.before)
+        user = apps.get_model('authentication', 'User').objects.create(email='legacy@example.com')
+        profile = apps.get_model('candidates', 'Profile').objects.create(
+            user=user, date_of_birth=datetime.date(1990, 1, 1), postal_address='Islamabad')
+        job_post = apps.get_model('candidates', 'JobPost').objects.create(code='NQ (1)', title='Naib Qasid')
+        listing = apps.get_model('candidates', 'JobListing').objects.create(
+            job_post=job_post, application_deadline=datetime.date(2027, 1, 1))
+        pk = apps.get_model('candidates', 'JobApplication').objects.create(
+            applicant=profile, job_listing=listing, reference_number=self.legacy).pk
+
+        apps = self.migrate(self.after)
+        JobApplication = apps.get_model('candidates', 'JobApplication')
+        self.assertEqual(JobApplication.objects.get(pk=pk).reference_number, self.legacy)
+        fresh = JobApplication.objects.create(applicant_id=profile.pk, job_listing_id=listing.pk)
+        self.assertEqual(len(fresh.reference_number), 17)
+
+        apps = self.migrate(self.before)
+        self.assertEqual(apps.get_model('candidates', 'JobApplication').objects.get(pk=pk).reference_number,
+                         self.legacy)
+
+
+class IndexPackMigrationTests(TransactionTestCase):
+    migration = ('candidates', '0016_index_pack')
+
+    def indexes(self, table):
+        with connection.cursor() as cursor:
+            return {name for name, info in connection.introspection.get_constraints(cursor, table).items()
+                    if info['index']}
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_indexes_are_built_outside_a_transaction(self):
+        migration = MigrationExecutor(connection).loader.get_migration(*self.migration)
+        self.assertFalse(migration.atomic)
+        self.assertTrue(all(isinstance(operation, AddIndexConcurrentlyOnPostgres)
+                            for operation in migration.operations))
+
+    def test_other_databases_fall_back_to_a_plain_index(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('candidates', '0015_archivedcycle')])
+        self.assertNotIn('testschedule_test_date_idx', self.indexes('candidates_testschedule'))
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migration])
+        self.assertIn('testschedule_test_date_idx', self.indexes('candidates_testschedule'))
+        self.assertIn('application_confirmed_idx', self.indexes('candidates_jobapplication'))
+
+    def test_postgres_builds_the_index_concurrently(self):
+        operation = AddIndexConcurrentlyOnPostgres(model_name='testschedule', index=models.Index(
+            fields=['test_date'], name='testschedule_test_date_idx'))
+        schema_editor = mock.Mock()
+        schema_editor.connection.vendor = 'postgresql'
+        with mock.patch.object(AddIndexConcurrently, 'database_forwards') as forwards, \
+                mock.patch.object(AddIndexConcurrently, 'database_backwards') as backwards:
+            operation.database_forwards('candidates', schema_editor, None, None)
+            operation.database_backwards('candidates', schema_editor, None, None)
+        forwards.assert_called_once()
+        backwards.assert_called_once()
+        schema_editor.add_index.assert_not_called()
+
+    def test_query_report_skips_without_postgres(self):
+        out = io.StringIO()
+        call_command('query_report', stdout=out)
+        self.assertIn('Query statistics need PostgreSQL', out.getvalue())
+
+
+class ThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(ContactUsThrottle, 'timer', staticmethod(lambda: 1_800_000_000.0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def allow(self, address='10.0.0.1'):
+        throttle = ContactUsThrottle()
+        return throttle.allow_request(self.factory.post('/', REMOTE_ADDR=address), None), throttle.wait()
+
+    def test_requests_beyond_the_window_limit_are_refused(self):
+        limit = ContactUsThrottle().num_requests
+        results = [self.allow() for _ in range(limit + 2)]
+        self.assertEqual([allowed for allowed, _ in results], [True] * limit + [False, False])
+        self.assertGreater(results[-1][1], 0)
+        self.assertTrue(self.allow('10.0.0.2')[0])
+
+    def test_an_evicted_window_starts_counting_again(self):
+        self.allow()
+        throttle = ContactUsThrottle()
+        cache.delete(throttle.window_key('10.0.0.1', throttle.timer()))
+        self.assertTrue(self.allow()[0])
+
+
+class StatsReconciliationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.listings = [make_listing(), make_listing()]
+        for n, (listing, qualification) in enumerate([(0, 'matric'), (0, 'masters'), (1, 'matric')]):
+            application = JobApplication.objects.create(applicant=make_profile(f'applicant{n}@example.com'),
+                                                        job_listing=cls.listings[listing],
+                                                        highest_qualification=qualification, is_confirmed=n == 0)
+            record_application(application)
+
+    def counters(self):
+        return (list(JobListingStats.objects.order_by('pk').values_list('job_listing_id', 'applications', 'confirmed')),
+                list(JobListingQualificationStats.objects.order_by('job_listing_id', 'qualification')
+                     .values_list('job_listing_id', 'qualification', 'applications', 'confirmed')))
+
+    def test_only_drifted_listings_are_locked_and_fixed(self):
+        JobListingStats.objects.filter(job_listing=self.listings[1]).update(confirmed=5)
+        with mock.patch('candidates.stats.reconcile_listing', wraps=stats.reconcile_listing) as fix:
+            self.assertEqual(reconcile(), 1)
+        fix.assert_called_once_with(self.listings[1].pk)
+        self.assertEqual(reconcile(), 0)
+
+    def test_drifted_listings_are_recounted(self):
+        expected = self.counters()
+        first, second = self.listings
+        JobListingStats.objects.filter(job_listing=first).update(applications=7)
+        JobListingQualificationStats.objects.filter(job_listing=second).delete()
+        JobListingQualificationStats.objects.create(job_listing=second, qualification='bachelors', applications=2)
+
+        self.assertEqual(reconcile(), 3)
+
+        listings, qualifications = self.counters()
+        self.assertEqual(listings, expected[0])
+        self.assertEqual([row for row in qualifications if row[2:] != (0, 0)], expected[1])
+        self.assertEqual(reconcile(), 0)
+
+
+class RollNumberTests(TestCase):
+    def add(self, *roll_numbers):
+        for n, roll_no in enumerate(roll_numbers, start=Candidate.objects.count()):
+            Candidate.objects.create(roll_no=roll_no, name='Candidate', father_name='Father',
+                                     cnic=f'55555-{n:07d}-5', postal_address='Islamabad', mobile_no='03001234567')
+
+    def test_prefixes_are_matched_literally(self):
+        self.add('A.' + '7'.zfill(ROLL_DIGITS), 'AX' + '99'.zfill(ROLL_DIGITS), 'A.' + '1' * (ROLL_DIGITS + 1),
+                 'A.X' + '9' * (ROLL_DIGITS - 1))
+        self.assertEqual(next_roll_number('A.'), 8)
+        self.assertEqual(next_roll_number('AX'), 100)
+        self.assertEqual(next_roll_number('(.'), 1)
+
+    def test_empty_series_starts_at_one(self):
+        self.assertEqual(next_roll_number('001'), 1)
+
+
+class AllocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        import_schedule(schedule_records(schedule_row(1)))
+        JobPost.objects.create(code='ASSISTANT', title='Assistant')
+        cls.listing = make_listing('ASSISTANT')
+        for rank, (cnic, first_name) in enumerate([('11111-0000001-1', 'Renamed'), ('22222-0000002-2', 'New')], 1):
+            user = make_user(f'{first_name.lower()}@example.com', cnic=cnic, first_name=first_name)
+            profile = Profile.objects.create(user=user, date_of_birth=datetime.date(1995, 1, 1),
+                                             postal_address='Islamabad', phone_number='03001234567')
+            application = JobApplication.objects.create(applicant=profile, job_listing=cls.listing)
+            MeritListEntry.objects.create(job_listing=cls.listing, application=application, rank=rank,
+                                          shortlisted=True, date_of_birth=profile.date_of_birth,
+                                          submitted_at=application.submitted_at)
+
+    def allocate(self):
+        return allocate(self.listing.job_post, [Venue('Hall A', 'Islamabad', 10)], [Session(*DEFAULT_SESSIONS[0])],
+                        [datetime.date(2027, 2, 1)])
+
+    def test_every_allocated_row_gets_a_digest(self):
+        assignments = self.allocate()
+        existing = next(assignment for assignment in assignments if assignment.candidate_id)
+        self.assertEqual((existing.roll_no, existing.applicant.name, existing.applicant.father_name),
+                         ('R0001', 'Candidate 1', 'Father'))
+        hashes = dict(TestSchedule.objects.filter(job_post=self.listing.job_post)
+                      .values_list('candidate__roll_no', 'row_hash'))
+        self.assertEqual(len(hashes), 2)
+        for assignment in assignments:
+            self.assertEqual(hashes[assignment.roll_no],
+                             schedule_row_digest(plan_row(assignment, self.listing.job_post)))
+
+    def test_reimporting_the_written_plan_changes_nothing(self):
+        plan = io.BytesIO()
+        write_plan(self.allocate(), self.listing.job_post, plan)
+        plan.seek(0)
+        report = import_schedule(read_schedule(plan, 'plan.xlsx'))
+        self.assertEqual((len(report.added), len(report.changed), report.unchanged), (0, 0, 2))
+        self.assertEqual(Candidate.objects.get(roll_no='R0001').name, 'Candidate 1')
+
+
+class DocumentsCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/api/candidates/documents/', {'page': 2})
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {'build': self.builds}
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_caches_keep_pages_briefly(self):
+        with self.settings(DOCUMENTS_LOCAL_CACHE_TIMEOUT=10, DOCUMENTS_CACHE_TIMEOUT=0):
+            for _ in range(2):
+                cached_documents(self.request, 'documents', self.build)
+            self.assertEqual(self.builds, 1)
+        with self.settings(DOCUMENTS_LOCAL_CACHE_TIMEOUT=0):
+            cached_documents(self.request, 'documents', self.build)
+            cached_documents(self.request, 'documents', self.build)
+        self.assertEqual(self.builds, 3)
+
+    def test_shared_caches_serve_pages_until_the_version_bumps(self):
+        location = tempfile.mkdtemp(prefix='nfa-cache-', dir=MEDIA_ROOT)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+        with self.settings(CACHES=shared):
+            self.assertEqual(cached_documents(self.request, 'documents', self.build), {'build': 1})
+            self.assertEqual(cached_documents(self.request, 'documents', self.build), {'build': 1})
+            bump_documents_cache_version()
+            self.assertEqual(cached_documents(self.request, 'documents', self.build), {'build': 2})
+
+
+class JobApplicationAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = make_user('admin@example.com', is_staff=True, is_superuser=True)
+        cls.listing = make_listing()
+
+    def changelist(self):
+        return self.client.get(reverse('admin:candidates_jobapplication_changelist'))
+
+    def test_changelist_lists_concrete_columns_with_constant_queries(self):
+        self.client.force_login(self.staff)
+        JobApplication.objects.create(applicant=make_profile('first@example.com'), job_listing=self.listing)
+        with CaptureQueriesContext(connection) as one:
+            response = self.changelist()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('merit_entry', response.context['cl'].list_display)
+
+        for n in range(3):
+            JobApplication.objects.create(applicant=make_profile(f'more{n}@example.com'), job_listing=self.listing)
+        with CaptureQueriesContext(connection) as four:
+            self.assertEqual(self.changelist().status_code, 200)
+        self.assertEqual(len(four), len(one))
+
+
+class ProfileUpdateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = make_profile('applicant@example.com')
+        cls.school, cls.college = (
+            Education.objects.create(profile=cls.profile, institution_name=name, degree=degree,
+                                     field_of_study='Science', start_date=datetime.date(start, 1, 1),
+                                     end_date=datetime.date(start + 2, 1, 1))
+            for name, degree, start in (('School', 'matric', 2008), ('College', 'intermediate', 2010))
+        )
+        cls.stranger = Education.objects.create(
+            profile=make_profile('stranger@example.com'), institution_name='Elsewhere', degree='masters',
+            field_of_study='Law', start_date=datetime.date(2012, 1, 1), end_date=datetime.date(2014, 1, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.profile.user)
+
+    def education(self, obj, **changes):
+        data = {'id': obj.pk, 'institution_name': obj.institution_name, 'degree': obj.degree,
+                'field_of_study': obj.field_of_study, 'start_date': obj.start_date.isoformat(),
+                'end_date': obj.end_date.isoformat()}
+        return {**data, **changes}
+
+    def update(self, educations):
+        response = self.client.patch(reverse('update-profile', args=[self.profile.pk]),
+                                     {'educations': educations}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def rows(self, profile=None):
+        return dict(Education.objects.filter(profile=profile or self.profile).values_list('pk', 'institution_name'))
+
+    def test_unchanged_rows_keep_their_pk_and_edits_are_made_in_place(self):
+        self.update([self.education(self.school), self.education(self.college, institution_name='FC College')])
+        self.assertEqual(self.rows(), {self.school.pk: 'School', self.college.pk: 'FC College'})
+
+    def test_rows_missing_from_the_payload_are_deleted(self):
+        self.update([self.education(self.college)])
+        self.assertEqual(self.rows(), {self.college.pk: 'College'})
+
+    def test_unknown_duplicate_and_foreign_ids_create_rows(self):
+        self.update([
+            self.education(self.school),
+            self.education(self.school, institution_name='Copy'),
+            self.education(self.college, id=999999, institution_name='Unknown'),
+            self.education(self.stranger, institution_name='Mine now'),
+        ])
+        rows = self.rows()
+        self.assertEqual(rows.pop(self.school.pk), 'School')
+        self.assertCountEqual(rows.values(), ['Copy', 'Unknown', 'Mine now'])
+        self.assertEqual(self.rows(self.stranger.profile), {self.stranger.pk: 'Elsewhere'})
+
+    def test_omitting_the_list_leaves_rows_alone(self):
+        response = self.client.patch(reverse('update-profile', args=[self.profile.pk]), {'bio': 'Hello'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.rows()), 2)
+
+    def test_queries_do_not_grow_with_the_number_of_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            self.update([self.education(self.school, institution_name='A'), self.education(self.college)])
+        many = [self.education(self.school, institution_name='B')] + [
+            self.education(self.college, id=None, institution_name=f'New {n}') for n in range(10)]
+        for item in many[1:]:
+            item.pop('id')
+        with CaptureQueriesContext(connection) as more:
+            self.update(many)
+        self.assertLessEqual(len(more), len(few) + 2)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, DATABASE_REPLICAS=(),
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DocumentsFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Document.objects.create(name='Advert', purpose='Advertisement', file=pdf('advert.pdf', PDF + b'advert'))
+
+    def test_repeat_and_conditional_requests_skip_the_database(self):
+        url = reverse('get-documents')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).json(), first.json())
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+    def test_saving_a_document_changes_the_etag(self):
+        url = reverse('get-documents')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Document.objects.create(name='Notice', purpose='Notice', file=pdf('notice.pdf', PDF + b'notice'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = json.dumps([{'id': n, 'name': f'Listing {n}'} for n in range(200)]).encode()
+
+    def get(self, view, **headers):
+        request = RequestFactory().get('/api/', headers=headers)
+        return CompressionMiddleware(WeakETagMiddleware(view))(request)
+
+    def view(self, request):
+        return HttpResponse(self.body, content_type='application/json')
+
+    def test_prefers_brotli_and_falls_back_to_gzip(self):
+        response = self.get(self.view, accept_encoding='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        response = self.get(self.view, accept_encoding='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+
+    def test_identity_responses_still_vary_on_accept_encoding(self):
+        response = self.get(self.view)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('Accept-Encoding', self.get(self.view, accept_encoding='br')['Vary'])
+
+    def test_small_responses_are_left_alone(self):
+        response = self.get(lambda request: HttpResponse(b'{}', content_type='application/json'), accept_encoding='br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_compressed_etag_is_weak_and_revalidates(self):
+        def view(request):
+            response = self.view(request)
+            response['ETag'] = '"listings-1"'
+            return response
+
+        response = self.get(view, accept_encoding='br')
+        self.assertEqual(response['ETag'], 'W/"listings-1"')
+        response = self.get(view, accept_encoding='br', if_none_match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_generated_etag_revalidates_across_encodings(self):
+        etag = self.get(self.view, accept_encoding='gzip')['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(self.get(self.view, accept_encoding='br', if_none_match=etag).status_code, 304)
+        self.assertEqual(self.get(self.view, if_none_match=etag).status_code, 304)
+
+    def test_streaming_responses_are_compressed_without_a_length(self):
+        def view(request):
+            response = StreamingHttpResponse((line for line in [b'id,name\n'] * 500), content_type='text/csv')
+            response['Content-Length'] = '4000'
+            return response
+
+        response = self.get(view, accept_encoding='br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(brotli.decompress(b''.join(response.streaming_content)), b'id,name\n' * 500)
+
+    def test_brotli_stream_flushes_only_past_the_threshold(self):
+        chunks = [b'x' * 1024] * (STREAM_FLUSH_BYTES // 1024 * 2)
+        output = list(compress_stream(iter(chunks), 'br'))
+        self.assertEqual(brotli.decompress(b''.join(output)), b''.join(chunks))
+        self.assertLessEqual(len(output), 3)
+
+
+class JobListingDeadlineTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        yesterday = today - datetime.timedelta(days=1)
+        cls.open = make_listing('OPEN (1)', application_deadline=today)
+        cls.past = make_listing('PAST (1)', application_deadline=yesterday)
+        cls.closed = make_listing('CLOSED (1)', application_deadline=yesterday, status='closed')
+        cls.draft = make_listing('DRAFT (1)', status='draft')
+
+    def test_is_open_matches_the_open_queryset(self):
+        open_ids = set(JobListing.objects.open().values_list('pk', flat=True))
+        self.assertEqual(open_ids, {self.open.pk})
+        for listing in JobListing.objects.all():
+            self.assertEqual(listing.is_open, listing.pk in open_ids, listing.job_post.code)
+
+    def test_applying_past_the_deadline_is_rejected(self):
+        applicant = make_profile('applicant@example.com')
+        self.client.force_authenticate(applicant.user)
+        response = self.client.post(reverse('create-job-application'), {'job_listing': self.past.pk, 'answers': '[]'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no longer accepting applications', json.dumps(response.json()))
+        self.assertFalse(JobApplication.objects.filter(applicant=applicant).exists())
+
+    def test_expire_command_closes_only_open_listings_past_their_deadline(self):
+        out = io.StringIO()
+        call_command('expire_job_listings', '--dry-run', stdout=out)
+        self.assertIn('Would expire 1 ', out.getvalue())
+        self.assertEqual(JobListing.objects.filter(status='expired').count(), 0)
+
+        call_command('expire_job_listings', stdout=io.StringIO())
+        statuses = dict(JobListing.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {self.open.pk: 'open', self.past.pk: 'expired', self.closed.pk: 'closed',
+                                    self.draft.pk: 'draft'})
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    def document(self, content=PDF + b'shared'):
+        return Document.objects.create(name='Notice', purpose='Notice', file=pdf('notice.pdf', content))
+
+    def blob(self, name):
+        return Blob.objects.get(name=name)
+
+    def test_identical_uploads_share_one_blob(self):
+        first, second = self.document(), self.document()
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith('blobs/'))
+        self.assertEqual(self.blob(first.file.name).ref_count, 2)
+        self.assertNotEqual(self.document(PDF + b'other').file.name, first.file.name)
+
+    def test_deleting_a_reference_releases_it_but_keeps_the_file(self):
+        first, second = self.document(), self.document()
+        name = first.file.name
+        first.delete()
+        self.assertEqual(self.blob(name).ref_count, 1)
+        second.delete()
+        self.assertEqual(self.blob(name).ref_count, 0)
+        self.assertTrue(upload_storage().exists(name))
+
+    def test_a_failed_write_does_not_take_a_reference(self):
+        storage = upload_storage()
+        with mock.patch('django.core.files.storage.FileSystemStorage._save', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                storage.save('notice.pdf', pdf(content=PDF + b'lost'))
+        self.assertFalse(Blob.objects.exists())
+
+    def test_gc_removes_only_old_unreferenced_blobs(self):
+        kept, released, recent = self.document(), self.document(PDF + b'released'), self.document(PDF + b'recent')
+        old_name, recent_name = released.file.name, recent.file.name
+        released.delete()
+        recent.delete()
+        Blob.objects.filter(name=old_name).update(last_referenced_at=timezone.now() - datetime.timedelta(days=2))
+        storage = upload_storage()
+
+        call_command('gc_blobs', '--dry-run', stdout=io.StringIO())
+        self.assertTrue(storage.exists(old_name))
+
+        out = io.StringIO()
+        call_command('gc_blobs', stdout=out)
+        self.assertIn('Removed 1 blob(s)', out.getvalue())
+        self.assertFalse(storage.exists(old_name))
+        self.assertCountEqual(Blob.objects.values_list('name', flat=True), [kept.file.name, recent_name])
+        self.assertTrue(storage.exists(recent_name))
+
+    def test_recount_repairs_drifted_counts(self):
+        document = self.document()
+        stale = timezone.now() - datetime.timedelta(days=2)
+        Blob.objects.filter(name=document.file.name).update(ref_count=0, last_referenced_at=stale)
+        out = io.StringIO()
+        call_command('gc_blobs', '--recount', stdout=out)
+        self.assertIn('Corrected reference counts on 1 blob(s)', out.getvalue())
+        self.assertEqual(self.blob(document.file.name).ref_count, 1)
+        self.assertTrue(upload_storage().exists(document.file.name))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, RECRUITMENT_CYCLE_START_MONTH=1)
+class CycleArchiveTests(TestCase):
+    def setUp(self):
+        self.storage = InMemoryStorage()
+        self.cycle = timezone.localdate().year - 2
+        old, current = f'{self.cycle}-03-05', timezone.localdate().isoformat()
+        import_schedule(schedule_records(schedule_row(1, test_date=old), schedule_row(2, test_date=old),
+                                         schedule_row(3, test_date=current)))
+
+        listing = make_listing()
+        question = JobQuestion.objects.create(job_listing=listing, question_text='Why this post?')
+        self.application = JobApplication.objects.create(applicant=make_profile('old@example.com'),
+                                                         job_listing=listing, highest_qualification='matric')
+        ApplicationAnswer.objects.create(application=self.application, question=question, answer_text='Service')
+        ApplicationDocument.objects.create(application=self.application, name='cnic',
+                                           file=pdf('cnic.pdf', PDF + b'archived cnic'))
+        JobApplication.objects.filter(pk=self.application.pk).update(
+            submitted_at=timezone.now().replace(year=self.cycle, month=6, day=1))
+        self.recent = JobApplication.objects.create(applicant=make_profile('new@example.com'), job_listing=listing)
+
+    def payload(self, archived):
+        with self.storage.open(archived.file.name, 'rb') as archive:
+            return gzip.decompress(archive.read()).decode('utf-8-sig')
+
+    def test_schedules_are_exported_and_removed(self):
+        archived = archive_cycle('test_schedules', self.cycle, storage=self.storage)
+        self.assertEqual((archived.kind, archived.cycle, archived.rows), ('test_schedules', str(self.cycle), 2))
+        lines = self.payload(archived).splitlines()
+        self.assertEqual(lines[0].split(','), SCHEDULE_COLUMNS)
+        self.assertEqual([line.split(',')[1] for line in lines[1:]], ['R0001', 'R0002'])
+        self.assertIn(f'05 Mar {self.cycle}', lines[1])
+        self.assertEqual(list(TestSchedule.objects.values_list('candidate__roll_no', flat=True)), ['R0003'])
+
+    def test_applications_keep_their_answers_and_documents(self):
+        archived = archive_cycle('job_applications', self.cycle, storage=self.storage)
+        self.assertEqual(archived.rows, 1)
+        [record] = [json.loads(line) for line in self.payload(archived).splitlines()]
+        self.assertEqual((record['id'], record['reference_number'], record['email'], record['job_post']),
+                         (self.application.pk, self.application.reference_number, 'old@example.com', 'NQ (1)'))
+        self.assertEqual(record['answers'], [{'question_id': record['answers'][0]['question_id'],
+                                              'question': 'Why this post?', 'answer': 'Service'}])
+        [document] = record['documents']
+        self.assertEqual(document['name'], 'cnic')
+        with self.storage.open(document['file'], 'rb') as copy:
+            self.assertEqual(copy.read(), PDF + b'archived cnic')
+
+        self.assertEqual(list(JobApplication.objects.values_list('pk', flat=True)), [self.recent.pk])
+        self.assertFalse(ApplicationDocument.objects.exists())
+        self.assertFalse(ApplicationAnswer.objects.exists())
+
+    def test_rerunning_an_archived_cycle_is_a_no_op(self):
+        archive_cycle('test_schedules', self.cycle, storage=self.storage)
+        self.assertIsNone(archive_cycle('test_schedules', self.cycle, storage=self.storage))
+        self.assertEqual(ArchivedCycle.objects.count(), 1)
+        self.assertEqual(TestSchedule.objects.count(), 1)
+
+    def test_the_current_cycle_is_refused(self):
+        with self.assertRaises(ValueError):
+            archive_cycle('job_applications', timezone.localdate().year, storage=self.storage)
+        self.assertEqual(JobApplication.objects.count(), 2)
+        self.assertFalse(ArchivedCycle.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContactRequestArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = make_user('staff@example.com', is_staff=True, is_superuser=True)
+        cls.cutoff = timezone.now() - datetime.timedelta(days=30)
+        cls.requests = {
+            name: cls.contact_request(name, status, days, **extra) for name, status, days, extra in [
+                ('resolved', 'resolved', 60, {'assigned_to': cls.staff, 'file': pdf('report.pdf', PDF + b'report')}),
+                ('closed', 'closed', 60, {}),
+                ('new', 'new', 60, {}),
+                ('assigned', 'in_progress', 60, {'assigned_to': cls.staff}),
+                ('recent', 'closed', 10, {}),
+            ]
+        }
+
+    @classmethod
+    def contact_request(cls, name, status, days, **extra):
+        contact_request = ContactRequest.objects.create(
+            name=name, email=f'{name}@example.com', phone='03001234567', service='other', preferred_contact='email',
+            description=f'About {name}', status=status, **extra)
+        ContactRequest.objects.filter(pk=contact_request.pk).update(
+            submitted_at=timezone.now() - datetime.timedelta(days=days))
+        contact_request.refresh_from_db()
+        return contact_request
+
+    def test_only_old_closed_requests_are_archived(self):
+        storage = InMemoryStorage()
+        self.assertEqual(archive_contact_requests(self.cutoff, storage=storage, batch_size=1), (2, 1))
+        self.assertCountEqual(ContactRequest.objects.values_list('name', flat=True), ['new', 'assigned', 'recent'])
+        self.assertCountEqual(ArchivedContactRequest.objects.values_list('name', flat=True), ['resolved', 'closed'])
+
+    def test_archived_rows_keep_their_payload_and_file(self):
+        storage = InMemoryStorage()
+        source = self.requests['resolved']
+        archive_contact_requests(self.cutoff, statuses=['resolved'], storage=storage)
+        archived = ArchivedContactRequest.objects.get(original_id=source.pk)
+        self.assertEqual(
+            (archived.name, archived.email, archived.description, archived.status, archived.assigned_to,
+             archived.submitted_at),
+            (source.name, source.email, source.description, 'resolved', self.staff, source.submitted_at))
+        with storage.open(archived.file.name, 'rb') as copy:
+            self.assertEqual(copy.read(), PDF + b'report')
+
+    def test_command_honours_the_age_cutoff_and_dry_run(self):
+        out = io.StringIO()
+        call_command('archive_contact_requests', '--days', '5', '--dry-run', stdout=out)
+        self.assertIn('Would archive 3 contact request(s)', out.getvalue())
+        self.assertFalse(ArchivedContactRequest.objects.exists())
+
+        with mock.patch('candidates.archival.archive_storage', InMemoryStorage):
+            call_command('archive_contact_requests', '--days', '5', '--status', 'closed', stdout=io.StringIO())
+        self.assertCountEqual(ArchivedContactRequest.objects.values_list('name', flat=True), ['closed', 'recent'])
+
+    def test_admin_triage_actions(self):
+        self.client.force_login(self.staff)
+        url = reverse('admin:candidates_contactrequest_changelist')
+        new = self.requests['new']
+        self.client.post(url, {'action': 'assign_to_me', '_selected_action': [new.pk]})
+        new.refresh_from_db()
+        self.assertEqual((new.assigned_to, new.status), (self.staff, 'in_progress'))
+        self.assertIsNotNone(new.status_changed_at)
+
+        self.client.post(url, {'action': 'mark_resolved', '_selected_action': [new.pk]})
+        new.refresh_from_db()
+        self.assertEqual(new.status, 'resolved')
+
+    def test_submitted_forms_inbox_filters_by_status_and_assignee(self):
+        self.client.force_login(self.staff)
+        url = reverse('admin:submitted-forms')
+        response = self.client.get(url, {'status': 'in_progress', 'assignee': 'me'})
+        self.assertEqual([form.name for form in response.context['forms']], ['assigned'])
+        response = self.client.get(url, {'assignee': 'unassigned'})
+        self.assertCountEqual([form.name for form in response.context['forms']], ['recent', 'closed', 'new'])
+
+
+class JobListingValuesSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_listing(location='Islamabad', salary_range='50000-70000 PKR', minimum_age=18,
+                     minimum_qualification='matric', required_experience=2, requirements='Fit')
+        make_listing('ASST (2)', status='draft')
+
+    def assert_matches_model_serializer(self):
+        listings = JobListing.objects.order_by('pk')
+        expected = JobListingSerializer(listings, many=True).data
+        actual = JobListingValuesSerializer(listings).data
+        self.assertEqual(len(actual), 2)
+        for row, reference in zip(actual, expected):
+            self.assertEqual(list(row), list(reference))
+            self.assertEqual(row, json.loads(json.dumps(reference)))
+
+    def test_output_matches_the_model_serializer(self):
+        self.assert_matches_model_serializer()
+
+    @override_settings(TIME_ZONE='Asia/Karachi')
+    def test_output_matches_outside_utc(self):
+        self.assert_matches_model_serializer()
+
+    def test_base_class_passes_rows_through(self):
+        class CodeSerializer(ValuesListSerializer):
+            value_fields = ('code',)
+
+        self.assertCountEqual(CodeSerializer(JobPost.objects.all()).data, [{'code': 'NQ (1)'}, {'code': 'ASST (2)'}])
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, DATABASE_REPLICAS=(),
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        cache.clear()
+
+    def samples(self):
+        return dict(line.rsplit(' ', 1) for line in registry.render().splitlines() if not line.startswith('#'))
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.assertIn(self.client.get(reverse('metrics')).status_code, (401, 403))
+        self.client.force_authenticate(make_user('applicant@example.com'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_authenticate(make_user('staff@example.com', is_staff=True))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+    def test_requests_are_observed_per_view_and_method(self):
+        make_listing()
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('list-job-listings')).status_code, 200)
+        samples = self.samples()
+        labels = 'method="GET",view="list-job-listings"'
+
+        self.assertEqual(samples[f'nfa_request_duration_seconds_count{{{labels}}}'], '2')
+        self.assertEqual(samples[f'nfa_request_duration_seconds_bucket{{{labels},le="+Inf"}}'], '2')
+        self.assertEqual(samples[f'nfa_request_queries_bucket{{{labels},le="0"}}'], '0')
+        self.assertGreaterEqual(float(samples[f'nfa_request_queries_sum{{{labels}}}']), 2)
+        self.assertEqual(samples[f'nfa_response_size_bytes_count{{{labels}}}'], '2')
+        self.client.get('/no-such-page/')
+        self.assertIn('view="<unresolved>"', registry.render())
+
+    def test_sampling_can_switch_observation_off(self):
+        with self.settings(METRICS_SAMPLE_RATE=0):
+            self.client.get(reverse('list-job-listings'))
+        self.assertNotIn('list-job-listings', registry.render())
+
+    def test_query_timer_counts_only_queries_inside_the_capture(self):
+        timer = QueryTimer()
+        with timer.capture():
+            list(JobPost.objects.all())
+            JobPost.objects.count()
+        JobPost.objects.count()
+        self.assertEqual(timer.count, 2)
+        self.assertGreater(timer.duration, 0)
+
+
+def image_bytes(size=(600, 800), fmt='PNG'):
+    out = io.BytesIO()
+    Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3)).save(out, fmt)
+    return out.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_PROCESSING_WORKERS=0, UPLOAD_IMAGE_TARGET_DPI=50,
+                   UPLOAD_PREVIEW_SIZE=64, UPLOAD_KEEP_ORIGINALS=False)
+class UploadProcessingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('applicant@example.com')
+        cls.scan = image_bytes()
+
+    def upload(self, content, name='scan.png'):
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('upload-application-file'),
+                                        {'name': 'scan', 'file': SimpleUploadedFile(name, content)})
+        self.assertEqual(response.status_code, 201)
+        return ApplicationDocument.objects.get(pk=response.json()['id'])
+
+    def test_images_are_downsized_to_a_jpeg_blob_and_the_original_released(self):
+        document = self.upload(self.scan)
+        self.assertTrue(document.file.name.endswith('.jpg'))
+        blob = Blob.objects.get(name=document.file.name)
+        self.assertTrue(blob.processed)
+        self.assertEqual(blob.original_size, len(self.scan))
+        self.assertLess(blob.size, len(self.scan))
+        self.assertEqual(Blob.objects.get(name=blob.source_name).ref_count, 0)
+        with document.file.open('rb') as normalized, Image.open(normalized) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertLessEqual(max(image.size), 584)
+
+    def test_preview_is_served_through_the_download_view(self):
+        document = self.upload(self.scan)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('download-file', args=['application-documents', document.pk]),
+                                   {'variant': 'preview'})
+        self.assertEqual(response.status_code, 200)
+        with Image.open(io.BytesIO(b''.join(response.streaming_content))) as preview:
+            self.assertLessEqual(max(preview.size), 64)
+
+    def test_reuploading_an_original_reuses_its_normalized_blob(self):
+        first = self.upload(self.scan)
+        with mock.patch('candidates.processing.normalize_image') as normalize:
+            second = self.upload(self.scan)
+        normalize.assert_not_called()
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertEqual(Blob.objects.get(name=first.file.name).ref_count, 2)
+
+    def test_pdfs_and_unreadable_images_are_left_alone(self):
+        document = self.upload(PDF + b'scan', name='scan.pdf')
+        self.assertTrue(document.file.name.endswith('.pdf'))
+        self.assertFalse(Blob.objects.get(name=document.file.name).processed)
+        self.assertEqual(normalize_image(io.BytesIO(b'not an image')), (None, None))
+
+
+@override_settings(OPENAPI_SCHEMA_DIR=os.path.join(MEDIA_ROOT, 'openapi'), DATABASE_REPLICAS=())
+class OpenAPISchemaTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(schema, '_bundle', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, **headers):
+        return self.client.get(reverse('schema-json'), headers=headers)
+
+    def test_schema_is_generated_once_and_served_precompressed(self):
+        with mock.patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+            response = self.get(accept_encoding='gzip, br')
+            gzipped = self.get(accept_encoding='gzip')
+        generate.assert_called_once()
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].endswith('-br"'))
+        document = json.loads(brotli.decompress(response.content))
+        self.assertIn('/candidates/joblistings/', ''.join(document['paths']))
+        self.assertEqual(json.loads(gzip.decompress(gzipped.content)), document)
+        self.assertEqual(json.loads(self.get().content), document)
+
+    def test_any_encodings_etag_revalidates(self):
+        etag = self.get(accept_encoding='gzip')['ETag']
+        response = self.get(accept_encoding='br', if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertTrue(response['ETag'].endswith('-br"'))
+
+    def test_stored_schema_is_reused_until_the_sources_change(self):
+        call_command('generate_openapi_schema', stdout=io.StringIO())
+        with mock.patch.object(schema, 'generate_schema') as generate:
+            self.assertEqual(self.get().status_code, 200)
+        generate.assert_not_called()
+        self.assertIsNone(schema.read_bundle('stale fingerprint'))
+
+
+@override_settings(DATABASE_REPLICAS=(),
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BenchmarkCommandTests(TestCase):
+    def test_seed_is_scaled_and_refuses_to_run_twice(self):
+        call_command('seed_benchmark_data', '--scale', '0.0001', stdout=io.StringIO())
+        self.assertEqual((TestSchedule.objects.count(), Candidate.objects.count()), (100, 10))
+        with self.assertRaises(CommandError):
+            call_command('seed_benchmark_data', '--scale', '0.0001', stdout=io.StringIO())
+        call_command('seed_benchmark_data', '--scale', '0.0002', '--reset', stdout=io.StringIO())
+        self.assertEqual(TestSchedule.objects.count(), 200)
+
+    def test_benchmarks_compare_against_the_baseline(self):
+        call_command('seed_benchmark_data', '--scale', '0.0001', stdout=io.StringIO())
+        baseline = os.path.join(MEDIA_ROOT, 'baseline.json')
+        options = ['list_job_listings', '--iterations', '3', '--warmup', '0', '--baseline', baseline]
+        call_command('run_benchmarks', *options, '--save-baseline', stdout=io.StringIO())
+        with open(baseline) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['list_job_listings']['iterations'], 3)
+        self.assertGreaterEqual(saved['list_job_listings']['queries_per_request'], 1)
+
+        saved['list_job_listings']['queries_per_request'] = 0
+        with open(baseline, 'w') as f:
+            json.dump(saved, f)
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', *options, '--tolerance', '100', stdout=io.StringIO(), stderr=io.StringIO())
@@ -0,0 +1,41 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class FixedWindowThrottle(SimpleRateThrottle):
+    cache_format = 'throttle_window_%(scope)s_%(ident)s_%(window)d'
+
+    def get_cache_key(self, request, view):
+        return self.window_key(self.get_ident(request), self.timer())
+
+    def window_key(self, ident, now):
+        return self.cache_format % {'scope': self.scope, 'ident': ident, 'window': now // self.duration}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.now = self.timer()
+        self.key = self.window_key(self.get_ident(request), self.now)
+        timeout = self.duration + 1
+        if self.cache.add(self.key, 1, timeout):
+            count = 1
+        else:
+            try:
+                count = self.cache.incr(self.key)
+            except ValueError:
+                self.cache.set(self.key, 1, timeout)
+                count = 1
+        if count > self.num_requests:
+            self.wait_time = self.duration - self.now % self.duration
+            return False
+        return True
+
+    def wait(self):
+        return getattr(self, 'wait_time', None)
+
+
+class UploadDocumentThrottle(FixedWindowThrottle):
+    scope = 'upload_document'
+
+
+class ContactUsThrottle(FixedWindowThrottle):
+    scope = 'contact_us'
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import upload_schedule, contact_us, get_documents, upload_document, get_my_profile, create_profile, update_profile, list_job_listings, retrieve_job_listing, application_eligibility_check, create_job_application, review_job_application, confirm_job_application, upload_application_file
+from .views import upload_schedule, contact_us, get_documents, upload_document, get_my_profile, create_profile, update_profile, list_job_listings, retrieve_job_listing, application_eligibility_check, create_job_application, review_job_application, confirm_job_application, upload_application_file, download_file, latest_advertisements, job_listing_stats, job_listing_stats_detail, bulk_confirm_job_applications, job_listing_merit_list, export_test_schedules
 
 urlpatterns = [
     path('upload-schedule/', upload_schedule, name='upload-schedule'),
@@ -7,6 +7,8 @@ urlpatterns = [
 
     path('documents/', get_documents, name='get-documents'),
     path('documents/upload/', upload_document, name='upload-document'),
+    path('documents/advertisements/latest/', latest_advertisements, name='latest-advertisements'),
+    path('files/<str:kind>/<int:pk>/', download_file, name='download-file'),
 
     path('profile/me/', get_my_profile, name='get-my-profile'),
     path('profile/', create_profile, name='create-profile'),
@@ -20,4 +22,10 @@ urlpatterns = [
     path('applications/create-job-application', create_job_application, name='create-job-application'),
     path('applications/<int:application_id>/review/', review_job_application, name='review-job-application'),
     path('applications/<int:application_id>/confirm/', confirm_job_application, name='confirm-job-application'),
+
+    path('staff/joblistings/stats/', job_listing_stats, name='job-listing-stats'),
+    path('staff/joblistings/<int:pk>/stats/', job_listing_stats_detail, name='job-listing-stats-detail'),
+    path('staff/joblistings/<int:pk>/merit-list/', job_listing_merit_list, name='job-listing-merit-list'),
+    path('staff/test-schedules/export.<str:extension>', export_test_schedules, name='export-test-schedules'),
+    path('staff/applications/confirm/', bulk_confirm_job_applications, name='bulk-confirm-job-applications'),
 ]
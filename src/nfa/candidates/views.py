@@ -1,28 +1,55 @@
-import openpyxl, json
+import json
 import datetime
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
-from .models import (Candidate, JobPost, TestSchedule, 
-                     ContactRequest, Document, 
+from django.db.models.fields.files import FieldFile
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import content_disposition_header
+from django.views.decorators.http import condition, require_safe
+from django.db.models import Count, Max
+from .models import (TestSchedule, 
+                     ContactRequest, Document, Blob,
                      Profile, JobListing, JobApplication, JobQuestion, ApplicationDocument)
 from .serializers import (ContactRequestSerializer, DocumentSerializer, ProfileSerializer, 
-                          JobListingSerializer, JobApplicationSerializer, JobApplicationReviewSerializer, UploadApplicationDocumentSerializer)
+                          JobListingSerializer, JobApplicationSerializer, JobApplicationReviewSerializer, UploadApplicationDocumentSerializer,
+                          DocumentValuesSerializer, JobListingValuesSerializer, DocumentFilterSerializer,
+                          JobListingStatsSerializer, MeritListEntrySerializer, ScheduleExportFilterSerializer)
+from .caching import cached_documents, cached_documents_state
+from .pagination import DocumentPagination, DashboardPagination
 from .utils import calculate_age, get_highest_qualification, calculate_total_experience, QUALIFICATION_ORDER
-
-from rest_framework.decorators import api_view, parser_classes, permission_classes
+from .downloads import download_filename, serve_file
+from .processing import schedule_processing
+from .ingestion import limit_body_size
+from .throttling import UploadDocumentThrottle, ContactUsThrottle
+from .confirmation import confirm_application, confirm_applications
+from .merit import generate as generate_merit_list
+from .importing import SCHEDULE_COLUMNS, import_schedule
+from .readers import read_schedule, supported_extensions
+from .exports import EXPORT_FORMATS, export_schedule
+from nfa.routers import replica_safe
+
+from rest_framework.decorators import api_view, authentication_classes, parser_classes, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
+@limit_body_size('contact_us')
 @api_view(['POST'])
 @parser_classes([MultiPartParser, FormParser])
 @permission_classes([AllowAny])
+@throttle_classes([ContactUsThrottle])
 def contact_us(request):
     serializer = ContactRequestSerializer(data=request.data)
     if serializer.is_valid():
-        serializer.save()
+        contact_request = serializer.save()
+        schedule_processing(contact_request)
         return Response(
             {"message": "Contact request submitted successfully."},
             status=status.HTTP_201_CREATED
@@ -30,17 +57,80 @@ def contact_us(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _collection_state(request, key, queryset, *timestamp_fields):
+    cache = request.__dict__.setdefault('_collection_state', {})
+    if key not in cache:
+        aggregates = {f'ts{i}': Max(field) for i, field in enumerate(timestamp_fields)}
+        state = queryset.aggregate(count=Count('pk'), **aggregates)
+        timestamps = [state[f'ts{i}'] for i in range(len(timestamp_fields)) if state[f'ts{i}']]
+        cache[key] = (state['count'], max(timestamps) if timestamps else None)
+    return cache[key]
+
+
+def _state_etag(state):
+    count, last_modified = state
+    return f'W/"{count}-{last_modified.timestamp() if last_modified else 0}"'
+
+
+def _documents_state(request):
+    if '_documents_state' not in request.__dict__:
+        request._documents_state = cached_documents_state(
+            lambda: _collection_state(request, 'documents', Document.objects.all(), 'last_updated'))
+    return request._documents_state
+
+
+def _job_listings_state(request):
+    return _collection_state(request, 'job_listings', JobListing.objects.all(), 'updated_at', 'job_post__updated_at')
+
+
+def _job_listing_state(request, pk):
+    return _collection_state(request, f'job_listing:{pk}', JobListing.objects.filter(pk=pk),
+                             'updated_at', 'job_post__updated_at')
+
+
+@replica_safe
+@condition(etag_func=lambda request: _state_etag(_documents_state(request)),
+           last_modified_func=lambda request: _documents_state(request)[1])
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_documents(request):
-    documents = Document.objects.all()
-    serializer = DocumentSerializer(documents, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    filters = DocumentFilterSerializer(data=request.query_params)
+    if not filters.is_valid():
+        return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        documents = filters.filter_queryset(Document.objects.all())
+        paginator = DocumentPagination()
+        rows = paginator.paginate_queryset(documents.values(*DocumentValuesSerializer.value_fields), request)
+        serializer = DocumentValuesSerializer(rows, context={'request': request})
+        return paginator.get_paginated_response(serializer.data).data
 
+    return Response(cached_documents(request, 'feed', build), status=status.HTTP_200_OK)
 
+
+@replica_safe
+@condition(etag_func=lambda request: _state_etag(_documents_state(request)),
+           last_modified_func=lambda request: _documents_state(request)[1])
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def latest_advertisements(request):
+    try:
+        limit = min(max(int(request.query_params.get('limit', 5)), 1), settings.LATEST_ADVERTISEMENTS_MAX)
+    except ValueError:
+        return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build():
+        documents = Document.objects.filter(purpose="Advertisement").order_by('-uploaded_at')[:limit]
+        return DocumentValuesSerializer(documents, context={'request': request}).data
+
+    return Response(cached_documents(request, f'advertisements:{limit}', build), status=status.HTTP_200_OK)
+
+
+@limit_body_size('upload_document')
 @api_view(['POST'])
 @parser_classes([MultiPartParser, FormParser])
 @permission_classes([AllowAny])
+@throttle_classes([UploadDocumentThrottle])
 def upload_document(request):
     serializer = DocumentSerializer(data=request.data)
     if serializer.is_valid():
@@ -49,93 +139,34 @@ def upload_document(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-def parse_excel_date(value):
-    if isinstance(value, datetime.date):
-        return value
-    value_str = str(value).strip()
-    for fmt in ("%d %b %Y", "%d %B %Y", "%Y-%m-%d"):
-        try:
-            return datetime.datetime.strptime(value_str, fmt).date()
-        except ValueError:
-            continue
-    raise ValueError(f"Invalid date format: {value_str}")
-
-
 @staff_member_required
 def upload_schedule(request):
-    if request.method == 'POST' and request.FILES.get('xlsx_file'):
-        file = request.FILES['xlsx_file']
-
-        if not file.name.endswith('.xlsx'):
-            messages.error(request, "Invalid file format. Please upload a .xlsx file.")
-            return redirect(request.path)
+    if request.method == 'POST' and request.FILES.get('schedule_file'):
+        file = request.FILES['schedule_file']
 
         try:
-            wb = openpyxl.load_workbook(file)
-            ws = wb.active
+            records = read_schedule(file, file.name)
+            report = import_schedule(records, prune=bool(request.POST.get('prune')),
+                                     dry_run=bool(request.POST.get('dry_run')))
         except Exception as e:
-            messages.error(request, f"Error reading Excel file: {str(e)}")
+            messages.error(request, f"Error reading file: {str(e)}")
             return redirect(request.path)
 
-        expected_columns = [
-            'Sr.No.', 'Roll No', 'Name', 'Father Name', 'CNIC', 'Post Applied For',
-            'Postal Address', 'Mobile No.', 'Paper', 'Test Date', 'Session',
-            'Reporting Time', 'Conduct Time', 'Venue'
-        ]
-
-        headers = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
-        if headers != expected_columns:
+        if report.skipped and not (report.added or report.changed or report.unchanged or report.errors):
             messages.error(
                 request,
-                "Excel format is invalid. Ensure headers match the required structure."
+                "No sheet has the required columns. Ensure the header row names "
+                f"{', '.join(SCHEDULE_COLUMNS[1:])}."
             )
             return redirect(request.path)
 
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if all((cell is None or (isinstance(cell, str) and cell.strip() == "")) for cell in row):
-                continue
-            try:
-                sr_no, roll_no, name, father_name, cnic, post_title, postal_address, \
-                mobile_no, paper, test_date, session, reporting_time, conduct_time, venue = row
-
-                test_date = parse_excel_date(test_date)
-
-                code_value = post_title.strip().upper().replace(" ", "_")[:20]
-
-                job_post, _ = JobPost.objects.update_or_create(
-                    code=code_value,
-                    defaults={"title": post_title}
-                )
-
-                candidate, _ = Candidate.objects.update_or_create(
-                    roll_no=roll_no,
-                    defaults={
-                        'name': name,
-                        'father_name': father_name,
-                        'cnic': cnic,
-                        'postal_address': postal_address,
-                        'mobile_no': mobile_no
-                    }
-                )
-
-                TestSchedule.objects.create(
-                    candidate=candidate,
-                    job_post=job_post,
-                    paper=paper,
-                    test_date=test_date,
-                    session=session,
-                    reporting_time=reporting_time,
-                    conduct_time=conduct_time,
-                    venue=venue
-                )
-
-            except Exception as e:
-                messages.error(request, f"Error processing row: {row}. Error: {str(e)}")
-
-        messages.success(request, "File uploaded successfully.")
-        return redirect(request.path)
-
-    return render(request, 'admin/candidates/upload.html')
+        if report.dry_run:
+            messages.info(request, f"Preview only, nothing was saved: {report.summary}.")
+        else:
+            messages.success(request, f"File uploaded successfully: {report.summary}.")
+        return render(request, 'admin/candidates/upload.html', {'report': report, 'extensions': supported_extensions()})
+
+    return render(request, 'admin/candidates/upload.html', {'extensions': supported_extensions()})
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -171,13 +202,19 @@ def update_profile(request, pk):
         return Response(serializer.data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@replica_safe
+@condition(etag_func=lambda request: _state_etag(_job_listings_state(request)),
+           last_modified_func=lambda request: _job_listings_state(request)[1])
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_job_listings(request):
     listings = JobListing.objects.all()
-    serializer = JobListingSerializer(listings, many=True, context={'request': request})
+    serializer = JobListingValuesSerializer(listings, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
+@replica_safe
+@condition(etag_func=lambda request, pk: _state_etag(_job_listing_state(request, pk)),
+           last_modified_func=lambda request, pk: _job_listing_state(request, pk)[1])
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def retrieve_job_listing(request, pk):
@@ -198,6 +235,9 @@ def application_eligibility_check(request):
     except JobListing.DoesNotExist:
         return Response({"eligible": False, "reason": "Job not found"}, status=404)
 
+    if not job_listing.is_open:
+        return Response({"eligible": False, "reason": "This job listing is no longer accepting applications."})
+
     try:
         profile = request.user.profile
     except Profile.DoesNotExist:
@@ -244,8 +284,10 @@ def upload_application_file(request):
 
     document = ApplicationDocument.objects.create(
         name=name,
-        file=file_obj 
+        file=file_obj,
+        uploaded_by=request.user
     )
+    schedule_processing(document)
 
     serializer = UploadApplicationDocumentSerializer(document, context={'request': request})
     return Response(serializer.data, status=201)
@@ -294,14 +336,144 @@ def review_job_application(request, application_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def confirm_job_application(request, application_id):
-    try:
-        application = JobApplication.objects.get(pk=application_id, applicant=request.user.profile)
-    except JobApplication.DoesNotExist:
+    if confirm_application(application_id, user=request.user):
+        return Response({"message": "Application confirmed successfully."})
+
+    if not JobApplication.objects.filter(pk=application_id, applicant__user=request.user).exists():
         return Response({"detail": "Application not found."}, status=404)
+    return Response({"detail": "Application already confirmed."}, status=400)
+
+
+@api_view(['POST'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def bulk_confirm_job_applications(request):
+    application_ids = request.data.get('application_ids')
+    if not isinstance(application_ids, list) or not all(type(pk) is int for pk in application_ids):
+        return Response({"application_ids": "Must be a list of application ids."}, status=400)
+    if len(application_ids) > settings.BULK_CONFIRMATION_MAX:
+        return Response({"application_ids": f"At most {settings.BULK_CONFIRMATION_MAX} ids per request."}, status=400)
+
+    confirmed = set(confirm_applications(application_ids))
+    existing = set(JobApplication.objects.filter(pk__in=application_ids).values_list('pk', flat=True))
+    return Response({
+        "confirmed": sorted(confirmed),
+        "already_confirmed": sorted(existing - confirmed),
+        "not_found": sorted(set(application_ids) - existing),
+    })
+
+
+DOWNLOADABLE_MODELS = {
+    'documents': Document,
+    'contact-requests': ContactRequest,
+    'application-documents': ApplicationDocument,
+}
 
-    if application.is_confirmed:
-        return Response({"detail": "Application already confirmed."}, status=400)
 
-    application.is_confirmed = True
-    application.save()
-    return Response({"message": "Application confirmed successfully."})
\ No newline at end of file
+def _download_user(request):
+    if request.user.is_authenticated:
+        return request.user
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def _can_download(user, obj):
+    if isinstance(obj, Document):
+        return True
+    if user is None or not user.is_active:
+        return False
+    if user.is_staff:
+        return True
+    if isinstance(obj, ApplicationDocument):
+        if obj.uploaded_by_id == user.id:
+            return True
+        return obj.application_id is not None and obj.application.applicant.user_id == user.id
+    return False
+
+
+@require_safe
+def download_file(request, kind, pk):
+    model = DOWNLOADABLE_MODELS.get(kind)
+    if model is None:
+        raise Http404("Unknown file type.")
+    obj = get_object_or_404(model, pk=pk)
+    user = _download_user(request)
+    if not _can_download(user, obj):
+        return HttpResponse(status=401 if user is None else 403)
+    if not obj.file:
+        raise Http404("No file attached.")
+
+    field_file = obj.file
+    if request.GET.get('variant') == 'preview':
+        preview_name = Blob.objects.filter(name=obj.file.name).values_list('preview_name', flat=True).first()
+        if not preview_name:
+            raise Http404("No preview available.")
+        field_file = FieldFile(obj, obj.file.field, preview_name)
+
+    return serve_file(
+        request,
+        field_file,
+        filename=download_filename(getattr(obj, 'name', None), field_file),
+        as_attachment=request.GET.get('download') == '1',
+    )
+
+
+def _job_listing_stats_queryset():
+    return JobListing.objects.select_related('job_post', 'stats').prefetch_related('qualification_stats')
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def job_listing_stats(request):
+    listings = _job_listing_stats_queryset()
+    if request.query_params.get('status'):
+        listings = listings.filter(status=request.query_params['status'])
+    paginator = DashboardPagination()
+    page = paginator.paginate_queryset(listings, request)
+    return paginator.get_paginated_response(JobListingStatsSerializer(page, many=True).data)
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def job_listing_stats_detail(request, pk):
+    listing = get_object_or_404(_job_listing_stats_queryset(), pk=pk)
+    return Response(JobListingStatsSerializer(listing).data)
+
+
+@api_view(['GET', 'POST'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def job_listing_merit_list(request, pk):
+    listing = get_object_or_404(JobListing, pk=pk)
+    if request.method == 'POST':
+        merit_list = generate_merit_list(listing)
+        return Response({"applicants": merit_list.applicants, "shortlisted": merit_list.shortlisted,
+                         "generated_at": merit_list.generated_at}, status=status.HTTP_201_CREATED)
+
+    entries = listing.merit_entries.select_related('application__applicant__user')
+    if request.query_params.get('shortlisted') in ('1', 'true'):
+        entries = entries.filter(shortlisted=True)
+    paginator = DashboardPagination()
+    page = paginator.paginate_queryset(entries, request)
+    return paginator.get_paginated_response(MeritListEntrySerializer(page, many=True).data)
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def export_test_schedules(request, extension):
+    if extension not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+    filters = ScheduleExportFilterSerializer(data=request.query_params)
+    if not filters.is_valid():
+        return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    stream, content_type = export_schedule(filters.filter_queryset(TestSchedule.objects.all()), extension)
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(True, f"test-schedules.{extension}")
+    return response
@@ -0,0 +1,58 @@
+import gzip
+
+import brotli
+from django.utils.text import compress_sequence
+
+PREFERRED_ENCODINGS = ('br', 'gzip')
+STREAM_FLUSH_BYTES = 64 * 1024
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(request, available=PREFERRED_ENCODINGS):
+    accepted = parse_accept_encoding(request.headers.get('Accept-Encoding'))
+    for coding in available:
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return 'identity'
+
+
+def compress(content, coding, fast=False):
+    if coding == 'br':
+        return brotli.compress(content, quality=5 if fast else 11)
+    if coding == 'gzip':
+        return gzip.compress(content, compresslevel=6 if fast else 9, mtime=0)
+    return content
+
+
+def compress_stream(chunks, coding):
+    if coding == 'gzip':
+        yield from compress_sequence(chunks)
+        return
+    compressor = brotli.Compressor(quality=5)
+    pending = 0
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        pending += len(chunk)
+        if pending >= STREAM_FLUSH_BYTES:
+            data += compressor.flush()
+            pending = 0
+        if data:
+            yield data
+    yield compressor.finish()
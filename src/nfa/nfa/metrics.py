@@ -0,0 +1,112 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+METRICS = {
+    'nfa_request_duration_seconds': ("Total request latency in seconds.", LATENCY_BUCKETS),
+    'nfa_request_db_duration_seconds': ("Time spent in database queries per request in seconds.", LATENCY_BUCKETS),
+    'nfa_request_queries': ("Number of database queries per request.", QUERY_COUNT_BUCKETS),
+    'nfa_response_size_bytes': ("Response body size in bytes.", SIZE_BUCKETS),
+}
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+    @contextmanager
+    def capture(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return f"{bound:g}" if isinstance(bound, float) else str(bound)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, metric, labels, value):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = Histogram(METRICS[metric][1])
+            histogram.observe(value)
+
+    def observe_request(self, view, method, latency, queries, db_time, size=None):
+        labels = {'view': view, 'method': method}
+        self.observe('nfa_request_duration_seconds', labels, latency)
+        self.observe('nfa_request_db_duration_seconds', labels, db_time)
+        self.observe('nfa_request_queries', labels, queries)
+        if size is not None:
+            self.observe('nfa_response_size_bytes', labels, size)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            series = sorted(
+                (key, list(h.counts), h.sum, h.count, h.buckets) for key, h in self._series.items()
+            )
+
+        lines = []
+        for metric, (help_text, _) in METRICS.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (name, labels), counts, total, count, buckets in series:
+                if name != metric:
+                    continue
+                label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{{label_str},le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label_str},le="+Inf"}} {count}')
+                lines.append(f"{metric}_sum{{{label_str}}} {total:g}")
+                lines.append(f"{metric}_count{{{label_str}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,102 @@
+import hashlib
+import random
+import time
+
+from django.conf import settings
+from django.middleware.http import ConditionalGetMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .compression import choose_encoding, compress, compress_stream
+from .metrics import QueryTimer, registry
+from .routers import SAFE_METHODS, STICKY_COOKIE, replica_aliases
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match.route or '<unnamed>'
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with timer.capture():
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        size = None if response.streaming else len(response.content)
+        registry.observe_request(_view_label(request), request.method, elapsed, timer.count, timer.duration, size)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = (
+                f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+                f'total;dur={elapsed * 1000:.1f}'
+            )
+        return response
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.has_header('Content-Encoding') or response.status_code == 206
+                or not response.get('Content-Type', '').startswith(settings.RESPONSE_COMPRESSION_TYPES)):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = choose_encoding(request)
+        if coding == 'identity':
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, coding)
+            if response.has_header('Content-Length'):
+                del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, coding, fast=True)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
+
+
+class WeakETagMiddleware(ConditionalGetMiddleware):
+    def process_response(self, request, response):
+        if request.method in ('GET', 'HEAD') and not response.has_header('ETag') and self.needs_etag(response):
+            if not response.streaming and response.status_code == 200:
+                response.headers['ETag'] = f'W/"{hashlib.md5(response.content, usedforsecurity=False).hexdigest()}"'
+        return super().process_response(request, response)
+
+
+class PrimaryStickinessMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if replica_aliases() and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True,
+                                samesite='Lax', secure=request.is_secure())
+        return response
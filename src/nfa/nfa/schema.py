@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from pathlib import Path
+
+import drf_yasg
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from .compression import PREFERRED_ENCODINGS, choose_encoding, compress
+
+API_INFO = openapi.Info(
+    title="NFA Project API",
+    default_version='v1',
+    description="API documentation for the NFA Django project",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="you@example.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+FINGERPRINT_SOURCES = ('urls.py', 'views.py', 'serializers.py', 'models.py')
+SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+class SchemaBundle:
+    def __init__(self, content, fingerprint, variants=None):
+        self.fingerprint = fingerprint
+        self.digest = hashlib.sha256(content).hexdigest()[:32]
+        self.variants = variants or {coding: compress(content, coding) for coding in SUFFIXES}
+
+    def etag(self, coding):
+        return f'"{self.digest}-{coding}"'
+
+
+def schema_fingerprint():
+    digest = hashlib.sha256(f"{drf_yasg.__version__}:{settings.ROOT_URLCONF}".encode())
+    for app_dir in sorted(path for path in Path(settings.BASE_DIR).iterdir() if path.is_dir()):
+        for source in FINGERPRINT_SOURCES:
+            path = app_dir / source
+            if path.is_file():
+                digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def generate_schema():
+    generator = OpenAPISchemaGenerator(API_INFO)
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def write_bundle(bundle, directory=None):
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    for coding, suffix in SUFFIXES.items():
+        (directory / f"openapi.json{suffix}").write_bytes(bundle.variants[coding])
+    (directory / "openapi.fingerprint").write_text(bundle.fingerprint)
+
+
+def read_bundle(fingerprint, directory=None):
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    try:
+        if (directory / "openapi.fingerprint").read_text().strip() != fingerprint:
+            return None
+        variants = {coding: (directory / f"openapi.json{suffix}").read_bytes() for coding, suffix in SUFFIXES.items()}
+    except OSError:
+        return None
+    return SchemaBundle(variants['identity'], fingerprint, variants)
+
+
+def build_bundle(fingerprint=None):
+    return SchemaBundle(generate_schema(), fingerprint or schema_fingerprint())
+
+
+def get_schema_bundle():
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                fingerprint = schema_fingerprint()
+                _bundle = read_bundle(fingerprint) or build_bundle(fingerprint)
+    return _bundle
+
+
+def openapi_schema(request):
+    bundle = get_schema_bundle()
+    coding = choose_encoding(request, PREFERRED_ENCODINGS)
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if any(bundle.etag(c) in if_none_match for c in SUFFIXES) or if_none_match.strip() == '*':
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(bundle.variants[coding], content_type='application/json')
+        if coding != 'identity':
+            response['Content-Encoding'] = coding
+
+    response['ETag'] = bundle.etag(coding)
+    response['Cache-Control'] = f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}"
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def schema_ui(schema_view, renderer):
+    ui_view = schema_view.with_ui(renderer, cache_timeout=0)
+
+    def view(request, *args, **kwargs):
+        if request.GET.get('format') == 'openapi':
+            return openapi_schema(request)
+        return ui_view(request, *args, **kwargs)
+    return view
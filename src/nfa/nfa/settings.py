@@ -39,9 +39,13 @@ INSTALLED_APPS = [
 TAILWIND_APP_NAME = 'theme'
 
 MIDDLEWARE = [
+    'nfa.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'nfa.middleware.PrimaryStickinessMiddleware',
+    'nfa.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'nfa.middleware.WeakETagMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
 
@@ -53,6 +57,11 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'nfa.urls'
 
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))
+
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+RESPONSE_COMPRESSION_TYPES = ('application/json', 'text/csv')
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -80,6 +89,27 @@ DATABASES = {
     }
 }
 
+# Comma-separated "host[:port]" read replicas, registered as replica_1, replica_2, ... with the primary's credentials.
+for n, replica in enumerate(filter(None, map(str.strip, os.getenv("DB_REPLICA_HOSTS", "").split(","))), start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{n}'] = {**DATABASES['default'], 'HOST': host, 'PORT': port or DATABASES['default']['PORT'],
+                                 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['nfa.routers.ReplicaRouter']
+# Clients read from the primary for this long after a write so they see their own changes.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "15"))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        'LOCATION': os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+DOCUMENTS_CACHE_TIMEOUT = int(os.getenv("DOCUMENTS_CACHE_TIMEOUT", "300"))
+DOCUMENTS_LOCAL_CACHE_TIMEOUT = int(os.getenv("DOCUMENTS_LOCAL_CACHE_TIMEOUT", "10"))
+LATEST_ADVERTISEMENTS_MAX = 20
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -100,6 +130,8 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+FAST_JSON = os.getenv("DRF_FAST_JSON", "False") == "True"
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -107,8 +139,52 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'nfa.renderers.FastJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'nfa.renderers.FastJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'upload_document': os.getenv("UPLOAD_DOCUMENT_THROTTLE_RATE", "30/hour"),
+        'contact_us': os.getenv("CONTACT_US_THROTTLE_RATE", "10/hour"),
+    },
+    'NUM_PROXIES': int(os.getenv("DRF_NUM_PROXIES")) if os.getenv("DRF_NUM_PROXIES") else None,
 }
 
+BULK_CONFIRMATION_MAX = 5000
+
+# Shortlist size per listing as a multiple of number_of_positions.
+MERIT_SHORTLIST_RATIO = float(os.getenv("MERIT_SHORTLIST_RATIO", "1"))
+# Above this many late confirmations a listing's merit list is regenerated instead of patched row by row.
+MERIT_INCREMENTAL_LIMIT = int(os.getenv("MERIT_INCREMENTAL_LIMIT", "25"))
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Recruitment cycles start on the first of this month; roll_cycles keeps this many cycles, the current one included,
+# in the live tables and moves older test schedules and applications to compressed files in archive storage.
+RECRUITMENT_CYCLE_START_MONTH = int(os.getenv("RECRUITMENT_CYCLE_START_MONTH", "1"))
+RECRUITMENT_CYCLES_KEPT = int(os.getenv("RECRUITMENT_CYCLES_KEPT", "2"))
+
+INGESTION_MAX_BODY_SIZE = {
+    'upload_document': int(os.getenv("UPLOAD_DOCUMENT_MAX_BODY_SIZE", str(20 * 1024 * 1024))),
+    'contact_us': int(os.getenv("CONTACT_US_MAX_BODY_SIZE", str(10 * 1024 * 1024))),
+}
+
+SWAGGER_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+
+REDOC_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+
+OPENAPI_SCHEMA_DIR = Path(os.getenv("OPENAPI_SCHEMA_DIR", BASE_DIR / 'openapi_cache'))
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv("OPENAPI_SCHEMA_MAX_AGE", "3600"))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -121,6 +197,27 @@ SIMPLE_JWT = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Deduplicating storage for Document, ContactRequest and ApplicationDocument uploads.
+    "uploads": {"BACKEND": os.getenv("UPLOAD_STORAGE_BACKEND", "candidates.storage.ContentAddressedFileSystemStorage")},
+    "archive": {
+        "BACKEND": os.getenv("ARCHIVE_STORAGE_BACKEND", "django.core.files.storage.FileSystemStorage"),
+        "OPTIONS": {"location": os.getenv("ARCHIVE_ROOT", str(BASE_DIR / 'archive'))},
+    },
+}
+
+UPLOAD_PROCESSING_WORKERS = int(os.getenv("UPLOAD_PROCESSING_WORKERS", "2"))
+UPLOAD_IMAGE_TARGET_DPI = int(os.getenv("UPLOAD_IMAGE_TARGET_DPI", "150"))
+UPLOAD_IMAGE_QUALITY = int(os.getenv("UPLOAD_IMAGE_QUALITY", "80"))
+UPLOAD_PREVIEW_SIZE = int(os.getenv("UPLOAD_PREVIEW_SIZE", "320"))
+UPLOAD_KEEP_ORIGINALS = os.getenv("UPLOAD_KEEP_ORIGINALS", "False") == "True"
+
+# "x-accel-redirect" (nginx), "x-sendfile" (Apache/lighttpd) or empty to stream from Django.
+MEDIA_SENDFILE_BACKEND = os.getenv("MEDIA_SENDFILE_BACKEND", "")
+MEDIA_ACCEL_REDIRECT_LOCATION = os.getenv("MEDIA_ACCEL_REDIRECT_LOCATION", "/protected-media/")
+
 customColorPalette = [
         {
             'color': 'hsl(4, 90%, 58%)',
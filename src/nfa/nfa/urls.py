@@ -2,20 +2,13 @@ from django.contrib import admin
 from django.urls import path, re_path, include
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from .views import home
+from .views import home, metrics, public_media
+from .routers import replica_safe
+from .schema import API_INFO, openapi_schema, schema_ui
 from django.conf import settings
-from django.conf.urls.static import static
 
 schema_view = get_schema_view(
-   openapi.Info(
-      title="NFA Project API",
-      default_version='v1',
-      description="API documentation for the NFA Django project",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="you@example.com"),
-      license=openapi.License(name="BSD License"),
-   ),
+   API_INFO,
    public=True,
    permission_classes=(permissions.AllowAny,),
 )
@@ -23,13 +16,15 @@ schema_view = get_schema_view(
 urlpatterns = [
     path('', home),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics, name='metrics'),
     path('admin/candidates/', include(('candidates.urls', 'candidates'), namespace='candidates')),
     path('api/auth/', include('authentication.urls')),
     path('api/candidates/', include('candidates.urls')),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger.json', replica_safe(openapi_schema), name='schema-json'),
+    path('swagger/', replica_safe(schema_ui(schema_view, 'swagger')), name='schema-swagger-ui'),
+    path('redoc/', replica_safe(schema_ui(schema_view, 'redoc')), name='schema-redoc'),
     path('ckeditor5/', include('django_ckeditor_5.urls')),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', public_media)]
@@ -1,4 +1,33 @@
-from django.http import HttpResponse
+import posixpath
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.static import serve
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from candidates.models import Document
+from candidates.storage import is_blob_name
+
+from .metrics import registry
+
+PRIVATE_MEDIA_PREFIXES = ('applications/', 'contact_uploads/')
 
 def home(request):
     return HttpResponse("Welcome to the NFA Backend!")
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, SessionAuthentication])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def public_media(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith(PRIVATE_MEDIA_PREFIXES) or (is_blob_name(path) and not Document.objects.filter(file=path).exists()):
+        raise Http404
+    return serve(request, path, document_root=settings.MEDIA_ROOT)